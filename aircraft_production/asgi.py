@@ -2,6 +2,8 @@
 ASGI config for aircraft_production project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with an ASGI server (uvicorn, daphne) so the workflow event
+streams run on the event loop instead of occupying a thread per client.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
@@ -12,5 +14,12 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'aircraft_production.settings')
+# Dashboards run their independent queries concurrently on the event loop
+os.environ.setdefault('ASYNC_DASHBOARDS', 'True')
 
 application = get_asgi_application()
+
+from apps.assembly.events import watch_disconnects  # noqa: E402, needs the app registry
+
+# Lets the event streams end when their client disconnects
+application = watch_disconnects(application)
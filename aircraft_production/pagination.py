@@ -0,0 +1,201 @@
+import base64
+import binascii
+import json
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def encode_cursor(values, reverse=False):
+    payload = json.dumps({'v': values, 'r': reverse}, default=str, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return (values, reverse) of a cursor, or None when it is not valid"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return list(payload['v']), bool(payload['r'])
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        return None
+
+
+def keyset_filter(ordering, values):
+    """
+    Q matching the rows that come after `values` in `ordering`, e.g. for
+    ('-created_at', '-id'): created_at < v0 OR (created_at = v0 AND id < v1).
+    """
+    condition = Q()
+    equal = Q()
+    for field, value in zip(ordering, values):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        condition |= equal & Q(**{f'{name}__{lookup}': value})
+        equal &= Q(**{name: value})
+    return condition
+
+
+class KeysetPage:
+    def __init__(self, object_list, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def next_url(self, request):
+        if self.next_cursor:
+            return replace_query_param(request.get_full_path(), 'cursor', self.next_cursor)
+
+    def previous_url(self, request):
+        if self.previous_cursor:
+            return replace_query_param(request.get_full_path(), 'cursor', self.previous_cursor)
+
+
+class KeysetPaginator:
+    """
+    Keyset ("seek") pagination for HTML listings.
+
+    Pages are fetched with a WHERE on the last row's ordering values instead
+    of an OFFSET, so every page costs the same however deep it is. `ordering`
+    must end with a unique field (usually id) and should be backed by an
+    index. The page is never counted.
+    """
+
+    def __init__(self, queryset, ordering, page_size):
+        self.queryset = queryset
+        self.ordering = tuple(ordering)
+        self.page_size = page_size
+
+    def _values(self, obj):
+        # Rows are model instances or values() dicts
+        if isinstance(obj, dict):
+            return [obj[field.lstrip('-')] for field in self.ordering]
+        return [getattr(obj, field.lstrip('-')) for field in self.ordering]
+
+    def page(self, cursor=None):
+        decoded = decode_cursor(cursor) if cursor else None
+        values, reverse = decoded if decoded and len(decoded[0]) == len(self.ordering) else (None, False)
+
+        ordering = self.ordering
+        if reverse:
+            ordering = tuple(field[1:] if field.startswith('-') else f'-{field}' for field in ordering)
+
+        queryset = self.queryset.order_by(*ordering)
+        if values is not None:
+            try:
+                queryset = queryset.filter(keyset_filter(ordering, values))
+            except (ValidationError, ValueError, TypeError):
+                # Tampered cursor, start from the first page
+                return self.page()
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            if not has_more:
+                # Paged back to the start, serve a full first page
+                return self.page()
+            rows.reverse()
+
+        next_cursor = previous_cursor = None
+        if rows:
+            if has_more or reverse:
+                next_cursor = encode_cursor(self._values(rows[-1]))
+            if values is not None:
+                previous_cursor = encode_cursor(self._values(rows[0]), reverse=True)
+        return KeysetPage(rows, next_cursor, previous_cursor)
+
+
+def approximate_count(queryset):
+    """
+    Row estimate of the query planner for the queryset. Cheap, but may be
+    off by a wide margin on filtered queries; databases other than
+    PostgreSQL fall back to an exact COUNT(*).
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class ApproximateCountPaginator(Paginator):
+    """Django paginator counting with the planner estimate instead of COUNT(*)"""
+
+    @cached_property
+    def count(self):
+        return approximate_count(self.object_list)
+
+
+class HybridPagination(PageNumberPagination):
+    """
+    Page number pagination that switches to keyset pagination when the
+    client sends a `cursor` parameter; an empty `?cursor=` starts at the
+    first page. Cursor pages are ordered by `cursor_ordering`, skip the
+    COUNT(*) entirely and respond with `next`, `previous` and `results`.
+
+    `?count=approximate` asks for the planner's row estimate instead of an
+    exact count, in both modes.
+    """
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    cursor_ordering = ('-created_at', '-id')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.approximate = request.query_params.get(self.count_query_param) == 'approximate'
+        self.keyset_page = None
+        if self.cursor_query_param not in request.query_params:
+            if self.approximate:
+                self.django_paginator_class = ApproximateCountPaginator
+            return super().paginate_queryset(queryset, request, view)
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        self.keyset_page = KeysetPaginator(queryset, self.cursor_ordering, page_size).page(
+            request.query_params[self.cursor_query_param]
+        )
+        self.count = approximate_count(queryset) if self.approximate else None
+        return list(self.keyset_page)
+
+    def _cursor_link(self, cursor):
+        if cursor is None:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        if self.keyset_page is None:
+            return super().get_paginated_response(data)
+        response = {
+            'next': self._cursor_link(self.keyset_page.next_cursor),
+            'previous': self._cursor_link(self.keyset_page.previous_cursor),
+            'results': data,
+        }
+        if self.count is not None:
+            response = {'count': self.count, **response}
+        return Response(response)
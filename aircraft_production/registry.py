@@ -0,0 +1,46 @@
+import threading
+import uuid
+from django.core.cache import cache
+
+
+class VersionedRegistry:
+    """
+    Base class for in-process caches of rarely changing data.
+
+    Each worker keeps its own copy and compares it against a generation
+    token stored in the shared cache. Replacing the token (see
+    `invalidate`) makes every worker reload on its next read, so with a
+    shared cache backend the invalidation reaches all processes.
+
+    Subclasses set `generation_key` and implement `_load`.
+    """
+    generation_key = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._generation = None
+        self._data = None
+
+    def _current_generation(self):
+        generation = cache.get(self.generation_key)
+        if generation is None:
+            cache.add(self.generation_key, uuid.uuid4().hex, timeout=None)
+            generation = cache.get(self.generation_key)
+        return generation
+
+    def _load(self):
+        raise NotImplementedError
+
+    def _get(self):
+        generation = self._current_generation()
+        if self._data is None or self._generation != generation:
+            with self._lock:
+                if self._data is None or self._generation != generation:
+                    self._data = self._load()
+                    self._generation = generation
+        return self._data
+
+    def invalidate(self):
+        """Drop the local copy and tell every other worker to reload"""
+        self._data = None
+        cache.set(self.generation_key, uuid.uuid4().hex, timeout=None)
@@ -95,6 +95,11 @@ TEMPLATES = [
 WSGI_APPLICATION = 'aircraft_production.wsgi.application'
 
 # Database
+# CONN_MAX_AGE keeps connections open between requests. Keep it at 0 under
+# ASGI: every request runs its sync code on a thread of its own, and a
+# connection kept open there outlives the thread. Put a pooler such as
+# PgBouncer in front of PostgreSQL instead (docker/docker-compose.yml
+# does). Under WSGI set it to e.g. 60.
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -103,9 +108,49 @@ DATABASES = {
         'PASSWORD': os.getenv('POSTGRES_PASSWORD', 'postgres'),
         'HOST': os.getenv('POSTGRES_HOST', 'localhost'),
         'PORT': os.getenv('POSTGRES_PORT', '5432'),
+        'CONN_MAX_AGE': int(os.getenv('CONN_MAX_AGE', 0)),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Threads, and so database connections, per process for the concurrent
+# queries of the async dashboards (apps.assembly.async_queries). Web
+# processes x (this + concurrent requests) must stay below the pooler's
+# or PostgreSQL's max_connections.
+ASYNC_QUERY_WORKERS = int(os.getenv('ASYNC_QUERY_WORKERS', 4))
+
+# Serve workflow_list and quality_checks from their async views. Under WSGI
+# an async view gets an event loop of its own per request, so the sync
+# views serve those deployments; aircraft_production/asgi.py turns this on.
+ASYNC_DASHBOARDS = os.getenv('ASYNC_DASHBOARDS', 'False').lower() == 'true'
+
+# Cache
+# Local memory is per process; point CACHE_BACKEND at a shared backend
+# (e.g. django.core.cache.backends.redis.RedisCache) so cache invalidation
+# reaches every worker.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'aircraft-production'),
+    },
+    # API response cache (apps.assembly.cache); point it at a shared backend
+    # such as Redis so every worker sees the same entries and invalidations
+    'responses': {
+        'BACKEND': os.getenv('RESPONSE_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('RESPONSE_CACHE_LOCATION', 'aircraft-production-responses'),
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+}
+RESPONSE_CACHE_ALIAS = 'responses'
+
+# Database alias the workflow event reports read, e.g. a read replica
+# added to DATABASES
+ANALYTICS_DATABASE = os.getenv('ANALYTICS_DATABASE', 'default')
+
+# Fan-out of workflow events to /assembly/api/events/ streams. The local
+# broker only reaches subscribers of the publishing process.
+WORKFLOW_EVENT_BROKER = 'apps.assembly.events.LocalEventBroker'
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
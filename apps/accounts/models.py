@@ -107,3 +107,6 @@ class Profile(models.Model):
     class Meta:
         verbose_name = _('Profile')
         verbose_name_plural = _('Profiles')
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='accounts_profile_created_idx'),
+        ]
@@ -2,7 +2,7 @@ from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from .models import Profile
 from apps.teams.models import Team
-from apps.teams.serializers import TeamSerializer
+from apps.teams.serializers import TeamSerializer, ReferenceDataRelatedField
 
 User = get_user_model()
 
@@ -31,7 +31,8 @@ class UserSerializer(serializers.ModelSerializer):
 class ProfileSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     team = TeamSerializer(read_only=True)
-    team_id = serializers.PrimaryKeyRelatedField(
+    team_id = ReferenceDataRelatedField(
+        lookup='team_by_id',
         queryset=Team.objects.all(),
         source='team',
         write_only=True,
@@ -24,6 +24,7 @@ from django.utils.translation import gettext_lazy as _
 from apps.parts.models import Part
 from apps.assembly.models import WorkflowStep
 from django.template import TemplateDoesNotExist
+from aircraft_production.pagination import HybridPagination
 
 User = get_user_model()
 
@@ -103,6 +104,7 @@ class ProfileViewSet(viewsets.ModelViewSet):
     queryset = Profile.objects.all()
     serializer_class = ProfileSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = HybridPagination
     
     def get_queryset(self):
         queryset = Profile.objects.select_related('user', 'team').all()
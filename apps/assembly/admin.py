@@ -0,0 +1,14 @@
+from django.contrib import admin
+from .models import WorkflowTemplate, WorkflowTemplateStep
+
+class WorkflowTemplateStepInline(admin.TabularInline):
+    model = WorkflowTemplateStep
+    extra = 0
+    ordering = ('order',)
+
+@admin.register(WorkflowTemplate)
+class WorkflowTemplateAdmin(admin.ModelAdmin):
+    inlines = (WorkflowTemplateStepInline,)
+    list_display = ('name', 'aircraft_type', 'created_at', 'updated_at')
+    search_fields = ('name',)
+    ordering = ('aircraft_type',)
@@ -0,0 +1,160 @@
+from collections import Counter
+from datetime import timedelta
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from apps.parts.models import Part
+from .cache import aircraft_tag, invalidate_on_commit
+from .inventory import mark_parts_used
+from .models import PartReservation
+from .production import REQUIRED_PARTS
+
+# How long allocated parts stay reserved for an aircraft
+RESERVATION_TIMEOUT = timedelta(minutes=30)
+
+
+def required_part_counts():
+    """Parts of each type needed to assemble one aircraft"""
+    return Counter(
+        part_type for required in REQUIRED_PARTS.values() for part_type, _ in required
+    )
+
+
+def missing_part_counts(aircraft):
+    """Required parts of each type not yet linked to the aircraft"""
+    missing = required_part_counts()
+    for part_type in aircraft.parts.values_list('part_type', flat=True).order_by():
+        missing[part_type] -= 1
+    return +missing
+
+
+def unreserved_parts(aircraft_type, now=None):
+    """Finished, quality checked parts that are neither used nor reserved"""
+    return Part.objects.filter(
+        aircraft_type=aircraft_type,
+        is_used=False,
+        status='completed',
+        quality_check_status='passed'
+    ).exclude(reservation__expires_at__gt=now or timezone.now())
+
+
+def claim_parts(aircraft_type, part_type, count, now, skip_locked=True):
+    """
+    Lock up to `count` available parts of a type, oldest first. Must run in
+    a transaction.
+
+    A part whose reservation committed after our snapshot is still returned
+    by the locking query, because the part row itself did not change. Every
+    batch is therefore checked against the committed reservations again and
+    taken parts are replaced by the next candidates.
+    """
+    part_ids = []
+    skipped = set()
+    while len(part_ids) < count:
+        wanted = count - len(part_ids)
+        candidates = list(
+            unreserved_parts(aircraft_type, now).filter(part_type=part_type).exclude(
+                id__in=skipped | set(part_ids)
+            ).order_by('created_at', 'id').select_for_update(
+                skip_locked=skip_locked, of=('self',)
+            ).values_list('id', flat=True)[:wanted]
+        )
+        taken = set(PartReservation.objects.filter(
+            part_id__in=candidates, expires_at__gt=now
+        ).values_list('part_id', flat=True))
+        part_ids += [part_id for part_id in candidates if part_id not in taken]
+        skipped |= taken
+        if len(candidates) < wanted:
+            break
+    return part_ids
+
+
+def allocate_parts(aircraft, requirements, user=None, strict=True, skip_locked=True,
+                   timeout=RESERVATION_TIMEOUT):
+    """
+    Reserve available parts for an aircraft, `requirements` mapping part
+    type to the number of parts needed.
+
+    Candidate parts are claimed oldest first with SELECT ... FOR UPDATE
+    SKIP LOCKED (see claim_parts), so concurrent allocators take different
+    rows instead of waiting for each other, and a part is never reserved
+    twice. With `strict`, a shortage of any part type raises
+    ValidationError and nothing is reserved; otherwise whatever is
+    available is reserved.
+
+    Returns {part_type: [part ids]} of the new reservations.
+    """
+    now = timezone.now()
+    reserved = {}
+    with transaction.atomic():
+        shortages = []
+        for part_type, count in sorted(requirements.items()):
+            if count <= 0:
+                continue
+            part_ids = claim_parts(aircraft.aircraft_type, part_type, count, now, skip_locked)
+            if len(part_ids) < count:
+                shortages.append(f"{part_type} ({len(part_ids)}/{count})")
+            if part_ids:
+                reserved[part_type] = part_ids
+
+        if shortages and strict:
+            raise ValidationError(f"Not enough available parts: {', '.join(shortages)}")
+
+        part_ids = [part_id for ids in reserved.values() for part_id in ids]
+        if part_ids:
+            # Claimed parts can only carry expired reservations, replace them
+            PartReservation.objects.filter(part_id__in=part_ids, expires_at__lte=now).delete()
+            PartReservation.objects.bulk_create([
+                PartReservation(
+                    part_id=part_id,
+                    aircraft=aircraft,
+                    reserved_by=user,
+                    expires_at=now + timeout
+                )
+                for part_id in part_ids
+            ])
+            invalidate_on_commit('parts')
+    return reserved
+
+
+def consume_reservations(aircraft, user=None):
+    """
+    Turn the aircraft's reservations into used parts at finalization.
+
+    Reserved parts are locked first so an expired reservation can not be
+    taken over meanwhile. Only the reserved parts still missing from the
+    aircraft are linked, the rest are released, and part types that remain
+    missing are allocated strictly. The linked parts are marked as used.
+    Raises ValidationError when the required parts can not be gathered.
+    """
+    with transaction.atomic():
+        locked_ids = list(
+            Part.objects.filter(reservation__aircraft=aircraft).select_for_update(
+                of=('self',)
+            ).values_list('id', flat=True)
+        )
+        # Reservations taken over before the lock was granted are not ours anymore
+        reserved_ids = list(PartReservation.objects.filter(
+            aircraft=aircraft, part_id__in=locked_ids
+        ).values_list('part_id', flat=True))
+
+        # Parts already linked (e.g. produced for a production order) count
+        # too, only the reservations covering what is still missing are used
+        missing = missing_part_counts(aircraft)
+        used_ids = []
+        for part_id, part_type in Part.objects.filter(id__in=reserved_ids).order_by(
+            'created_at', 'id'
+        ).values_list('id', 'part_type'):
+            if missing[part_type] > 0:
+                missing[part_type] -= 1
+                used_ids.append(part_id)
+        if +missing:
+            allocated = allocate_parts(aircraft, +missing, user=user, strict=True)
+            used_ids += [part_id for ids in allocated.values() for part_id in ids]
+
+        aircraft.parts.add(*used_ids)
+        # Releases the reservations that were not needed
+        PartReservation.objects.filter(aircraft=aircraft).delete()
+        mark_parts_used(aircraft.parts.all())
+        invalidate_on_commit('parts', aircraft_tag(aircraft.pk))
@@ -5,3 +5,6 @@ class AssemblyConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.assembly'
     verbose_name = 'Assembly'
+
+    def ready(self):
+        from . import signals  # noqa: F401
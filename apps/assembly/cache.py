@@ -0,0 +1,143 @@
+import hashlib
+import json
+import time
+import uuid
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+# Cache alias holding the responses, see CACHES in the settings
+RESPONSE_CACHE_ALIAS = getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')
+# Seconds a response is served without checking for a rebuild
+RESPONSE_CACHE_TIMEOUT = 60
+# How long a stale response may still be served while it is rebuilt
+RESPONSE_CACHE_STALE_TIMEOUT = 10 * 60
+# Upper bound of a rebuild, after which another worker may try
+REBUILD_LOCK_TIMEOUT = 30
+
+COUNTERS = ('hits', 'misses', 'stale_hits', 'rebuilds')
+
+
+def aircraft_tag(aircraft_id):
+    return f'aircraft:{aircraft_id}'
+
+
+def team_scope(user):
+    """Cache scope of a user: responses are never shared between teams"""
+    profile = getattr(user, 'profile', None)
+    team_id = getattr(profile, 'team_id', None)
+    return f'team-{team_id}' if team_id else 'no-team'
+
+
+class ResponseCache:
+    """
+    Shared cache of computed API responses with tag based invalidation.
+
+    Every entry depends on tags such as 'parts' or 'aircraft:12'. A tag has
+    a generation token in the cache; `invalidate` replaces the token, which
+    turns every entry built under the old one stale, across all workers
+    when the backend is shared.
+
+    A stale or expired entry is rebuilt by the single worker that wins the
+    rebuild lock, every other request keeps getting the stale value in the
+    meantime, so a popular entry expiring does not stampede the database.
+    Hits, misses, stale hits and rebuilds are counted per response name.
+    """
+
+    def __init__(self, alias=RESPONSE_CACHE_ALIAS):
+        self.alias = alias
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def make_key(self, name, scope, params):
+        digest = hashlib.md5(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+        return f'response:{name}:{scope}:{digest}'
+
+    def generations(self, tags):
+        """Current generation token of every tag, creating missing ones"""
+        keys = [f'response-tag:{tag}' for tag in tags]
+        tokens = self.cache.get_many(keys)
+        for key in keys:
+            if key not in tokens:
+                self.cache.add(key, uuid.uuid4().hex, timeout=None)
+                tokens[key] = self.cache.get(key)
+        return tuple(tokens[key] for key in keys)
+
+    def invalidate(self, *tags):
+        """Mark every entry depending on one of `tags` as stale"""
+        self.cache.set_many({f'response-tag:{tag}': uuid.uuid4().hex for tag in tags}, timeout=None)
+
+    def count(self, name, counter):
+        key = f'response-stats:{name}:{counter}'
+        if not self.cache.add(key, 1, timeout=None):
+            try:
+                self.cache.incr(key)
+            except ValueError:
+                # Evicted between add and incr
+                self.cache.add(key, 1, timeout=None)
+
+    def stats(self, names):
+        """{name: {counter: value}} for the given response names"""
+        keys = {
+            (name, counter): f'response-stats:{name}:{counter}'
+            for name in names for counter in COUNTERS
+        }
+        values = self.cache.get_many(keys.values())
+        stats = {}
+        for (name, counter), key in keys.items():
+            stats.setdefault(name, {})[counter] = values.get(key, 0)
+        for counters in stats.values():
+            lookups = counters['hits'] + counters['stale_hits'] + counters['misses']
+            counters['hit_rate'] = (
+                (counters['hits'] + counters['stale_hits']) / lookups if lookups else None
+            )
+        return stats
+
+    def _build(self, key, build, generations, timeout):
+        value = build()
+        self.cache.set(
+            key,
+            (value, generations, time.time() + timeout),
+            timeout + RESPONSE_CACHE_STALE_TIMEOUT
+        )
+        return value
+
+    def get_or_build(self, name, build, tags=(), scope='', params=None,
+                     timeout=RESPONSE_CACHE_TIMEOUT):
+        """
+        Return the cached value of `build()` for (name, scope, params),
+        rebuilding it when it expired or one of `tags` was invalidated.
+        Exceptions raised by `build` (e.g. Http404) are not cached.
+        """
+        key = self.make_key(name, scope, params)
+        generations = self.generations(tags)
+        entry = self.cache.get(key)
+        if entry is None:
+            self.count(name, 'misses')
+            return self._build(key, build, generations, timeout)
+
+        value, built_generations, fresh_until = entry
+        if built_generations == generations and time.time() < fresh_until:
+            self.count(name, 'hits')
+            return value
+
+        lock_key = f'{key}:rebuild'
+        if not self.cache.add(lock_key, 1, REBUILD_LOCK_TIMEOUT):
+            # Someone else is rebuilding, serve the stale value meanwhile
+            self.count(name, 'stale_hits')
+            return value
+        self.count(name, 'rebuilds')
+        try:
+            return self._build(key, build, generations, timeout)
+        finally:
+            self.cache.delete(lock_key)
+
+
+response_cache = ResponseCache()
+
+
+def invalidate_on_commit(*tags):
+    """Invalidate `tags` once the current transaction commits"""
+    transaction.on_commit(lambda: response_cache.invalidate(*tags))
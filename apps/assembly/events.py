@@ -0,0 +1,191 @@
+import asyncio
+import itertools
+import threading
+from collections import defaultdict
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+# Events buffered per subscriber before it is told to resync
+SUBSCRIBER_QUEUE_SIZE = 100
+# ASGI scope key of the asyncio.Event set by watch_disconnects()
+DISCONNECTED_SCOPE_KEY = 'aircraft_production.disconnected'
+
+
+def aircraft_channel(aircraft_id):
+    return f'aircraft:{aircraft_id}'
+
+
+def team_channel(team_id):
+    return f'team:{team_id}'
+
+
+class Subscription:
+    """
+    Events of a set of channels for one subscriber, consumed on the event
+    loop that created it. Delivery never blocks the publisher: when the
+    queue is full the event is dropped and `overflowed` is set, telling the
+    client to reload instead of trusting an incomplete stream.
+    """
+
+    def __init__(self, broker, channels, queue_size=SUBSCRIBER_QUEUE_SIZE):
+        self.broker = broker
+        self.channels = tuple(channels)
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(queue_size)
+        self.overflowed = False
+
+    def deliver(self, event):
+        """Hand an event over from any thread"""
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # The subscriber's event loop is gone
+            self.broker.unsubscribe(self)
+
+    def _put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self, timeout):
+        """Next event, raises asyncio.TimeoutError after `timeout` seconds"""
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.broker.unsubscribe(self)
+
+
+class LocalEventBroker:
+    """
+    In-process fan-out of events to the subscribers of this worker.
+
+    Subscribers are asyncio queues, so an idle subscriber costs a queue
+    and a set entry, not a thread. Only subscribers in the publishing
+    process receive an event; deployments with several workers swap this
+    for a broker backed implementation with the same publish/subscribe
+    interface through settings.WORKFLOW_EVENT_BROKER.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def subscribe(self, channels):
+        """Subscribe the running event loop to `channels`, use as a context manager"""
+        subscription = Subscription(self, channels)
+        with self._lock:
+            for channel in subscription.channels:
+                self._subscribers[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._subscribers.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscribers[channel]
+
+    def publish(self, event, channels):
+        """Deliver `event` once to every subscriber of any of `channels`"""
+        with self._lock:
+            subscribers = set().union(*(self._subscribers.get(channel, ()) for channel in channels))
+        for subscription in subscribers:
+            subscription.deliver(event)
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(set().union(*self._subscribers.values()))
+
+
+_broker = None
+_broker_lock = threading.Lock()
+_event_ids = itertools.count(1)
+
+
+def get_broker():
+    """The process wide broker configured by settings.WORKFLOW_EVENT_BROKER"""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(
+                    getattr(settings, 'WORKFLOW_EVENT_BROKER', 'apps.assembly.events.LocalEventBroker')
+                )()
+    return _broker
+
+
+def step_transition_event(step, from_status, to_status, user=None):
+    return {
+        'type': 'step_transition',
+        'step': step.id,
+        'aircraft': step.assembled_aircraft_id,
+        'team': step.assigned_team_id,
+        'step_type': step.step_type,
+        'from_status': from_status,
+        'status': to_status,
+        'user': getattr(user, 'id', None),
+        'at': timezone.now().isoformat(),
+    }
+
+
+def publish_on_commit(events):
+    """Publish events to their aircraft and team channels once the transaction commits"""
+    events = list(events)
+    if not events:
+        return
+
+    def publish():
+        broker = get_broker()
+        for event in events:
+            event['id'] = next(_event_ids)
+            broker.publish(event, (aircraft_channel(event['aircraft']), team_channel(event['team'])))
+
+    transaction.on_commit(publish)
+
+
+def watch_disconnects(app):
+    """
+    ASGI middleware setting scope[DISCONNECTED_SCOPE_KEY], an asyncio.Event,
+    once the client of an HTTP request disconnects.
+
+    Django 4.2's ASGI handler stops receiving after the request body, so a
+    streaming response never learns that its client left, and uvicorn
+    silently drops what is sent afterwards. Once the body is read, this
+    keeps receiving for the handler and sets the event on http.disconnect,
+    for streams such as workflow_events to end on.
+    """
+    async def middleware(scope, receive, send):
+        if scope['type'] != 'http':
+            return await app(scope, receive, send)
+
+        disconnected = asyncio.Event()
+        watcher = None
+
+        async def wait_for_disconnect():
+            while (await receive())['type'] != 'http.disconnect':
+                pass
+            disconnected.set()
+
+        async def receive_body():
+            nonlocal watcher
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                disconnected.set()
+            elif not message.get('more_body', False) and watcher is None:
+                watcher = asyncio.ensure_future(wait_for_disconnect())
+            return message
+
+        try:
+            await app({**scope, DISCONNECTED_SCOPE_KEY: disconnected}, receive_body, send)
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+    return middleware
@@ -0,0 +1,41 @@
+from django import forms
+from django.utils.translation import gettext_lazy as _
+from apps.parts.models import Aircraft
+from .production import MAX_ORDER_QUANTITY, MAX_PRIORITY
+
+class ProductionOrderForm(forms.Form):
+    aircraft_type = forms.ChoiceField(
+        label=_('Aircraft Type'),
+        choices=Aircraft.AIRCRAFT_TYPES,
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
+    name = forms.CharField(
+        label=_('Aircraft Name'),
+        max_length=90,
+        widget=forms.TextInput(attrs={'class': 'form-control'})
+    )
+    quantity = forms.IntegerField(
+        label=_('Quantity'),
+        min_value=1,
+        max_value=MAX_ORDER_QUANTITY,
+        initial=1,
+        widget=forms.NumberInput(attrs={'class': 'form-control'})
+    )
+    due_date = forms.DateTimeField(
+        label=_('Due Date'),
+        required=False,
+        input_formats=['%Y-%m-%dT%H:%M'],
+        widget=forms.DateTimeInput(attrs={'class': 'form-control', 'type': 'datetime-local'}, format='%Y-%m-%dT%H:%M')
+    )
+    priority = forms.IntegerField(
+        label=_('Priority'),
+        min_value=1,
+        max_value=MAX_PRIORITY,
+        initial=1,
+        widget=forms.NumberInput(attrs={'class': 'form-control'})
+    )
+    description = forms.CharField(
+        label=_('Description'),
+        required=False,
+        widget=forms.Textarea(attrs={'class': 'form-control', 'rows': 3})
+    )
@@ -0,0 +1,120 @@
+from collections import Counter
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+from apps.parts.models import Part
+from .cache import invalidate_on_commit
+from .models import PartInventory, PartReservation
+
+# Part fields making up a ledger key, in PartInventory column order
+INVENTORY_FIELDS = ('aircraft_type', 'part_type', 'status', 'quality_check_status', 'is_used')
+
+
+def make_key(aircraft_type, part_type, status, quality_check_status, is_used):
+    """Ledger key of a part state; missing values are stored as empty strings"""
+    return (
+        '' if aircraft_type is None else str(aircraft_type),
+        part_type or '',
+        status or '',
+        quality_check_status or '',
+        bool(is_used),
+    )
+
+
+def key_for(part):
+    return make_key(*(
+        getattr(part, Part._meta.get_field(field).attname) for field in INVENTORY_FIELDS
+    ))
+
+
+def count_parts(queryset):
+    """Counter of ledger key -> number of parts in the queryset"""
+    return Counter({
+        make_key(*(row[field] for field in INVENTORY_FIELDS)): row['count']
+        for row in queryset.order_by().values(*INVENTORY_FIELDS).annotate(count=Count('id'))
+    })
+
+
+def record_changes(changes):
+    """
+    Apply {key: delta} to the ledger. Missing rows are created first and
+    every row is then incremented in key order, so concurrent callers lock
+    ledger rows in the same order. Call it inside the transaction that
+    changes the parts.
+    """
+    changes = {key: delta for key, delta in changes.items() if delta}
+    if not changes:
+        return
+    with transaction.atomic():
+        PartInventory.objects.bulk_create([
+            PartInventory(**dict(zip(INVENTORY_FIELDS, key))) for key in changes
+        ], ignore_conflicts=True)
+        for key in sorted(changes):
+            PartInventory.objects.filter(**dict(zip(INVENTORY_FIELDS, key))).update(
+                count=F('count') + changes[key]
+            )
+        invalidate_on_commit('parts')
+
+
+def save_part(part, **kwargs):
+    """
+    Save a part and move it in the ledger in one transaction. Change part
+    states through this: the pre_save signal locks the stored row for the
+    transaction, so the save and its ledger update commit together and
+    concurrent saves of the part are applied one after the other. A save
+    outside a transaction reads the stored state unlocked and updates the
+    ledger after the part committed.
+    """
+    with transaction.atomic():
+        part.save(**kwargs)
+
+
+def record_created(parts):
+    record_changes(Counter(key_for(part) for part in parts))
+
+
+def mark_parts_used(parts):
+    """Flag the unused parts of the queryset as used and move them in the ledger"""
+    with transaction.atomic():
+        part_ids = list(
+            parts.filter(is_used=False).select_for_update(of=('self',)).values_list('id', flat=True)
+        )
+        if not part_ids:
+            return 0
+        moved = count_parts(Part.objects.filter(id__in=part_ids))
+        Part.objects.filter(id__in=part_ids).update(is_used=True)
+
+        changes = Counter()
+        for key, count in moved.items():
+            changes[key] -= count
+            changes[key[:-1] + (True,)] += count
+        record_changes(changes)
+    return len(part_ids)
+
+
+def available_counts(aircraft_type):
+    """
+    Parts of an aircraft type ready for assembly, per part type: finished,
+    quality checked and unused in the ledger, minus the ones under an
+    active reservation.
+    """
+    ready = {'status': 'completed', 'quality_check_status': 'passed', 'is_used': False}
+    in_stock = PartInventory.objects.filter(
+        aircraft_type=str(aircraft_type), **ready
+    ).values('part_type').annotate(total=Sum('count')).filter(total__gt=0).values_list(
+        'part_type', 'total'
+    )
+    reserved = dict(
+        PartReservation.objects.filter(
+            expires_at__gt=timezone.now(),
+            part__aircraft_type=aircraft_type,
+            **{f'part__{field}': value for field, value in ready.items()}
+        ).order_by().values('part__part_type').annotate(total=Count('id')).values_list(
+            'part__part_type', 'total'
+        )
+    )
+    return {
+        part_type: total - reserved.get(part_type, 0)
+        for part_type, total in in_stock
+        if total > reserved.get(part_type, 0)
+    }
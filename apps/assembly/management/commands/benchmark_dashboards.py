@@ -0,0 +1,103 @@
+import asyncio
+import random
+import statistics
+import time
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.contrib.sessions.backends.cache import SessionStore
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+from apps.accounts.models import User
+from apps.parts.models import Part
+from apps.teams.registry import reference_data
+from apps.assembly import views
+from apps.assembly.models import AssembledAircraft, WorkflowEvent
+from apps.assembly.production import create_production_order, MAX_ORDER_QUANTITY
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the latency of the sync and async workflow_list and '
+        'quality_checks views on the same seeded dataset'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--aircraft', type=int, default=2000, help='Aircraft to seed, 0 uses the current data')
+        parser.add_argument('--requests', type=int, default=20, help='Requests per view')
+
+    def handle(self, *args, **options):
+        if connection.vendor == 'sqlite':
+            raise CommandError('SQLite serializes connections, the comparison needs a database server')
+        user = User.objects.filter(profile__team__team_type='assembly').first()
+        if not user:
+            raise CommandError('A user in an assembly team is required')
+
+        # Seeded rows are committed, the async views read them on other connections
+        seeded = self.seed(options['aircraft'], user) if options['aircraft'] else []
+        try:
+            self.run(user, options['requests'])
+        finally:
+            if seeded:
+                Part.objects.filter(assembled_in__in=seeded).delete()
+                AssembledAircraft.objects.filter(id__in=[aircraft.id for aircraft in seeded]).delete()
+                WorkflowEvent.objects.filter(aircraft_id__in=[aircraft.id for aircraft in seeded]).delete()
+
+    def seed(self, count, user):
+        aircraft = []
+        for offset in range(0, count, MAX_ORDER_QUANTITY):
+            aircraft += create_production_order(
+                aircraft_type='tb2',
+                name='Dashboard Benchmark',
+                quantity=min(MAX_ORDER_QUANTITY, count - offset),
+                assembly_team=reference_data.team_by_type('assembly'),
+                created_by=user
+            )
+        self.stdout.write(f"Seeded {len(aircraft)} aircraft")
+        return aircraft
+
+    def make_request(self, user, path, number):
+        # A distinct, non filtering date_to per request keeps the cached
+        # listing summary from hiding the aggregate queries
+        year = 3000 + (self.run_offset + number) % 6000
+        request = RequestFactory().get(path, {'date_to': f'{year}-01-01'})
+        request.user = user
+        request.session = SessionStore()
+        request._messages = FallbackStorage(request)
+        return request
+
+    def run(self, user, count):
+        self.run_offset = random.randrange(6000)
+        cases = [
+            ('workflow_list', '/assembly/', views.workflow_list, views.workflow_list_async),
+            ('quality_checks', '/assembly/quality-checks/', views.quality_checks, views.quality_checks_async),
+        ]
+        self.stdout.write(f"{'view':<16} {'mode':<6} {'p50 ms':>8} {'p95 ms':>8} {'mean ms':>8}")
+        for name, path, sync_view, async_view in cases:
+            sync_view(self.make_request(user, path, -1))
+            timings = []
+            for number in range(1, count + 1):
+                request = self.make_request(user, path, number)
+                started = time.perf_counter()
+                sync_view(request)
+                timings.append(time.perf_counter() - started)
+            self.report(name, 'sync', timings)
+
+            timings = asyncio.run(self.time_async(async_view, user, path, count))
+            self.report(name, 'async', timings)
+
+    async def time_async(self, view, user, path, count):
+        await view(self.make_request(user, path, -2))
+        timings = []
+        for number in range(1, count + 1):
+            request = self.make_request(user, path, number + count)
+            started = time.perf_counter()
+            await view(request)
+            timings.append(time.perf_counter() - started)
+        return timings
+
+    def report(self, name, mode, timings):
+        timings = sorted(timing * 1000 for timing in timings)
+        self.stdout.write(
+            f"{name:<16} {mode:<6} {statistics.median(timings):>8.1f} "
+            f"{timings[max(int(len(timings) * 0.95) - 1, 0)]:>8.1f} {statistics.mean(timings):>8.1f}"
+        )
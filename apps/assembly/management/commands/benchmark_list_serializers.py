@@ -0,0 +1,87 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+from apps.accounts.models import User
+from apps.teams.registry import reference_data
+from apps.assembly.models import AssembledAircraft, WorkflowStep
+from apps.assembly.production import create_production_order, MAX_ORDER_QUANTITY
+from apps.assembly.serializers import (
+    AssembledAircraftListSerializer,
+    AssembledAircraftSerializer,
+    WorkflowStepListSerializer,
+    WorkflowStepSerializer
+)
+
+
+class RollbackSeed(Exception):
+    """Raised to roll back the seeded data once the benchmark is done"""
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the model serializers with the values() projection list '
+        'serializers on seeded workflow steps and aircraft'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000, help='Rows serialized per run')
+        parser.add_argument('--repeat', type=int, default=3, help='Runs per serializer, the best is reported')
+
+    def handle(self, *args, **options):
+        assembly_team = reference_data.team_by_type('assembly')
+        user = User.objects.filter(is_superuser=True).first() or User.objects.first()
+        if not assembly_team or not user:
+            raise CommandError('An assembly team and at least one user are required')
+
+        try:
+            with transaction.atomic():
+                self.seed(options['rows'], assembly_team, user)
+                self.run(options['rows'], options['repeat'])
+                raise RollbackSeed
+        except RollbackSeed:
+            pass
+
+    def seed(self, rows, assembly_team, user):
+        # Assign every step so the team and user joins have something to do
+        for offset in range(0, rows, MAX_ORDER_QUANTITY):
+            create_production_order(
+                aircraft_type='tb2',
+                name='Serializer Benchmark',
+                quantity=min(MAX_ORDER_QUANTITY, rows - offset),
+                assembly_team=assembly_team,
+                created_by=user
+            )
+        WorkflowStep.objects.update(assigned_user=user)
+        self.stdout.write(f"Seeded {rows} aircraft")
+
+    def run(self, rows, repeat):
+        steps = WorkflowStep.objects.with_previous_status().with_note_summary().order_by('-created_at', '-id')
+        aircraft = AssembledAircraft.objects.order_by('-created_at', '-id')
+        cases = [
+            ('steps, model serializer',
+             lambda: WorkflowStepSerializer(steps[:rows], many=True).data),
+            ('steps, projection',
+             lambda: WorkflowStepListSerializer(WorkflowStepListSerializer.project(steps)[:rows], many=True).data),
+            ('aircraft, model serializer',
+             lambda: AssembledAircraftSerializer(aircraft.prefetch_related('workflow_steps')[:rows], many=True).data),
+            ('aircraft, projection',
+             lambda: AssembledAircraftListSerializer(
+                 AssembledAircraftListSerializer.project(aircraft)[:rows], many=True).data),
+        ]
+
+        renderer = JSONRenderer()
+        self.stdout.write(f"{'case':<28} {'rows/s':>10} {'queries':>8} {'bytes':>11}")
+        for label, serialize in cases:
+            best = None
+            for _ in range(repeat):
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    data = serialize()
+                    body = renderer.render(data)
+                    elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+            self.stdout.write(
+                f"{label:<28} {len(data) / best:>10.0f} {len(queries):>8} {len(body):>11}"
+            )
@@ -0,0 +1,144 @@
+import statistics
+import threading
+import time
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from apps.accounts.models import User
+from apps.parts.models import Part
+from apps.teams.registry import reference_data
+from apps.assembly import inventory
+from apps.assembly.allocation import allocate_parts, required_part_counts
+from apps.assembly.models import AssembledAircraft, PartReservation
+from apps.assembly.production import REQUIRED_PARTS
+
+
+class Command(BaseCommand):
+    help = (
+        'Allocate parts from many parallel workers and report throughput, '
+        'latency and whether any part was booked twice'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--allocators', type=int, default=16, help='Parallel allocating workers')
+        parser.add_argument('--rounds', type=int, default=5, help='Allocations per worker')
+        parser.add_argument('--per-type', type=int, default=2, help='Parts of each type per allocation')
+        parser.add_argument(
+            '--blocking',
+            action='store_true',
+            help='Lock with plain FOR UPDATE instead of SKIP LOCKED, for comparison'
+        )
+        parser.add_argument('--keep', action='store_true', help='Keep the generated aircraft and parts')
+
+    def handle(self, *args, **options):
+        if connection.vendor == 'sqlite':
+            raise CommandError('The benchmark needs a database with row level locking')
+        assembly_team = reference_data.team_by_type('assembly')
+        user = User.objects.filter(is_superuser=True).first() or User.objects.first()
+        if not assembly_team or not user:
+            raise CommandError('An assembly team and at least one user are required')
+
+        allocations = options['allocators'] * options['rounds']
+        requirements = {part_type: options['per_type'] for part_type in required_part_counts()}
+        aircrafts, parts = self.seed(allocations, requirements, assembly_team, user)
+        self.stdout.write(
+            f"Seeded {len(parts)} parts for {allocations} allocations of "
+            f"{sum(requirements.values())} parts each"
+        )
+
+        try:
+            latencies, failures, elapsed = self.run_allocators(
+                aircrafts, requirements, user, options
+            )
+            self.report(latencies, failures, elapsed, aircrafts, requirements)
+        finally:
+            if not options['keep']:
+                AssembledAircraft.objects.filter(id__in=[aircraft.id for aircraft in aircrafts]).delete()
+                Part.objects.filter(id__in=[part.id for part in parts]).delete()
+
+    def seed(self, allocations, requirements, assembly_team, user):
+        aircrafts = AssembledAircraft.objects.bulk_create([
+            AssembledAircraft(
+                name=f'Allocation Benchmark #{number}',
+                aircraft_type='tb2',
+                assembly_team=assembly_team
+            )
+            for number in range(1, allocations + 1)
+        ])
+        teams = reference_data.teams_by_type()
+        part_teams = {
+            part_type: teams.get(team_type)
+            for team_type, required in REQUIRED_PARTS.items()
+            for part_type, _ in required
+        }
+        parts = Part.objects.bulk_create([
+            Part(
+                name=f'Allocation Benchmark {part_type}',
+                part_type=part_type,
+                aircraft_type='tb2',
+                team=part_teams[part_type],
+                created_by=user,
+                status='completed',
+                quality_check_status='passed'
+            )
+            for part_type, count in requirements.items()
+            for _ in range(count * allocations)
+        ])
+        inventory.record_created(parts)
+        return aircrafts, parts
+
+    def run_allocators(self, aircrafts, requirements, user, options):
+        latencies = []
+        failures = []
+        lock = threading.Lock()
+        barrier = threading.Barrier(options['allocators'], timeout=30)
+        rounds = options['rounds']
+
+        def worker(index):
+            try:
+                barrier.wait()
+                for aircraft in aircrafts[index * rounds:(index + 1) * rounds]:
+                    started = time.perf_counter()
+                    try:
+                        allocate_parts(
+                            aircraft, requirements, user=user,
+                            skip_locked=not options['blocking']
+                        )
+                    except ValidationError as e:
+                        with lock:
+                            failures.append(' '.join(e.messages))
+                    with lock:
+                        latencies.append(time.perf_counter() - started)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=worker, args=(index,))
+            for index in range(options['allocators'])
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return latencies, failures, time.perf_counter() - started
+
+    def report(self, latencies, failures, elapsed, aircrafts, requirements):
+        latencies.sort()
+        self.stdout.write(f"Allocations:    {len(latencies)} in {elapsed:.2f}s ({len(latencies) / elapsed:.1f}/s)")
+        self.stdout.write(f"Latency p50:    {statistics.median(latencies) * 1000:.1f} ms")
+        self.stdout.write(f"Latency p95:    {latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f} ms")
+        self.stdout.write(f"Shortages:      {len(failures)}")
+
+        expected = sum(requirements.values())
+        wrong = AssembledAircraft.objects.filter(
+            id__in=[aircraft.id for aircraft in aircrafts]
+        ).annotate(reserved=Count('part_reservations')).exclude(
+            reserved__in=(0, expected)
+        ).count()
+        reserved = PartReservation.objects.filter(aircraft__in=aircrafts).count()
+        self.stdout.write(f"Parts reserved: {reserved}")
+        if wrong:
+            raise CommandError(f"{wrong} aircraft ended up with a partial allocation")
+        self.stdout.write(self.style.SUCCESS('No part was booked twice and no allocation was partial'))
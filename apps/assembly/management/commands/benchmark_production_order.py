@@ -0,0 +1,68 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from apps.accounts.models import User
+from apps.teams.models import Team
+from apps.assembly.production import create_production_order, MAX_ORDER_QUANTITY
+
+
+class RollbackBenchmark(Exception):
+    """Raised to roll back the records created by a benchmark run"""
+
+
+class Command(BaseCommand):
+    help = 'Measure query count and wall time of production orders of different sizes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            nargs='+',
+            type=int,
+            default=[1, 10, 100],
+            help='Order quantities to benchmark'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Number of runs per size, the best time is reported'
+        )
+
+    def handle(self, *args, **options):
+        assembly_team = Team.objects.filter(team_type='assembly').order_by('name', 'pk').first()
+        if not assembly_team:
+            raise CommandError('An assembly team is required to run the benchmark')
+        user = User.objects.filter(is_superuser=True).first() or User.objects.first()
+        if not user:
+            raise CommandError('At least one user is required to run the benchmark')
+
+        self.stdout.write(f"{'Quantity':>10} {'Queries':>10} {'Best time (ms)':>16} {'Per aircraft (ms)':>18}")
+        for size in options['sizes']:
+            if size < 1 or size > MAX_ORDER_QUANTITY:
+                raise CommandError(f'Sizes must be between 1 and {MAX_ORDER_QUANTITY}')
+
+            best = None
+            queries = 0
+            for _ in range(options['repeat']):
+                try:
+                    with transaction.atomic():
+                        with CaptureQueriesContext(connection) as context:
+                            started = time.perf_counter()
+                            create_production_order(
+                                aircraft_type='tb2',
+                                name='Benchmark',
+                                quantity=size,
+                                assembly_team=assembly_team,
+                                created_by=user
+                            )
+                            elapsed = time.perf_counter() - started
+                        queries = len(context.captured_queries)
+                        raise RollbackBenchmark
+                except RollbackBenchmark:
+                    pass
+                best = elapsed if best is None else min(best, elapsed)
+
+            self.stdout.write(
+                f"{size:>10} {queries:>10} {best * 1000:>16.1f} {best * 1000 / size:>18.2f}"
+            )
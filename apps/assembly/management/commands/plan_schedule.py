@@ -0,0 +1,45 @@
+import time
+from django.core.management.base import BaseCommand
+from apps.assembly.models import ProductionSchedule
+from apps.assembly.scheduling import SEARCH_TIME_BUDGET, build_schedule, replan_pending
+
+
+class Command(BaseCommand):
+    help = (
+        'Re-plan the start times of every open workflow step. Steps finishing '
+        'in between queue their own aircraft, run this with --pending every '
+        'minute or so to re-plan them and without it periodically to '
+        're-optimize the whole line.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--objective', choices=ProductionSchedule.Objective.values,
+            help='Keep the current objective when omitted'
+        )
+        parser.add_argument(
+            '--budget', type=float, default=SEARCH_TIME_BUDGET,
+            help='Seconds of local search after the dispatching rule'
+        )
+        parser.add_argument(
+            '--pending', action='store_true',
+            help='Only re-plan the aircraft queued since the last run'
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        if options['pending']:
+            replanned = replan_pending()
+            self.stdout.write(
+                'Skipped: no plan yet or a full re-plan is running' if replanned is None
+                else f"Re-planned {replanned} aircraft in {time.perf_counter() - started:.1f}s"
+            )
+            return
+
+        schedule = build_schedule(options['objective'], options['budget'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Planned {schedule.planned_steps} steps in {time.perf_counter() - started:.1f}s "
+            f"({schedule.get_objective_display()}): makespan until {schedule.makespan_end:%Y-%m-%d %H:%M}, "
+            f"weighted tardiness {schedule.weighted_tardiness_hours:.1f}h"
+            if schedule.makespan_end else f"Nothing to plan ({schedule.get_objective_display()})"
+        ))
@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, Q
+from apps.assembly.models import AssembledAircraft, WorkflowStep
+
+
+class Command(BaseCommand):
+    help = 'Rebuild workflow progress counters of assembled aircraft from their steps'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Rebuild every aircraft instead of only the ones that have drifted'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report the aircraft that would be rebuilt'
+        )
+
+    def handle(self, *args, **options):
+        aircrafts = AssembledAircraft.objects.all()
+        if not options['all']:
+            aircrafts = aircrafts.annotate(
+                actual_total=Count('workflow_steps'),
+                actual_completed=Count(
+                    'workflow_steps',
+                    filter=Q(workflow_steps__status=WorkflowStep.Status.COMPLETED)
+                ),
+                actual_failed=Count(
+                    'workflow_steps',
+                    filter=Q(workflow_steps__status=WorkflowStep.Status.FAILED)
+                ),
+                actual_in_progress=Count(
+                    'workflow_steps',
+                    filter=Q(workflow_steps__status=WorkflowStep.Status.IN_PROGRESS)
+                ),
+            ).exclude(
+                Q(total_steps=F('actual_total')) &
+                Q(completed_steps=F('actual_completed')) &
+                Q(failed_steps=F('actual_failed')) &
+                Q(in_progress_steps=F('actual_in_progress'))
+            )
+
+        rebuilt = 0
+        for aircraft in aircrafts.iterator():
+            if options['dry_run']:
+                self.stdout.write(f"Would rebuild #{aircraft.id} {aircraft}")
+            else:
+                with transaction.atomic():
+                    # Lock the row so concurrent step transitions wait for the rebuild
+                    aircraft = AssembledAircraft.objects.select_for_update().get(pk=aircraft.pk)
+                    aircraft.update_status()
+            rebuilt += 1
+
+        action = 'would be rebuilt' if options['dry_run'] else 'rebuilt'
+        self.stdout.write(self.style.SUCCESS(f"{rebuilt} aircraft {action}"))
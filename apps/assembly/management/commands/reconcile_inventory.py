@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from apps.parts.models import Part
+from apps.assembly.inventory import INVENTORY_FIELDS, count_parts
+from apps.assembly.models import PartInventory
+
+
+class Command(BaseCommand):
+    help = 'Verify the part inventory ledger against the Part table'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fix',
+            action='store_true',
+            help='Overwrite drifted ledger rows with the counts from the Part table'
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            ledger = {
+                tuple(getattr(row, field) for field in INVENTORY_FIELDS): row
+                for row in PartInventory.objects.select_for_update()
+            }
+            actual = count_parts(Part.objects.all())
+
+            drifted = []
+            for key in sorted(set(ledger) | set(actual)):
+                recorded = ledger[key].count if key in ledger else 0
+                if recorded != actual[key]:
+                    drifted.append((key, recorded, actual[key]))
+                    self.stdout.write(
+                        f"{' / '.join(str(value) for value in key)}: ledger {recorded}, parts {actual[key]}"
+                    )
+
+            if drifted and options['fix']:
+                for key, recorded, count in drifted:
+                    if key in ledger:
+                        ledger[key].count = count
+                        ledger[key].save(update_fields=['count'])
+                    else:
+                        PartInventory.objects.create(count=count, **dict(zip(INVENTORY_FIELDS, key)))
+
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS('Inventory ledger matches the Part table'))
+        elif options['fix']:
+            self.stdout.write(self.style.SUCCESS(f"{len(drifted)} ledger row(s) fixed"))
+        else:
+            raise CommandError(f"{len(drifted)} ledger row(s) drifted, run with --fix to repair them")
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from apps.assembly.rollups import ROLLUPS
+
+
+class Command(BaseCommand):
+    help = (
+        'Refresh the daily rollup tables from workflow steps and parts changed '
+        'since the last run. Schedule it frequently; dashboards read complete '
+        'days from the rollups.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Rebuild every day, e.g. after source rows were deleted'
+        )
+
+    def handle(self, *args, **options):
+        for rollup in ROLLUPS:
+            days = rollup.refresh(full=options['full'])
+            if days:
+                self.stdout.write(
+                    f"{rollup.name}: {len(days)} day(s) recomputed ({days[0]} - {days[-1]})"
+                )
+            else:
+                self.stdout.write(f"{rollup.name}: up to date")
+        self.stdout.write(self.style.SUCCESS('Rollups refreshed'))
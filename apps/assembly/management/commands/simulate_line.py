@@ -0,0 +1,84 @@
+import os
+import time
+from django.core.management.base import BaseCommand, CommandError
+from apps.assembly.simulation import (
+    DURATION_LOOKBACK_DAYS,
+    build_line_model,
+    parse_capacity,
+    run_monte_carlo
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Forecast throughput, WIP and the bottleneck team of an order backlog '
+        'with a Monte Carlo discrete-event simulation of the production line'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('backlog', type=int, help='Aircraft to produce')
+        parser.add_argument('--replications', type=int, default=1000)
+        parser.add_argument('--aircraft-type', default='', help='Workflow plan to simulate')
+        parser.add_argument(
+            '--release-interval', type=float, default=0.0,
+            help='Hours between two aircraft entering the line, 0 releases the whole backlog at once'
+        )
+        parser.add_argument(
+            '--capacity', nargs='*', default=[], metavar='TEAM_TYPE:WORKERS',
+            help='Override the workers of a team type, e.g. --capacity wing:4 assembly:6'
+        )
+        parser.add_argument('--lookback-days', type=int, default=DURATION_LOOKBACK_DAYS)
+        parser.add_argument('--seed', type=int, help='Make the run reproducible')
+        parser.add_argument('--workers', type=int, help='Processes, defaults to the number of CPUs')
+
+    def handle(self, *args, **options):
+        if options['backlog'] < 1 or options['replications'] < 1:
+            raise CommandError('backlog and replications must be positive')
+        try:
+            overrides = parse_capacity(options['capacity'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        model = build_line_model(options['aircraft_type'], options['lookback_days'])
+        unknown = set(overrides) - set(model.capacity)
+        if unknown:
+            raise CommandError(f"Team types not in the workflow: {', '.join(sorted(unknown))}")
+        model = model.with_capacity(overrides)
+        if model.estimated:
+            self.stdout.write(self.style.WARNING(
+                f"No history for {', '.join(model.estimated)}, assuming the default duration"
+            ))
+
+        started = time.perf_counter()
+        summary = run_monte_carlo(
+            model,
+            options['backlog'],
+            options['replications'],
+            release_interval=options['release_interval'],
+            seed=options['seed'],
+            workers=options['workers'] or os.cpu_count() or 1
+        )
+        elapsed = time.perf_counter() - started
+
+        makespan = summary['makespan_hours']
+        throughput = summary['throughput_per_week']
+        self.stdout.write(
+            f"{summary['replications']} replications of {summary['backlog']} aircraft in {elapsed:.1f}s"
+        )
+        self.stdout.write(
+            f"Makespan (days)      mean {makespan['mean'] / 24:.1f}  p10 {makespan['p10'] / 24:.1f}  "
+            f"p50 {makespan['p50'] / 24:.1f}  p90 {makespan['p90'] / 24:.1f}"
+        )
+        self.stdout.write(
+            f"Throughput (per wk)  mean {throughput['mean']:.2f}  p10 {throughput['p10']:.2f}  "
+            f"p90 {throughput['p90']:.2f}"
+        )
+        self.stdout.write(f"Mean WIP             {summary['mean_wip']:.1f} aircraft")
+        self.stdout.write(f"Mean lead time       {summary['mean_lead_time_hours'] / 24:.1f} days")
+        self.stdout.write(f"\n{'team':<10} {'workers':>7} {'util':>6} {'wait h':>8} {'bottleneck':>10}")
+        for team_type, stats in summary['teams'].items():
+            self.stdout.write(
+                f"{team_type:<10} {stats['workers']:>7} {stats['utilization']:>6.0%} "
+                f"{stats['mean_wait_hours']:>8.1f} {stats['bottleneck_share']:>10.0%}"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Bottleneck: {summary['bottleneck']}"))
@@ -0,0 +1,120 @@
+import threading
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.core.exceptions import ValidationError
+from django.db import connection
+from apps.accounts.models import User
+from apps.parts.models import Part
+from apps.teams.registry import reference_data
+from apps.assembly.models import AssembledAircraft, WorkflowEvent, WorkflowStep, StepTransitionConflict
+from apps.assembly.production import create_production_order
+
+
+class Command(BaseCommand):
+    help = (
+        'Start and complete the same workflow steps from many threads at once and '
+        'verify that no transition or progress counter update is lost'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8, help='Concurrent workers per step')
+        parser.add_argument('--aircraft', type=int, default=5, help='Number of aircraft to run through the workflow')
+        parser.add_argument('--keep', action='store_true', help='Keep the generated aircraft')
+
+    def handle(self, *args, **options):
+        if connection.vendor == 'sqlite':
+            raise CommandError('The stress test needs a database with row level concurrency')
+        assembly_team = reference_data.team_by_type('assembly')
+        user = User.objects.filter(is_superuser=True).first() or User.objects.first()
+        if not assembly_team or not user:
+            raise CommandError('An assembly team and at least one user are required')
+
+        aircrafts = create_production_order(
+            aircraft_type='tb2',
+            name='Stress Test',
+            quantity=options['aircraft'],
+            assembly_team=assembly_team,
+            created_by=user
+        )
+        aircraft_ids = [aircraft.id for aircraft in aircrafts]
+
+        try:
+            self.run_stress(aircraft_ids, user, options['threads'])
+            self.verify(aircraft_ids)
+        finally:
+            if not options['keep']:
+                part_ids = list(Part.objects.filter(assembled_in__in=aircraft_ids).values_list('id', flat=True))
+                AssembledAircraft.objects.filter(id__in=aircraft_ids).delete()
+                WorkflowEvent.objects.filter(aircraft_id__in=aircraft_ids).delete()
+                Part.objects.filter(id__in=part_ids).delete()
+
+    def run_stress(self, aircraft_ids, user, thread_count):
+        results = {'applied': 0, 'conflicts': 0, 'rejected': 0}
+        lock = threading.Lock()
+
+        def worker(step_id, action, barrier):
+            outcome = 'applied'
+            try:
+                step = WorkflowStep.objects.get(pk=step_id)
+                barrier.wait()
+                if action == 'start':
+                    step.start(user)
+                else:
+                    step.complete(success=True)
+            except StepTransitionConflict:
+                outcome = 'conflicts'
+            except ValidationError:
+                outcome = 'rejected'
+            finally:
+                connection.close()
+            with lock:
+                results[outcome] += 1
+
+        steps = list(
+            WorkflowStep.objects.filter(
+                assembled_aircraft_id__in=aircraft_ids
+            ).order_by('sequence').values_list('sequence', 'id')
+        )
+        waves = {}
+        for sequence, step_id in steps:
+            waves.setdefault(sequence, []).append(step_id)
+
+        started = time.perf_counter()
+        attempts = 0
+        # Every step of a wave is started and then completed by `thread_count`
+        # competing threads; only one of them may win each transition.
+        for sequence in sorted(waves):
+            for action in ('start', 'complete'):
+                threads = []
+                barrier = threading.Barrier(len(waves[sequence]) * thread_count, timeout=30)
+                for step_id in waves[sequence]:
+                    for _ in range(thread_count):
+                        threads.append(threading.Thread(target=worker, args=(step_id, action, barrier)))
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+                attempts += len(threads)
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            f"{attempts} attempts, {results['applied']} applied, "
+            f"{results['conflicts']} conflicts (409), {results['rejected']} rejected (400)"
+        )
+        self.stdout.write(
+            f"{elapsed:.2f}s, {attempts / elapsed:.0f} attempts/s, "
+            f"{results['applied'] / elapsed:.0f} transitions/s"
+        )
+
+        expected = len(steps) * 2
+        if results['applied'] != expected:
+            raise CommandError(f"Expected {expected} applied transitions, got {results['applied']}")
+
+    def verify(self, aircraft_ids):
+        for aircraft in AssembledAircraft.objects.filter(id__in=aircraft_ids):
+            counters = (aircraft.completed_steps, aircraft.in_progress_steps, aircraft.failed_steps, aircraft.status)
+            aircraft.update_status()
+            rebuilt = (aircraft.completed_steps, aircraft.in_progress_steps, aircraft.failed_steps, aircraft.status)
+            if counters != rebuilt:
+                raise CommandError(f"Lost update on aircraft #{aircraft.id}: {counters} != {rebuilt}")
+        self.stdout.write(self.style.SUCCESS('No lost updates: all progress counters match the workflow steps'))
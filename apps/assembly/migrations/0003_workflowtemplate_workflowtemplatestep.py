@@ -0,0 +1,72 @@
+# Generated by Django 4.2 on 2026-10-18 09:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+DEFAULT_WORKFLOW_STEPS = [
+    ('WING_PRODUCTION', 'wing'),
+    ('FUSELAGE_PRODUCTION', 'fuselage'),
+    ('TAIL_PRODUCTION', 'tail'),
+    ('AVIONICS_PRODUCTION', 'avionics'),
+    ('QUALITY_CHECK', 'assembly'),
+    ('ASSEMBLY', 'assembly'),
+    ('TESTING', 'assembly'),
+    ('FINAL_CHECK', 'assembly'),
+]
+
+
+def create_default_template(apps, schema_editor):
+    WorkflowTemplate = apps.get_model('assembly', 'WorkflowTemplate')
+    WorkflowTemplateStep = apps.get_model('assembly', 'WorkflowTemplateStep')
+    template = WorkflowTemplate.objects.create(name='Default', aircraft_type='')
+    WorkflowTemplateStep.objects.bulk_create([
+        WorkflowTemplateStep(template=template, step_type=step_type, team_type=team_type, order=order)
+        for order, (step_type, team_type) in enumerate(DEFAULT_WORKFLOW_STEPS, start=1)
+    ])
+
+
+def delete_default_template(apps, schema_editor):
+    WorkflowTemplate = apps.get_model('assembly', 'WorkflowTemplate')
+    WorkflowTemplate.objects.filter(aircraft_type='').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assembly', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WorkflowTemplate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('aircraft_type', models.CharField(blank=True, choices=[('tb2', 'TB2'), ('tb3', 'TB3'), ('akinci', 'AKINCI'), ('kizilelma', 'KIZILELMA')], help_text='Leave empty for the default template used by all other aircraft types', max_length=20, unique=True, verbose_name='Aircraft Type')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Workflow Template',
+                'verbose_name_plural': 'Workflow Templates',
+                'ordering': ['aircraft_type'],
+            },
+        ),
+        migrations.CreateModel(
+            name='WorkflowTemplateStep',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('step_type', models.CharField(choices=[('WING_PRODUCTION', 'Wing Production'), ('FUSELAGE_PRODUCTION', 'Fuselage Production'), ('TAIL_PRODUCTION', 'Tail Production'), ('AVIONICS_PRODUCTION', 'Avionics Production'), ('QUALITY_CHECK', 'Quality Check'), ('ASSEMBLY', 'Assembly'), ('TESTING', 'Testing'), ('FINAL_CHECK', 'Final Check')], max_length=50)),
+                ('team_type', models.CharField(choices=[('wing', 'Wing Team'), ('fuselage', 'Fuselage Team'), ('tail', 'Tail Team'), ('avionics', 'Avionics Team'), ('assembly', 'Assembly Team')], max_length=20)),
+                ('order', models.PositiveSmallIntegerField()),
+                ('template', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='steps', to='assembly.workflowtemplate')),
+            ],
+            options={
+                'verbose_name': 'Workflow Template Step',
+                'verbose_name_plural': 'Workflow Template Steps',
+                'ordering': ['template', 'order'],
+                'unique_together': {('template', 'order'), ('template', 'step_type')},
+            },
+        ),
+        migrations.RunPython(create_default_template, delete_default_template),
+    ]
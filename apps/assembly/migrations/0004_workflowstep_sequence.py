@@ -0,0 +1,41 @@
+# Generated by Django 4.2 on 2026-10-18 10:05
+
+from django.db import migrations, models
+
+STEP_ORDER = [
+    'WING_PRODUCTION',
+    'FUSELAGE_PRODUCTION',
+    'TAIL_PRODUCTION',
+    'AVIONICS_PRODUCTION',
+    'QUALITY_CHECK',
+    'ASSEMBLY',
+    'TESTING',
+    'FINAL_CHECK',
+]
+
+
+def backfill_sequence(apps, schema_editor):
+    """Existing steps were all created from the default workflow order"""
+    WorkflowStep = apps.get_model('assembly', 'WorkflowStep')
+    for sequence, step_type in enumerate(STEP_ORDER, start=1):
+        WorkflowStep.objects.filter(step_type=step_type).update(sequence=sequence)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assembly', '0003_workflowtemplate_workflowtemplatestep'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='workflowstep',
+            name='sequence',
+            field=models.PositiveSmallIntegerField(default=0, help_text='Position of the step in its workflow, starting at 1'),
+        ),
+        migrations.RunPython(backfill_sequence, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='workflowstep',
+            index=models.Index(fields=['assembled_aircraft', 'sequence'], name='assembly_step_aircraft_seq_idx'),
+        ),
+    ]
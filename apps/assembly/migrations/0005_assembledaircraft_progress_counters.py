@@ -0,0 +1,67 @@
+# Generated by Django 4.2 on 2026-10-18 11:20
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def populate_counters(apps, schema_editor):
+    AssembledAircraft = apps.get_model('assembly', 'AssembledAircraft')
+    WorkflowStep = apps.get_model('assembly', 'WorkflowStep')
+
+    def count_steps(**filters):
+        steps = WorkflowStep.objects.filter(
+            assembled_aircraft=OuterRef('pk'), **filters
+        ).order_by().values('assembled_aircraft').annotate(count=Count('id')).values('count')
+        return Coalesce(Subquery(steps), Value(0))
+
+    AssembledAircraft.objects.update(
+        total_steps=count_steps(),
+        completed_steps=count_steps(status='COMPLETED'),
+        failed_steps=count_steps(status='FAILED'),
+        in_progress_steps=count_steps(status='IN_PROGRESS'),
+        current_step_type=Coalesce(
+            Subquery(
+                WorkflowStep.objects.filter(
+                    assembled_aircraft=OuterRef('pk')
+                ).exclude(status='COMPLETED').order_by('sequence').values('step_type')[:1]
+            ),
+            Value('')
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assembly', '0004_workflowstep_sequence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assembledaircraft',
+            name='completed_steps',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='assembledaircraft',
+            name='current_step_type',
+            field=models.CharField(blank=True, max_length=50),
+        ),
+        migrations.AddField(
+            model_name='assembledaircraft',
+            name='failed_steps',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='assembledaircraft',
+            name='in_progress_steps',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='assembledaircraft',
+            name='total_steps',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
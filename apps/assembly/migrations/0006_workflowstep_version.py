@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-18 12:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assembly', '0005_assembledaircraft_progress_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='workflowstep',
+            name='version',
+            field=models.PositiveIntegerField(default=0, help_text='Incremented on every status transition for optimistic locking'),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 4.2 on 2026-10-18 13:10
+
+import datetime
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teams', '0001_initial'),
+        ('assembly', '0006_workflowstep_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('value', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DailyStepRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('aircraft_type', models.CharField(choices=[('tb2', 'TB2'), ('tb3', 'TB3'), ('akinci', 'AKINCI'), ('kizilelma', 'KIZILELMA')], max_length=20)),
+                ('step_type', models.CharField(choices=[('WING_PRODUCTION', 'Wing Production'), ('FUSELAGE_PRODUCTION', 'Fuselage Production'), ('TAIL_PRODUCTION', 'Tail Production'), ('AVIONICS_PRODUCTION', 'Avionics Production'), ('QUALITY_CHECK', 'Quality Check'), ('ASSEMBLY', 'Assembly'), ('TESTING', 'Testing'), ('FINAL_CHECK', 'Final Check')], max_length=50)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('IN_PROGRESS', 'In Progress'), ('COMPLETED', 'Completed'), ('FAILED', 'Failed'), ('BLOCKED', 'Blocked')], max_length=20)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('total_duration', models.DurationField(default=datetime.timedelta, help_text='Sum of the time between start and completion of the finished steps')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='teams.team')),
+            ],
+            options={
+                'verbose_name': 'Daily Step Rollup',
+                'verbose_name_plural': 'Daily Step Rollups',
+                'ordering': ['day'],
+                'unique_together': {('day', 'team', 'aircraft_type', 'step_type', 'status')},
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyPartRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(db_index=True)),
+                ('aircraft_type', models.CharField(max_length=20, null=True)),
+                ('status', models.CharField(max_length=20, null=True)),
+                ('quality_check_status', models.CharField(max_length=20, null=True)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('team', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='teams.team')),
+            ],
+            options={
+                'verbose_name': 'Daily Part Rollup',
+                'verbose_name_plural': 'Daily Part Rollups',
+                'ordering': ['day'],
+            },
+        ),
+    ]
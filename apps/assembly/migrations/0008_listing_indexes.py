@@ -0,0 +1,25 @@
+# Generated by Django 4.2 on 2026-10-18 13:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assembly', '0007_daily_rollups'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assembledaircraft',
+            index=models.Index(fields=['created_at', 'id'], name='assembly_aircraft_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='assembledaircraft',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='assembly_aircraft_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workflowstep',
+            index=models.Index(fields=['step_type', 'created_at', 'id'], name='assembly_step_type_created_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2 on 2026-10-18 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assembly', '0008_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='workflowstep',
+            index=models.Index(fields=['created_at', 'id'], name='assembly_step_created_idx'),
+        ),
+    ]
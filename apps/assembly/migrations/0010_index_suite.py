@@ -0,0 +1,37 @@
+# Generated by Django 4.2 on 2026-10-18 14:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assembly', '0009_workflowstep_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assembledaircraft',
+            index=models.Index(fields=['assembly_team', 'created_at'], name='assembly_aircraft_team_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workflowstep',
+            index=models.Index(fields=['step_type', 'status', 'created_at'], name='assembly_step_type_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workflowstep',
+            index=models.Index(fields=['assigned_team', 'status'], name='assembly_step_team_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workflowstep',
+            index=models.Index(fields=['assembled_aircraft', 'step_type'], name='assembly_step_craft_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workflowstep',
+            index=models.Index(condition=models.Q(('status__in', ('PENDING', 'IN_PROGRESS'))), fields=['assigned_team', 'created_at'], name='assembly_step_active_team_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workflowstep',
+            index=models.Index(condition=models.Q(('status__in', ('PENDING', 'IN_PROGRESS'))), fields=['step_type', 'created_at'], name='assembly_step_active_type_idx'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 4.2 on 2026-10-18 15:00
+
+from django.db import migrations, models
+from django.db.models import Count
+
+INVENTORY_FIELDS = ('aircraft_type', 'part_type', 'status', 'quality_check_status', 'is_used')
+
+
+def populate_inventory(apps, schema_editor):
+    Part = apps.get_model('parts', 'Part')
+    PartInventory = apps.get_model('assembly', 'PartInventory')
+    counts = {}
+    for row in Part.objects.order_by().values(*INVENTORY_FIELDS).annotate(count=Count('id')):
+        key = (
+            '' if row['aircraft_type'] is None else str(row['aircraft_type']),
+            row['part_type'] or '',
+            row['status'] or '',
+            row['quality_check_status'] or '',
+            bool(row['is_used']),
+        )
+        counts[key] = counts.get(key, 0) + row['count']
+    PartInventory.objects.bulk_create([
+        PartInventory(count=count, **dict(zip(INVENTORY_FIELDS, key)))
+        for key, count in counts.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parts', '0001_initial'),
+        ('assembly', '0010_index_suite'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PartInventory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('aircraft_type', models.CharField(blank=True, max_length=20)),
+                ('part_type', models.CharField(max_length=50)),
+                ('status', models.CharField(blank=True, max_length=20)),
+                ('quality_check_status', models.CharField(blank=True, max_length=20)),
+                ('is_used', models.BooleanField(default=False)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Part Inventory',
+                'verbose_name_plural': 'Part Inventory',
+                'unique_together': {('aircraft_type', 'part_type', 'status', 'quality_check_status', 'is_used')},
+            },
+        ),
+        migrations.RunPython(populate_inventory, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2 on 2026-10-18 15:30
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('parts', '0001_initial'),
+        ('assembly', '0011_partinventory'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PartReservation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('expires_at', models.DateTimeField(db_index=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('aircraft', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='part_reservations', to='assembly.assembledaircraft')),
+                ('part', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='reservation', to='parts.part')),
+                ('reserved_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Part Reservation',
+                'verbose_name_plural': 'Part Reservations',
+            },
+        ),
+    ]
@@ -0,0 +1,97 @@
+# Generated by Django 4.2 on 2026-10-18 16:00
+
+import re
+from datetime import datetime, timezone as dt_timezone
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+# WorkflowStep.add_note wrote "<UTC timestamp>: <note>" entries joined by newlines
+NOTE_ENTRY = re.compile(r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}): ?(.*)$')
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def split_notes(notes, fallback_time):
+    """
+    Split concatenated notes into (created_at, body) entries. Lines without
+    a timestamp continue the previous entry, text before the first
+    timestamp becomes an entry dated `fallback_time`.
+    """
+    entries = []
+    for line in notes.splitlines():
+        match = NOTE_ENTRY.match(line)
+        if match:
+            created_at = datetime.strptime(match.group(1), TIMESTAMP_FORMAT).replace(tzinfo=dt_timezone.utc)
+            entries.append([created_at, [match.group(2)]])
+        elif entries:
+            entries[-1][1].append(line)
+        else:
+            entries.append([fallback_time, [line]])
+    return [
+        (created_at, '\n'.join(lines).strip())
+        for created_at, lines in entries
+        if '\n'.join(lines).strip()
+    ]
+
+
+def notes_to_rows(apps, schema_editor):
+    WorkflowStep = apps.get_model('assembly', 'WorkflowStep')
+    WorkflowStepNote = apps.get_model('assembly', 'WorkflowStepNote')
+    notes = []
+    for step_id, text, updated_at in WorkflowStep.objects.exclude(notes='').values_list(
+        'id', 'notes', 'updated_at'
+    ).iterator():
+        notes += [
+            WorkflowStepNote(step_id=step_id, body=body, created_at=created_at)
+            for created_at, body in split_notes(text, updated_at)
+        ]
+        if len(notes) >= 1000:
+            WorkflowStepNote.objects.bulk_create(notes)
+            notes = []
+    WorkflowStepNote.objects.bulk_create(notes)
+
+
+def rows_to_notes(apps, schema_editor):
+    WorkflowStep = apps.get_model('assembly', 'WorkflowStep')
+    WorkflowStepNote = apps.get_model('assembly', 'WorkflowStepNote')
+    entries = {}
+    for step_id, body, created_at in WorkflowStepNote.objects.order_by(
+        'step_id', 'created_at', 'id'
+    ).values_list('step_id', 'body', 'created_at').iterator():
+        timestamp = created_at.astimezone(dt_timezone.utc).strftime(TIMESTAMP_FORMAT)
+        entries.setdefault(step_id, []).append(f"{timestamp}: {body}")
+    for step_id, lines in entries.items():
+        WorkflowStep.objects.filter(pk=step_id).update(notes='\n'.join(lines))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('assembly', '0012_partreservation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WorkflowStepNote',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('body', models.TextField()),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('author', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='workflow_step_notes', to=settings.AUTH_USER_MODEL)),
+                ('step', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='step_notes', to='assembly.workflowstep')),
+            ],
+            options={
+                'verbose_name': 'Workflow Step Note',
+                'verbose_name_plural': 'Workflow Step Notes',
+                'ordering': ['created_at', 'id'],
+                'indexes': [models.Index(fields=['step', 'created_at', 'id'], name='assembly_note_step_idx')],
+            },
+        ),
+        migrations.RunPython(notes_to_rows, rows_to_notes),
+        migrations.RemoveField(
+            model_name='workflowstep',
+            name='notes',
+        ),
+    ]
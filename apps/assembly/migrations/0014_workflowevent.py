@@ -0,0 +1,95 @@
+# Generated by Django 4.2 on 2026-10-18 16:30
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+BACKFILL_BATCH_SIZE = 2000
+
+
+def backfill_events(apps, schema_editor):
+    """
+    Reconstruct the log of existing steps from their timestamps: creation,
+    start by the assigned user, completion or failure, and every note.
+    """
+    WorkflowStep = apps.get_model('assembly', 'WorkflowStep')
+    WorkflowStepNote = apps.get_model('assembly', 'WorkflowStepNote')
+    WorkflowEvent = apps.get_model('assembly', 'WorkflowEvent')
+
+    def event(step, event_type, created_at, actor_id=None, from_status='', to_status=''):
+        return WorkflowEvent(
+            step_id=step.id,
+            aircraft_id=step.assembled_aircraft_id,
+            team_id=step.assigned_team_id,
+            step_type=step.step_type,
+            event_type=event_type,
+            from_status=from_status,
+            to_status=to_status,
+            actor_id=actor_id,
+            created_at=created_at
+        )
+
+    batch = []
+    steps = WorkflowStep.objects.order_by('id')
+    for step in steps.iterator(chunk_size=BACKFILL_BATCH_SIZE):
+        batch.append(event(step, 'CREATED', step.created_at))
+        if step.started_at:
+            batch.append(event(step, 'START', step.started_at, step.assigned_user_id, 'PENDING', 'IN_PROGRESS'))
+        if step.completed_at and step.status in ('COMPLETED', 'FAILED'):
+            batch.append(event(
+                step,
+                'COMPLETE' if step.status == 'COMPLETED' else 'FAIL',
+                step.completed_at,
+                from_status='IN_PROGRESS',
+                to_status=step.status
+            ))
+        if len(batch) >= BACKFILL_BATCH_SIZE:
+            WorkflowEvent.objects.bulk_create(batch)
+            batch = []
+
+    notes = WorkflowStepNote.objects.select_related('step').order_by('id')
+    for note in notes.iterator(chunk_size=BACKFILL_BATCH_SIZE):
+        batch.append(event(note.step, 'NOTE', note.created_at, note.author_id))
+        if len(batch) >= BACKFILL_BATCH_SIZE:
+            WorkflowEvent.objects.bulk_create(batch)
+            batch = []
+    WorkflowEvent.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('teams', '0001_initial'),
+        ('assembly', '0013_workflowstepnote'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WorkflowEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('step_type', models.CharField(choices=[('WING_PRODUCTION', 'Wing Production'), ('FUSELAGE_PRODUCTION', 'Fuselage Production'), ('TAIL_PRODUCTION', 'Tail Production'), ('AVIONICS_PRODUCTION', 'Avionics Production'), ('QUALITY_CHECK', 'Quality Check'), ('ASSEMBLY', 'Assembly'), ('TESTING', 'Testing'), ('FINAL_CHECK', 'Final Check')], max_length=50)),
+                ('event_type', models.CharField(choices=[('CREATED', 'Created'), ('START', 'Started'), ('COMPLETE', 'Completed'), ('FAIL', 'Failed'), ('NOTE', 'Note')], max_length=10)),
+                ('from_status', models.CharField(blank=True, max_length=20)),
+                ('to_status', models.CharField(blank=True, max_length=20)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='workflow_events', to=settings.AUTH_USER_MODEL)),
+                ('aircraft', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='assembly.assembledaircraft')),
+                ('step', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='events', to='assembly.workflowstep')),
+                ('team', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='teams.team')),
+            ],
+            options={
+                'verbose_name': 'Workflow Event',
+                'verbose_name_plural': 'Workflow Events',
+                'ordering': ['created_at', 'id'],
+                'indexes': [
+                    models.Index(fields=['created_at', 'id'], name='assembly_event_created_idx'),
+                    models.Index(fields=['aircraft', 'created_at', 'id'], name='assembly_event_aircraft_idx'),
+                    models.Index(fields=['step_type', 'created_at'], name='assembly_event_type_idx'),
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_events, migrations.RunPython.noop),
+    ]
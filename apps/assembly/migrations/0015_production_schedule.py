@@ -0,0 +1,59 @@
+# Generated by Django 4.2 on 2026-10-18 17:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teams', '0001_initial'),
+        ('assembly', '0014_workflowevent'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assembledaircraft',
+            name='due_date',
+            field=models.DateTimeField(blank=True, help_text='Promised delivery, the scheduler minimises weighted tardiness against it', null=True),
+        ),
+        migrations.AddField(
+            model_name='assembledaircraft',
+            name='priority',
+            field=models.PositiveSmallIntegerField(default=1, help_text='Weight of a late delivery of this aircraft when scheduling'),
+        ),
+        migrations.CreateModel(
+            name='ProductionSchedule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('objective', models.CharField(choices=[('MAKESPAN', 'Makespan'), ('TARDINESS', 'Weighted tardiness')], default='TARDINESS', max_length=20)),
+                ('planned_steps', models.PositiveIntegerField(default=0)),
+                ('makespan_end', models.DateTimeField(blank=True, null=True)),
+                ('weighted_tardiness_hours', models.FloatField(default=0)),
+                ('planned_at', models.DateTimeField(blank=True, help_text='Last full re-plan, aircraft are re-planned one by one in between', null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Production Schedule',
+                'verbose_name_plural': 'Production Schedules',
+            },
+        ),
+        migrations.CreateModel(
+            name='ScheduledStep',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slot', models.PositiveSmallIntegerField(help_text='Worker of the team the step is planned on, starting at 0')),
+                ('planned_start', models.DateTimeField()),
+                ('planned_end', models.DateTimeField()),
+                ('aircraft', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scheduled_steps', to='assembly.assembledaircraft')),
+                ('step', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='schedule', to='assembly.workflowstep')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scheduled_steps', to='teams.team')),
+            ],
+            options={
+                'verbose_name': 'Scheduled Step',
+                'verbose_name_plural': 'Scheduled Steps',
+                'ordering': ['planned_start', 'id'],
+                'indexes': [models.Index(fields=['team', 'planned_start'], name='assembly_sched_team_start_idx')],
+            },
+        ),
+    ]
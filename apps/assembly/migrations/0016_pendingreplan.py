@@ -0,0 +1,26 @@
+# Generated by Django 4.2 on 2026-10-18 18:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assembly', '0015_production_schedule'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingReplan',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('queued_at', models.DateTimeField(auto_now_add=True)),
+                ('aircraft', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='assembly.assembledaircraft')),
+            ],
+            options={
+                'verbose_name': 'Pending Re-plan',
+                'verbose_name_plural': 'Pending Re-plans',
+            },
+        ),
+    ]
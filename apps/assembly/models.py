@@ -1,10 +1,21 @@
-from django.db import models
+from datetime import timedelta
+from django.db import models, transaction
+from django.db.models import BooleanField, Case, Count, F, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
+from django.db.models.lookups import GreaterThan, LessThan
 from django.utils.translation import gettext_lazy as _
 from django.core.exceptions import ValidationError
 from apps.parts.models import Aircraft, Part
 from apps.teams.models import Team
 from apps.accounts.models import User
 from django.utils import timezone
+from .cache import aircraft_tag, invalidate_on_commit
+from .events import publish_on_commit, step_transition_event
+from .scheduling import queue_replan
+
+class StepTransitionConflict(Exception):
+    """Raised when a workflow step was changed by someone else during a transition"""
+
 
 class AssembledAircraft(models.Model):
     """Model for assembled aircraft"""
@@ -38,6 +49,21 @@ class AssembledAircraft(models.Model):
         choices=Status.choices,
         default=Status.PENDING
     )
+    # Workflow progress counters, maintained on every step transition
+    total_steps = models.PositiveSmallIntegerField(default=0)
+    completed_steps = models.PositiveSmallIntegerField(default=0)
+    failed_steps = models.PositiveSmallIntegerField(default=0)
+    in_progress_steps = models.PositiveSmallIntegerField(default=0)
+    current_step_type = models.CharField(max_length=50, blank=True)
+    due_date = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text=_('Promised delivery, the scheduler minimises weighted tardiness against it')
+    )
+    priority = models.PositiveSmallIntegerField(
+        default=1,
+        help_text=_('Weight of a late delivery of this aircraft when scheduling')
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -53,28 +79,175 @@ class AssembledAircraft(models.Model):
             self.Status.FAILED: 'danger',
         }.get(self.status, 'secondary')
 
+    @property
+    def completion_percentage(self):
+        if not self.total_steps:
+            return 0
+        return round(self.completed_steps / self.total_steps * 100)
+
+    def get_current_step_type_display(self):
+        return WorkflowStep.StepType(self.current_step_type).label if self.current_step_type else ''
+
+    @classmethod
+    def status_expression(cls, total, completed, failed, in_progress):
+        """Aircraft status derived from progress counter expressions"""
+        return Case(
+            When(LessThan(total, 1), then=F('status')),
+            When(GreaterThan(failed, 0), then=Value(cls.Status.FAILED)),
+            When(GreaterThan(in_progress, 0), then=Value(cls.Status.IN_PROGRESS)),
+            When(LessThan(completed, total), then=Value(cls.Status.IN_PROGRESS)),
+            default=Value(cls.Status.COMPLETED)
+        )
+
+    @classmethod
+    def current_step_expression(cls):
+        """First step in sequence that is not completed yet"""
+        return Coalesce(
+            Subquery(
+                WorkflowStep.objects.filter(
+                    assembled_aircraft=OuterRef('pk')
+                ).exclude(
+                    status=WorkflowStep.Status.COMPLETED
+                ).order_by('sequence').values('step_type')[:1]
+            ),
+            Value('')
+        )
+
+    @classmethod
+    def record_step_transition(cls, aircraft_id, from_status, to_status):
+        """Record a single step transition, see record_step_transitions"""
+        cls.record_step_transitions(aircraft_id, [(from_status, to_status)])
+
+    @classmethod
+    def record_step_transitions(cls, aircraft_id, transitions):
+        """
+        Move steps between progress counters for a list of (from_status,
+        to_status) transitions and derive the new status in a single UPDATE,
+        using F() expressions so concurrent transitions on the same aircraft
+        never lose an increment. Must run in the same transaction as the step
+        changes.
+        """
+        deltas = {counter: 0 for counter in STEP_STATUS_COUNTERS.values()}
+        for from_status, to_status in transitions:
+            if from_status in STEP_STATUS_COUNTERS:
+                deltas[STEP_STATUS_COUNTERS[from_status]] -= 1
+            if to_status in STEP_STATUS_COUNTERS:
+                deltas[STEP_STATUS_COUNTERS[to_status]] += 1
+        counters = {counter: F(counter) + delta for counter, delta in deltas.items()}
+
+        cls.objects.filter(pk=aircraft_id).update(
+            status=cls.status_expression(
+                F('total_steps'),
+                counters['completed_steps'],
+                counters['failed_steps'],
+                counters['in_progress_steps']
+            ),
+            current_step_type=cls.current_step_expression(),
+            updated_at=timezone.now(),
+            **{counter: expression for counter, expression in counters.items() if deltas[counter]}
+        )
+        # Queryset updates send no signals
+        invalidate_on_commit('aircraft', 'steps', aircraft_tag(aircraft_id))
+
     def update_status(self):
-        """Update aircraft status based on workflow steps"""
-        steps = self.workflow_steps.all()
-        if not steps.exists():
-            return
+        """Rebuild progress counters and status from workflow steps"""
+        counts = self.workflow_steps.aggregate(
+            total=Count('id'),
+            completed=Count('id', filter=Q(status=WorkflowStep.Status.COMPLETED)),
+            failed=Count('id', filter=Q(status=WorkflowStep.Status.FAILED)),
+            in_progress=Count('id', filter=Q(status=WorkflowStep.Status.IN_PROGRESS)),
+        )
+        current_step = self.workflow_steps.exclude(
+            status=WorkflowStep.Status.COMPLETED
+        ).order_by('sequence').values_list('step_type', flat=True).first()
+
+        self.total_steps = counts['total']
+        self.completed_steps = counts['completed']
+        self.failed_steps = counts['failed']
+        self.in_progress_steps = counts['in_progress']
+        self.current_step_type = current_step or ''
 
-        if steps.filter(status=WorkflowStep.Status.FAILED).exists():
-            self.status = self.Status.FAILED
-        elif steps.filter(status=WorkflowStep.Status.IN_PROGRESS).exists():
-            self.status = self.Status.IN_PROGRESS
-        elif steps.filter(status=WorkflowStep.Status.PENDING).exists():
-            self.status = self.Status.IN_PROGRESS
-        else:
-            # All steps are completed
-            self.status = self.Status.COMPLETED
-        
-        self.save()
+        if self.total_steps:
+            if self.failed_steps:
+                self.status = self.Status.FAILED
+            elif self.in_progress_steps or self.completed_steps < self.total_steps:
+                self.status = self.Status.IN_PROGRESS
+            else:
+                # All steps are completed
+                self.status = self.Status.COMPLETED
+
+        self.save(update_fields=[
+            'total_steps', 'completed_steps', 'failed_steps', 'in_progress_steps',
+            'current_step_type', 'status', 'updated_at'
+        ])
 
     class Meta:
         verbose_name = _('Assembled Aircraft')
         verbose_name_plural = _('Assembled Aircraft')
         ordering = ['-created_at']
+        # Keyset pagination orderings of the workflow list
+        indexes = [
+            models.Index(
+                fields=['created_at', 'id'],
+                name='assembly_aircraft_created_idx'
+            ),
+            models.Index(
+                fields=['status', '-created_at', '-id'],
+                name='assembly_aircraft_status_idx'
+            ),
+            models.Index(
+                fields=['assembly_team', 'created_at'],
+                name='assembly_aircraft_team_idx'
+            ),
+        ]
+
+class WorkflowStepQuerySet(models.QuerySet):
+    def with_previous_status(self):
+        """
+        Annotate every step with its predecessor's status (`previous_status`)
+        and whether it can be started (`is_startable`) in a single query.
+        """
+        previous = WorkflowStep.objects.filter(
+            assembled_aircraft=OuterRef('assembled_aircraft'),
+            sequence__lt=OuterRef('sequence')
+        ).order_by('-sequence').values('status')[:1]
+
+        return self.annotate(
+            previous_status=Subquery(previous)
+        ).annotate(
+            is_startable=Case(
+                When(
+                    Q(previous_status__isnull=True) |
+                    Q(previous_status=WorkflowStep.Status.COMPLETED),
+                    then=Value(True)
+                ),
+                default=Value(False),
+                output_field=BooleanField()
+            )
+        )
+
+    def with_note_summary(self):
+        """
+        Annotate every step with its number of notes (`note_count`) and the
+        body and time of its latest note (`latest_note`, `latest_note_at`)
+        instead of loading the notes themselves.
+        """
+        notes = WorkflowStepNote.objects.filter(step=OuterRef('pk'))
+        latest = notes.order_by('-created_at', '-id')
+        return self.annotate(
+            note_count=Coalesce(
+                Subquery(
+                    notes.order_by().values('step').annotate(count=Count('id')).values('count'),
+                    output_field=models.IntegerField()
+                ),
+                0
+            ),
+            latest_note=Subquery(latest.values('body')[:1]),
+            latest_note_at=Subquery(latest.values('created_at')[:1])
+        )
+
+# Statuses of steps still waiting for work (WorkflowStep.Status values)
+ACTIVE_STEP_STATUSES = ('PENDING', 'IN_PROGRESS')
 
 class WorkflowStep(models.Model):
     class StepType(models.TextChoices):
@@ -94,6 +267,16 @@ class WorkflowStep(models.Model):
         FAILED = 'FAILED', _('Failed')
         BLOCKED = 'BLOCKED', _('Blocked')
 
+    # Bootstrap color classes of the status badges, also used by the live
+    # updates of the workflow pages
+    STATUS_BADGE_COLORS = {
+        Status.PENDING: 'warning text-dark',
+        Status.IN_PROGRESS: 'primary',
+        Status.COMPLETED: 'success',
+        Status.FAILED: 'danger',
+        Status.BLOCKED: 'secondary',
+    }
+
     assembled_aircraft = models.ForeignKey(
         AssembledAircraft,
         on_delete=models.CASCADE,
@@ -103,6 +286,10 @@ class WorkflowStep(models.Model):
         max_length=50,
         choices=StepType.choices
     )
+    sequence = models.PositiveSmallIntegerField(
+        default=0,
+        help_text=_('Position of the step in its workflow, starting at 1')
+    )
     status = models.CharField(
         max_length=20,
         choices=Status.choices,
@@ -120,38 +307,36 @@ class WorkflowStep(models.Model):
         blank=True,
         related_name='assigned_steps'
     )
-    notes = models.TextField(blank=True)
+    version = models.PositiveIntegerField(
+        default=0,
+        help_text=_('Incremented on every status transition for optimistic locking')
+    )
     started_at = models.DateTimeField(null=True, blank=True)
     completed_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = WorkflowStepQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.get_step_type_display()} - {self.get_status_display()}"
 
     def get_status_badge_color(self):
         """Get the Bootstrap color class for the status badge"""
-        return {
-            self.Status.PENDING: 'warning text-dark',
-            self.Status.IN_PROGRESS: 'primary',
-            self.Status.COMPLETED: 'success',
-            self.Status.FAILED: 'danger',
-            self.Status.BLOCKED: 'secondary',
-        }.get(self.status, 'secondary')
+        return self.STATUS_BADGE_COLORS.get(self.status, 'secondary')
 
     def get_previous_step(self):
         """Get the previous step in the workflow sequence"""
-        step_order = list(self.StepType.values)
-        current_index = step_order.index(self.step_type)
-        if current_index > 0:
-            previous_type = step_order[current_index - 1]
-            return self.assembled_aircraft.workflow_steps.filter(
-                step_type=previous_type
-            ).first()
-        return None
+        return WorkflowStep.objects.filter(
+            assembled_aircraft_id=self.assembled_aircraft_id,
+            sequence__lt=self.sequence
+        ).order_by('-sequence').first()
 
     def can_start(self):
         """Check if this step can be started"""
+        if hasattr(self, 'is_startable'):
+            # Annotated by WorkflowStepQuerySet.with_previous_status()
+            return self.is_startable
         previous_step = self.get_previous_step()
         if previous_step:
             return previous_step.status == self.Status.COMPLETED
@@ -175,24 +360,548 @@ class WorkflowStep(models.Model):
                 "Only in-progress steps can be completed"
             )
 
-    def start(self, user):
+    def _transition(self, from_status, expected_version=None, actor=None, **changes):
+        """
+        Apply a status transition with a conditional UPDATE that only matches
+        while the row is still in `from_status` (and at `expected_version`
+        when given), writing only the changed columns, and log it as a
+        WorkflowEvent by `actor` in the same transaction. Raises
+        StepTransitionConflict if another request got there first.
+        """
+        changes['updated_at'] = timezone.now()
+        rows = WorkflowStep.objects.filter(pk=self.pk, status=from_status)
+        if expected_version not in (None, ''):
+            try:
+                rows = rows.filter(version=int(expected_version))
+            except (TypeError, ValueError):
+                raise ValidationError("Version must be an integer")
+
+        with transaction.atomic():
+            if not rows.update(version=F('version') + 1, **changes):
+                raise StepTransitionConflict(
+                    "This step was changed by someone else, please reload and try again"
+                )
+            AssembledAircraft.record_step_transition(
+                self.assembled_aircraft_id, from_status, changes['status']
+            )
+            WorkflowEvent.for_transition(
+                self, from_status, changes['status'], actor, changes['updated_at']
+            ).save()
+            publish_on_commit([step_transition_event(
+                self, from_status, changes['status'], actor
+            )])
+            if changes['status'] in (self.Status.COMPLETED, self.Status.FAILED):
+                queue_replan([self.assembled_aircraft_id])
+
+        for field, value in changes.items():
+            setattr(self, field, value)
+        self.version += 1
+
+    def check_version(self, expected_version):
+        """
+        Raise StepTransitionConflict when the client's `expected_version` is
+        not the loaded version, before the transition is validated against
+        a state the client has not seen: a client that lost the race gets a
+        conflict, not a validation error.
+        """
+        if expected_version in (None, ''):
+            return
+        try:
+            expected_version = int(expected_version)
+        except (TypeError, ValueError):
+            raise ValidationError("Version must be an integer")
+        if expected_version != self.version:
+            raise StepTransitionConflict(
+                "This step was changed by someone else, please reload and try again"
+            )
+
+    def start(self, user, expected_version=None):
         """Start the workflow step"""
+        self.check_version(expected_version)
         self.validate_start()
-        self.status = self.Status.IN_PROGRESS
-        self.assigned_user = user
-        self.started_at = timezone.now()
-        self.save()
-        self.assembled_aircraft.update_status()
+        self._transition(
+            self.Status.PENDING,
+            expected_version,
+            actor=user,
+            status=self.Status.IN_PROGRESS,
+            assigned_user=user,
+            started_at=timezone.now()
+        )
 
-    def complete(self, success=True):
+    def complete(self, success=True, expected_version=None, user=None):
         """Complete the workflow step"""
+        self.check_version(expected_version)
         self.validate_complete()
-        self.status = self.Status.COMPLETED if success else self.Status.FAILED
-        self.completed_at = timezone.now()
-        self.save()
-        self.assembled_aircraft.update_status()
+        self._transition(
+            self.Status.IN_PROGRESS,
+            expected_version,
+            actor=user,
+            status=self.Status.COMPLETED if success else self.Status.FAILED,
+            completed_at=timezone.now()
+        )
+
+    def add_note(self, note, author=None):
+        """Append a note to the step and log it as a WorkflowEvent"""
+        with transaction.atomic():
+            note = WorkflowStepNote.objects.create(step=self, author=author, body=note)
+            WorkflowEvent.for_step(
+                self, WorkflowEvent.EventType.NOTE, author, note.created_at
+            ).save()
+        return note
 
     class Meta:
         verbose_name = _('Workflow Step')
         verbose_name_plural = _('Workflow Steps')
         ordering = ['created_at']
+        indexes = [
+            models.Index(
+                fields=['assembled_aircraft', 'sequence'],
+                name='assembly_step_aircraft_seq_idx'
+            ),
+            models.Index(
+                fields=['step_type', 'created_at', 'id'],
+                name='assembly_step_type_created_idx'
+            ),
+            models.Index(
+                fields=['created_at', 'id'],
+                name='assembly_step_created_idx'
+            ),
+            models.Index(
+                fields=['step_type', 'status', 'created_at'],
+                name='assembly_step_type_status_idx'
+            ),
+            models.Index(
+                fields=['assigned_team', 'status'],
+                name='assembly_step_team_status_idx'
+            ),
+            models.Index(
+                fields=['assembled_aircraft', 'step_type'],
+                name='assembly_step_craft_type_idx'
+            ),
+            # Active steps are a small, hot fraction of the table
+            models.Index(
+                fields=['assigned_team', 'created_at'],
+                condition=Q(status__in=ACTIVE_STEP_STATUSES),
+                name='assembly_step_active_team_idx'
+            ),
+            models.Index(
+                fields=['step_type', 'created_at'],
+                condition=Q(status__in=ACTIVE_STEP_STATUSES),
+                name='assembly_step_active_type_idx'
+            ),
+        ]
+
+# Progress counter on AssembledAircraft for each step status
+STEP_STATUS_COUNTERS = {
+    WorkflowStep.Status.COMPLETED: 'completed_steps',
+    WorkflowStep.Status.FAILED: 'failed_steps',
+    WorkflowStep.Status.IN_PROGRESS: 'in_progress_steps',
+}
+
+class WorkflowStepNote(models.Model):
+    """A note left on a workflow step; notes are only ever appended"""
+    step = models.ForeignKey(
+        WorkflowStep,
+        on_delete=models.CASCADE,
+        related_name='step_notes'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='workflow_step_notes'
+    )
+    body = models.TextField()
+    created_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.step} - {self.created_at:%Y-%m-%d %H:%M:%S}"
+
+    class Meta:
+        verbose_name = _('Workflow Step Note')
+        verbose_name_plural = _('Workflow Step Notes')
+        ordering = ['created_at', 'id']
+        indexes = [
+            models.Index(
+                fields=['step', 'created_at', 'id'],
+                name='assembly_note_step_idx'
+            ),
+        ]
+
+class WorkflowEvent(models.Model):
+    """
+    Append-only log of workflow step lifecycle events.
+
+    Every event is written in the transaction of the change it records and
+    never updated. Events carry the aircraft, team and type of their step,
+    so the time in step reports (see analytics.py) read this table alone
+    instead of the workflow step tables. The step, aircraft and team
+    references have no database constraints: the log outlives the rows it
+    describes.
+    """
+    class EventType(models.TextChoices):
+        CREATED = 'CREATED', _('Created')
+        START = 'START', _('Started')
+        COMPLETE = 'COMPLETE', _('Completed')
+        FAIL = 'FAIL', _('Failed')
+        NOTE = 'NOTE', _('Note')
+
+    step = models.ForeignKey(
+        WorkflowStep,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='events'
+    )
+    aircraft = models.ForeignKey(
+        AssembledAircraft,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name='+'
+    )
+    team = models.ForeignKey(
+        Team,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name='+'
+    )
+    step_type = models.CharField(max_length=50, choices=WorkflowStep.StepType.choices)
+    event_type = models.CharField(max_length=10, choices=EventType.choices)
+    from_status = models.CharField(max_length=20, blank=True)
+    to_status = models.CharField(max_length=20, blank=True)
+    actor = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='workflow_events'
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.get_step_type_display()} - {self.get_event_type_display()}"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Workflow events are append-only")
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def for_step(cls, step, event_type, actor=None, created_at=None, from_status='', to_status=''):
+        """An unsaved event of `step`, to be saved or bulk created"""
+        return cls(
+            step_id=step.id,
+            aircraft_id=step.assembled_aircraft_id,
+            team_id=step.assigned_team_id,
+            step_type=step.step_type,
+            event_type=event_type,
+            from_status=from_status,
+            to_status=to_status,
+            actor=actor,
+            created_at=created_at or timezone.now()
+        )
+
+    @classmethod
+    def for_transition(cls, step, from_status, to_status, actor=None, created_at=None):
+        """An unsaved event of a status transition of `step`"""
+        return cls.for_step(
+            step, TRANSITION_EVENTS[to_status], actor, created_at, from_status, to_status
+        )
+
+    class Meta:
+        verbose_name = _('Workflow Event')
+        verbose_name_plural = _('Workflow Events')
+        ordering = ['created_at', 'id']
+        indexes = [
+            models.Index(
+                fields=['created_at', 'id'],
+                name='assembly_event_created_idx'
+            ),
+            # Window functions partition the events per aircraft
+            models.Index(
+                fields=['aircraft', 'created_at', 'id'],
+                name='assembly_event_aircraft_idx'
+            ),
+            models.Index(
+                fields=['step_type', 'created_at'],
+                name='assembly_event_type_idx'
+            ),
+        ]
+
+# Event logged for each status a step can transition to
+TRANSITION_EVENTS = {
+    WorkflowStep.Status.IN_PROGRESS: WorkflowEvent.EventType.START,
+    WorkflowStep.Status.COMPLETED: WorkflowEvent.EventType.COMPLETE,
+    WorkflowStep.Status.FAILED: WorkflowEvent.EventType.FAIL,
+}
+
+class WorkflowTemplate(models.Model):
+    """Ordered workflow steps used when creating an aircraft of a given type"""
+    name = models.CharField(max_length=100)
+    aircraft_type = models.CharField(
+        max_length=20,
+        choices=Aircraft.AIRCRAFT_TYPES,
+        blank=True,
+        unique=True,
+        verbose_name=_('Aircraft Type'),
+        help_text=_('Leave empty for the default template used by all other aircraft types')
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        if self.aircraft_type:
+            return f"{self.name} ({self.get_aircraft_type_display()})"
+        return f"{self.name} (Default)"
+
+    class Meta:
+        verbose_name = _('Workflow Template')
+        verbose_name_plural = _('Workflow Templates')
+        ordering = ['aircraft_type']
+
+class WorkflowTemplateStep(models.Model):
+    template = models.ForeignKey(
+        WorkflowTemplate,
+        on_delete=models.CASCADE,
+        related_name='steps'
+    )
+    step_type = models.CharField(
+        max_length=50,
+        choices=WorkflowStep.StepType.choices
+    )
+    team_type = models.CharField(
+        max_length=20,
+        choices=Team.TEAM_TYPES
+    )
+    order = models.PositiveSmallIntegerField()
+
+    def __str__(self):
+        return f"{self.order}. {self.get_step_type_display()}"
+
+    class Meta:
+        verbose_name = _('Workflow Template Step')
+        verbose_name_plural = _('Workflow Template Steps')
+        ordering = ['template', 'order']
+        unique_together = [
+            ('template', 'order'),
+            ('template', 'step_type'),
+        ]
+
+class DailyStepRollup(models.Model):
+    """Workflow step counts and durations per creation day, kept up to date by refresh_rollups"""
+    day = models.DateField()
+    team = models.ForeignKey(
+        Team,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    aircraft_type = models.CharField(
+        max_length=20,
+        choices=Aircraft.AIRCRAFT_TYPES
+    )
+    step_type = models.CharField(
+        max_length=50,
+        choices=WorkflowStep.StepType.choices
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=WorkflowStep.Status.choices
+    )
+    count = models.PositiveIntegerField(default=0)
+    total_duration = models.DurationField(
+        default=timedelta,
+        help_text=_('Sum of the time between start and completion of the finished steps')
+    )
+
+    def __str__(self):
+        return f"{self.day} {self.get_step_type_display()} {self.get_status_display()}: {self.count}"
+
+    class Meta:
+        verbose_name = _('Daily Step Rollup')
+        verbose_name_plural = _('Daily Step Rollups')
+        ordering = ['day']
+        unique_together = [
+            ('day', 'team', 'aircraft_type', 'step_type', 'status'),
+        ]
+
+class DailyPartRollup(models.Model):
+    """Part counts per creation day, kept up to date by refresh_rollups"""
+    day = models.DateField(db_index=True)
+    team = models.ForeignKey(
+        Team,
+        on_delete=models.CASCADE,
+        null=True,
+        related_name='+'
+    )
+    aircraft_type = models.CharField(max_length=20, null=True)
+    status = models.CharField(max_length=20, null=True)
+    quality_check_status = models.CharField(max_length=20, null=True)
+    count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.day} {self.status}: {self.count}"
+
+    class Meta:
+        verbose_name = _('Daily Part Rollup')
+        verbose_name_plural = _('Daily Part Rollups')
+        ordering = ['day']
+
+class RollupWatermark(models.Model):
+    """Last time a rollup table was refreshed; source rows changed after it are pending"""
+    name = models.CharField(max_length=50, unique=True)
+    value = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
+
+class PartInventory(models.Model):
+    """
+    Ledger of part counts per aircraft type, part type and state, updated
+    together with the parts themselves (see inventory.py) so availability
+    is a single indexed read.
+    """
+    aircraft_type = models.CharField(max_length=20, blank=True)
+    part_type = models.CharField(max_length=50)
+    status = models.CharField(max_length=20, blank=True)
+    quality_check_status = models.CharField(max_length=20, blank=True)
+    is_used = models.BooleanField(default=False)
+    count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.aircraft_type} {self.part_type} ({self.status}): {self.count}"
+
+    class Meta:
+        verbose_name = _('Part Inventory')
+        verbose_name_plural = _('Part Inventory')
+        unique_together = [
+            ('aircraft_type', 'part_type', 'status', 'quality_check_status', 'is_used'),
+        ]
+
+class PartReservation(models.Model):
+    """
+    Claim of an available part for an aircraft until `expires_at`. A part
+    has at most one reservation; expired ones are replaced by the next
+    allocation (see allocation.py).
+    """
+    part = models.OneToOneField(
+        Part,
+        on_delete=models.CASCADE,
+        related_name='reservation'
+    )
+    aircraft = models.ForeignKey(
+        AssembledAircraft,
+        on_delete=models.CASCADE,
+        related_name='part_reservations'
+    )
+    reserved_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    expires_at = models.DateTimeField(db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.part} -> {self.aircraft}"
+
+    @property
+    def is_active(self):
+        return self.expires_at > timezone.now()
+
+    class Meta:
+        verbose_name = _('Part Reservation')
+        verbose_name_plural = _('Part Reservations')
+
+
+class ProductionSchedule(models.Model):
+    """
+    Header of the current start time plan of the open workflow steps (see
+    scheduling.py). There is a single row; its lock serializes planning.
+    """
+    class Objective(models.TextChoices):
+        MAKESPAN = 'MAKESPAN', _('Makespan')
+        TARDINESS = 'TARDINESS', _('Weighted tardiness')
+
+    objective = models.CharField(
+        max_length=20,
+        choices=Objective.choices,
+        default=Objective.TARDINESS
+    )
+    planned_steps = models.PositiveIntegerField(default=0)
+    makespan_end = models.DateTimeField(null=True, blank=True)
+    weighted_tardiness_hours = models.FloatField(default=0)
+    planned_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text=_('Last full re-plan, aircraft are re-planned one by one in between')
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.get_objective_display()} schedule of {self.planned_steps} steps"
+
+    class Meta:
+        verbose_name = _('Production Schedule')
+        verbose_name_plural = _('Production Schedules')
+
+class ScheduledStep(models.Model):
+    """Planned start and end of an open workflow step on a worker of its team"""
+    step = models.OneToOneField(
+        WorkflowStep,
+        on_delete=models.CASCADE,
+        related_name='schedule'
+    )
+    aircraft = models.ForeignKey(
+        AssembledAircraft,
+        on_delete=models.CASCADE,
+        related_name='scheduled_steps'
+    )
+    team = models.ForeignKey(
+        Team,
+        on_delete=models.CASCADE,
+        related_name='scheduled_steps'
+    )
+    slot = models.PositiveSmallIntegerField(
+        help_text=_('Worker of the team the step is planned on, starting at 0')
+    )
+    planned_start = models.DateTimeField()
+    planned_end = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.step} @ {self.planned_start:%Y-%m-%d %H:%M}"
+
+    class Meta:
+        verbose_name = _('Scheduled Step')
+        verbose_name_plural = _('Scheduled Steps')
+        ordering = ['planned_start', 'id']
+        indexes = [
+            models.Index(
+                fields=['team', 'planned_start'],
+                name='assembly_sched_team_start_idx'
+            ),
+        ]
+
+class PendingReplan(models.Model):
+    """
+    Aircraft whose steps changed since the schedule last placed them.
+    Written in the transaction of the change, drained off the request path
+    by `plan_schedule --pending` (see scheduling.py).
+    """
+    aircraft = models.ForeignKey(
+        AssembledAircraft,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    queued_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Re-plan {self.aircraft_id} queued {self.queued_at:%Y-%m-%d %H:%M}"
+
+    class Meta:
+        verbose_name = _('Pending Re-plan')
+        verbose_name_plural = _('Pending Re-plans')
@@ -0,0 +1,142 @@
+from django.db import transaction
+from django.core.exceptions import ValidationError
+from apps.parts.models import Part
+from apps.teams.registry import reference_data
+from . import inventory
+from .cache import invalidate_on_commit
+from .models import AssembledAircraft, WorkflowEvent, WorkflowStep
+from .scheduling import queue_replan
+from .workflow import workflow_plans
+
+# Upper bound for a single production order. It also keeps every bulk insert
+# below PostgreSQL's bind parameter limit so each table gets exactly one INSERT.
+MAX_ORDER_QUANTITY = 200
+# Largest scheduling weight (AssembledAircraft.priority) of an aircraft
+MAX_PRIORITY = 10
+
+# Parts produced by each team for every aircraft
+REQUIRED_PARTS = {
+    'wing': [
+        ('wing_main', 'Ana Kanat'),
+        ('wing_aileron', 'Kanatçık'),
+        ('wing_flap', 'Flap'),
+        ('wing_slat', 'Slat'),
+    ],
+    'fuselage': [
+        ('fuselage_main', 'Ana Gövde'),
+        ('fuselage_nose', 'Burun Bölümü'),
+        ('fuselage_tail', 'Kuyruk Bölümü'),
+        ('fuselage_door', 'Kapı'),
+    ],
+    'tail': [
+        ('tail_vertical', 'Dikey Stabilizatör'),
+        ('tail_horizontal', 'Yatay Stabilizatör'),
+        ('tail_rudder', 'Dümen'),
+        ('tail_elevator', 'Elevator'),
+    ],
+    'avionics': [
+        ('avionics_flight_control', 'Uçuş Kontrol Sistemi'),
+        ('avionics_navigation', 'Navigasyon Sistemi'),
+        ('avionics_communication', 'İletişim Sistemi'),
+        ('avionics_radar', 'Radar Sistemi'),
+    ]
+}
+
+def get_aircraft_names(name, quantity):
+    """Build aircraft names for an order, numbering them when there is more than one"""
+    if quantity == 1:
+        return [name]
+    return [f"{name} #{number}" for number in range(1, quantity + 1)]
+
+
+def create_production_order(aircraft_type, name, quantity, assembly_team, created_by, description='',
+                            due_date=None, priority=1):
+    """
+    Create `quantity` assembled aircraft with their parts, part links and
+    workflow steps, and fit them into the production schedule.
+
+    Every table is written with a single bulk INSERT, so the number of
+    queries is the same for an order of 1 or MAX_ORDER_QUANTITY aircraft.
+    Returns the list of created AssembledAircraft instances.
+    """
+    if not name:
+        raise ValidationError("Aircraft name is required")
+    if quantity < 1 or quantity > MAX_ORDER_QUANTITY:
+        raise ValidationError(
+            f"Quantity must be between 1 and {MAX_ORDER_QUANTITY}"
+        )
+
+    with transaction.atomic():
+        teams = reference_data.teams_by_type()
+        # Workflow steps from the aircraft type's workflow template
+        steps = [
+            (sequence, step_type, teams[team_type])
+            for sequence, (step_type, team_type) in enumerate(
+                workflow_plans.plan_for(aircraft_type), start=1
+            )
+            if team_type in teams
+        ]
+
+        aircraft_names = get_aircraft_names(name, quantity)
+        aircrafts = AssembledAircraft.objects.bulk_create([
+            AssembledAircraft(
+                name=aircraft_name,
+                aircraft_type=aircraft_type,
+                description=description,
+                assembly_team=assembly_team,
+                due_date=due_date,
+                priority=priority,
+                status=AssembledAircraft.Status.PENDING,
+                total_steps=len(steps),
+                current_step_type=steps[0][1] if steps else ''
+            )
+            for aircraft_name in aircraft_names
+        ])
+
+        # Create required parts for each team
+        parts = []
+        part_owners = []
+        for aircraft, aircraft_name in zip(aircrafts, aircraft_names):
+            for team_type, required in REQUIRED_PARTS.items():
+                team = teams.get(team_type)
+                if not team:
+                    continue
+                for part_type, part_name in required:
+                    parts.append(Part(
+                        name=f"{part_name} - {aircraft_name}",
+                        part_type=part_type,
+                        description=f"{part_name} for {aircraft_name}",
+                        team=team,
+                        created_by=created_by,
+                        status='pending'
+                    ))
+                    part_owners.append(aircraft)
+        parts = Part.objects.bulk_create(parts)
+        # bulk_create sends no signals, so the ledger is updated here
+        inventory.record_created(parts)
+
+        PartLink = AssembledAircraft.parts.through
+        PartLink.objects.bulk_create([
+            PartLink(assembledaircraft_id=aircraft.id, part_id=part.id)
+            for aircraft, part in zip(part_owners, parts)
+        ])
+
+        # Create workflow steps
+        workflow_steps = WorkflowStep.objects.bulk_create([
+            WorkflowStep(
+                assembled_aircraft=aircraft,
+                step_type=step_type,
+                sequence=sequence,
+                assigned_team=team
+            )
+            for aircraft in aircrafts
+            for sequence, step_type, team in steps
+        ])
+        WorkflowEvent.objects.bulk_create([
+            WorkflowEvent.for_step(step, WorkflowEvent.EventType.CREATED, created_by, step.created_at)
+            for step in workflow_steps
+        ])
+        invalidate_on_commit('aircraft', 'steps')
+        queue_replan(aircraft.id for aircraft in aircrafts)
+
+    return aircrafts
@@ -0,0 +1,98 @@
+from django.core.cache import cache
+from django.db.models import Max
+from django.db.models.functions import Greatest
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from rest_framework.generics import get_object_or_404
+from .models import AssembledAircraft, WorkflowStep
+from .serializers import WorkflowStepSerializer
+
+PROGRESS_CACHE_TIMEOUT = 60 * 60
+
+
+def get_progress_version(aircraft_id):
+    """
+    Return (status, last_modified) of an aircraft in one query. last_modified
+    is the newest change to the aircraft, any of its steps or their notes,
+    which the payload summarizes.
+    """
+    aircraft = get_object_or_404(
+        AssembledAircraft.objects.filter(pk=aircraft_id).values('id', 'status').annotate(
+            last_modified=Greatest(
+                'updated_at',
+                Max('workflow_steps__updated_at'),
+                Max('workflow_steps__step_notes__created_at')
+            )
+        )
+    )
+    return aircraft['status'], aircraft['last_modified']
+
+
+def get_progress_etag(aircraft_id, last_modified):
+    return quote_etag(f"progress-{aircraft_id}-{last_modified.timestamp():.6f}")
+
+
+def is_not_modified(request, etag, last_modified):
+    """Evaluate If-None-Match / If-Modified-Since against the current version"""
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match:
+        etags = parse_etags(if_none_match)
+        return '*' in etags or etag in etags
+    if_modified_since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+    return if_modified_since is not None and int(last_modified.timestamp()) <= if_modified_since
+
+
+def build_progress(aircraft_id, aircraft_status):
+    """Compute the workflow progress payload from a single query over the steps"""
+    steps = list(
+        WorkflowStep.objects.filter(
+            assembled_aircraft_id=aircraft_id
+        ).with_note_summary().select_related('assigned_team', 'assigned_user').order_by('sequence')
+    )
+
+    counts = {status: 0 for status in WorkflowStep.Status.values}
+    active_steps = []
+    next_step = None
+    previous_status = None
+    for step in steps:
+        counts[step.status] += 1
+        # Predecessor status resolved in memory instead of one query per step
+        step.is_startable = previous_status in (None, WorkflowStep.Status.COMPLETED)
+        previous_status = step.status
+        if step.status in (WorkflowStep.Status.IN_PROGRESS, WorkflowStep.Status.PENDING):
+            active_steps.append(step)
+            if next_step is None and step.is_startable:
+                next_step = step
+
+    total_steps = len(steps)
+    completed_steps = counts[WorkflowStep.Status.COMPLETED]
+    return {
+        'total_steps': total_steps,
+        'completed_steps': completed_steps,
+        'in_progress_steps': counts[WorkflowStep.Status.IN_PROGRESS],
+        'failed_steps': counts[WorkflowStep.Status.FAILED],
+        'completion_percentage': (completed_steps / total_steps * 100) if total_steps > 0 else 0,
+        'current_steps': WorkflowStepSerializer(active_steps, many=True).data,
+        'next_step': WorkflowStepSerializer(next_step).data if next_step else None,
+        'status': aircraft_status
+    }
+
+
+def get_progress(aircraft_id, aircraft_status, last_modified):
+    """
+    Progress payload cached per aircraft version. A new note is part of the
+    version, so it gets a fresh entry like a step change does.
+    """
+    key = f"workflow_progress:{aircraft_id}:{last_modified.timestamp():.6f}"
+    progress = cache.get(key)
+    if progress is None:
+        progress = build_progress(aircraft_id, aircraft_status)
+        cache.set(key, progress, PROGRESS_CACHE_TIMEOUT)
+    return progress
+
+
+def set_progress_headers(response, etag, last_modified):
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified.timestamp())
+    # Clients may keep the payload but must revalidate on every poll
+    response['Cache-Control'] = 'private, no-cache'
+    return response
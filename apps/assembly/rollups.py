@@ -0,0 +1,210 @@
+from datetime import datetime, time, timedelta
+from django.db import transaction
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Sum, Value
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+from apps.parts.models import Part
+from .models import DailyPartRollup, DailyStepRollup, RollupWatermark, WorkflowStep
+
+# Rows updated shortly before the watermark are looked at again, so a
+# transaction that committed after a refresh with an older updated_at
+# is still picked up by the next one.
+WATERMARK_OVERLAP = timedelta(minutes=5)
+
+
+def day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def as_date(value):
+    return value.date() if isinstance(value, datetime) else value
+
+
+class DailyRollup:
+    """
+    Aggregates of a source model per creation day, stored in a rollup table.
+
+    `fields` maps the rollup table's group columns to lookups on the source
+    model and `measures` holds the aggregates stored for every group. Rows
+    are bucketed on created_at, the field the dashboards filter on.
+    """
+
+    def __init__(self, name, model, source, fields, measures):
+        self.name = name
+        self.model = model
+        self.source = source
+        self.fields = fields
+        self.measures = measures
+
+    def rebuild_days(self, days):
+        """Recompute the rollup rows of the given days from the source table"""
+        days = sorted(days)
+        if not days:
+            return
+        groups = self.source.objects.filter(
+            created_at__gte=day_start(days[0]),
+            created_at__lt=day_start(days[-1] + timedelta(days=1))
+        ).annotate(day=TruncDate('created_at')).filter(day__in=days).order_by().values(
+            'day', *self.fields.values()
+        ).annotate(**self.measures)
+
+        self.model.objects.filter(day__in=days).delete()
+        self.model.objects.bulk_create([
+            self.model(
+                day=group['day'],
+                **{
+                    self.model._meta.get_field(field).attname: group[source]
+                    for field, source in self.fields.items()
+                },
+                **{measure: group[measure] for measure in self.measures}
+            )
+            for group in groups
+        ], batch_size=1000)
+
+    def refresh(self, full=False):
+        """
+        Bring the rollup table up to date and return the recomputed days.
+
+        Only days holding source rows changed since the stored watermark are
+        recomputed. Deleted source rows leave no trace, so a `full` refresh
+        rebuilds every day after deletions.
+        """
+        with transaction.atomic():
+            watermark, _ = RollupWatermark.objects.select_for_update().get_or_create(name=self.name)
+            refreshed_at = timezone.now()
+
+            changed = self.source.objects.all()
+            if full or watermark.value is None:
+                self.model.objects.all().delete()
+            else:
+                changed = changed.filter(updated_at__gt=watermark.value - WATERMARK_OVERLAP)
+            days = set(
+                changed.annotate(day=TruncDate('created_at')).order_by().values_list(
+                    'day', flat=True
+                ).distinct()
+            )
+            self.rebuild_days(days)
+
+            watermark.value = refreshed_at
+            watermark.save(update_fields=['value', 'updated_at'])
+        return sorted(days)
+
+    def covered_until(self):
+        """
+        First day not covered by the rollup table: the day of the last
+        refresh, whose later rows the rollups have not seen yet. None
+        before the first refresh.
+        """
+        refreshed_at = RollupWatermark.objects.filter(name=self.name).values_list(
+            'value', flat=True
+        ).first()
+        return timezone.localdate(refreshed_at) if refreshed_at else None
+
+    def aggregate(self, group_by, date_from=None, date_to=None, **filters):
+        """
+        Measures summed per `group_by` fields over an inclusive day range.
+
+        Days before the last refresh are read from the rollup table; the
+        rows of later days, which the rollups do not cover yet, are
+        aggregated from the source table. `filters` use the rollup field
+        names. Returns a list of dicts.
+        """
+        queries = self.aggregate_queries(group_by, date_from, date_to, **filters)
+        return self.merge(group_by, [query() for query in queries])
+
+    def aggregate_queries(self, group_by, date_from=None, date_to=None, **filters):
+        """
+        The independent queries behind aggregate(), as callables returning
+        rows keyed by the rollup field names. They can run concurrently on
+        separate connections; combine their results with merge(). Reads the
+        refresh watermark, so it is a sync ORM call itself.
+        """
+        date_from, date_to = as_date(date_from), as_date(date_to)
+        boundary = self.covered_until()
+        queries = []
+
+        if boundary is not None and (date_from is None or date_from < boundary):
+            rollups = self.model.objects.filter(day__lt=boundary, **filters)
+            if date_from:
+                rollups = rollups.filter(day__gte=date_from)
+            if date_to:
+                rollups = rollups.filter(day__lte=date_to)
+            rollups = rollups.order_by().values(*group_by).annotate(
+                **{measure: Sum(measure) for measure in self.measures}
+            )
+            queries.append(lambda: list(rollups))
+
+        if date_to is None or boundary is None or date_to >= boundary:
+            rows = self.source.objects.filter(
+                **{self.fields[field]: value for field, value in filters.items()}
+            )
+            start = max(filter(None, (boundary, date_from)), default=None)
+            if start:
+                rows = rows.filter(created_at__gte=day_start(start))
+            if date_to:
+                rows = rows.filter(created_at__lt=day_start(date_to + timedelta(days=1)))
+            rows = rows.order_by().values(
+                *(self.fields[field] for field in group_by)
+            ).annotate(**self.measures)
+            queries.append(lambda: [
+                {
+                    **{field: row[self.fields[field]] for field in group_by},
+                    **{measure: row[measure] for measure in self.measures}
+                }
+                for row in rows
+            ])
+
+        return queries
+
+    def merge(self, group_by, results):
+        """Sum the rows of several aggregate_queries() results per group"""
+        totals = {}
+        for rows in results:
+            for row in rows:
+                key = tuple(row[field] for field in group_by)
+                total = totals.setdefault(key, {
+                    **{field: row[field] for field in group_by},
+                    **dict.fromkeys(self.measures)
+                })
+                for measure in self.measures:
+                    if row[measure] is not None:
+                        total[measure] = row[measure] if total[measure] is None else total[measure] + row[measure]
+        return list(totals.values())
+
+
+step_rollup = DailyRollup(
+    'workflow_steps',
+    DailyStepRollup,
+    WorkflowStep,
+    fields={
+        'team': 'assigned_team',
+        'aircraft_type': 'assembled_aircraft__aircraft_type',
+        'step_type': 'step_type',
+        'status': 'status',
+    },
+    measures={
+        'count': Count('id'),
+        'total_duration': Coalesce(
+            Sum(ExpressionWrapper(F('completed_at') - F('started_at'), output_field=DurationField())),
+            Value(timedelta()),
+            output_field=DurationField()
+        ),
+    }
+)
+
+part_rollup = DailyRollup(
+    'parts',
+    DailyPartRollup,
+    Part,
+    fields={
+        'team': 'team',
+        'aircraft_type': 'aircraft_type',
+        'status': 'status',
+        'quality_check_status': 'quality_check_status',
+    },
+    measures={
+        'count': Count('id'),
+    }
+)
+
+ROLLUPS = (step_rollup, part_rollup)
@@ -0,0 +1,422 @@
+import bisect
+import heapq
+import itertools
+import random
+import statistics
+import time
+from datetime import timedelta
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from .simulation import DEFAULT_STEP_HOURS, recent_step_durations, team_workers
+
+# ProductionSchedule.Objective values
+MAKESPAN = 'MAKESPAN'
+TARDINESS = 'TARDINESS'
+
+# Median step durations are recomputed at most this often, in seconds
+ESTIMATES_CACHE_TIMEOUT = 10 * 60
+# Local search stops after this many seconds or iterations
+SEARCH_TIME_BUDGET = 3.0
+MAX_SEARCH_ITERATIONS = 1000
+# Largest move of an aircraft towards the front of the sequence
+SEARCH_WINDOW = 10
+# Remaining time assumed for an in-progress step already past its estimate
+MIN_REMAINING_HOURS = 0.25
+
+
+class Operation:
+    __slots__ = ('step_id', 'team_id', 'duration', 'started')
+
+    def __init__(self, step_id, team_id, duration, started=None):
+        self.step_id = step_id
+        self.team_id = team_id
+        self.duration = duration
+        # Hours since the start of an in-progress step (negative), else None
+        self.started = started
+
+
+class Job:
+    """The open steps of one aircraft, in sequence, with its due date in hours from now"""
+    __slots__ = ('aircraft_id', 'due', 'weight', 'operations')
+
+    def __init__(self, aircraft_id, due, weight, operations):
+        self.aircraft_id = aircraft_id
+        self.due = due
+        self.weight = weight
+        self.operations = operations
+
+    @property
+    def remaining_work(self):
+        return sum(operation.duration for operation in self.operations)
+
+
+def step_estimates(step_types):
+    """Median historical duration of each step type in hours, cached"""
+    estimates = cache.get('scheduling:step_estimates')
+    if estimates is None:
+        estimates = {
+            step_type: statistics.median(samples)
+            for step_type, samples in recent_step_durations(step_types).items()
+            if samples
+        }
+        cache.set('scheduling:step_estimates', estimates, ESTIMATES_CACHE_TIMEOUT)
+    return estimates
+
+
+def load_jobs(now, aircraft_ids=None):
+    """
+    Jobs of the aircraft still in production (no failed step), or of
+    `aircraft_ids` only, from one query over their open steps.
+    """
+    from .models import ACTIVE_STEP_STATUSES, AssembledAircraft, WorkflowStep
+
+    steps = WorkflowStep.objects.filter(
+        status__in=ACTIVE_STEP_STATUSES,
+        assembled_aircraft__status__in=(
+            AssembledAircraft.Status.PENDING, AssembledAircraft.Status.IN_PROGRESS
+        ),
+        assembled_aircraft__failed_steps=0
+    )
+    if aircraft_ids is not None:
+        steps = steps.filter(assembled_aircraft_id__in=aircraft_ids)
+    rows = list(steps.order_by('assembled_aircraft_id', 'sequence').values_list(
+        'id', 'assembled_aircraft_id', 'assigned_team_id', 'step_type', 'status', 'started_at',
+        'assembled_aircraft__due_date', 'assembled_aircraft__priority'
+    ))
+
+    estimates = step_estimates(WorkflowStep.StepType.values)
+    jobs = []
+    for aircraft_id, aircraft_steps in itertools.groupby(rows, key=lambda row: row[1]):
+        operations = []
+        for step_id, _, team_id, step_type, status, started_at, due_date, priority in aircraft_steps:
+            duration = estimates.get(step_type, DEFAULT_STEP_HOURS)
+            started = None
+            if status == WorkflowStep.Status.IN_PROGRESS and started_at:
+                started = (started_at - now).total_seconds() / 3600
+                duration = max(duration, MIN_REMAINING_HOURS - started)
+            operations.append(Operation(step_id, team_id, duration, started))
+        due = (due_date - now).total_seconds() / 3600 if due_date else None
+        jobs.append(Job(aircraft_id, due, priority, operations))
+    return jobs
+
+
+def dispatch_order(jobs, objective):
+    """
+    Initial sequence of the jobs by dispatching rule: least slack per
+    unit of weight for tardiness (jobs without a due date last), most work
+    remaining first for makespan.
+    """
+    if objective == TARDINESS:
+        return sorted(jobs, key=lambda job: (
+            job.due is None or not job.weight,
+            (job.due - job.remaining_work) / job.weight if job.due is not None and job.weight
+            else -job.remaining_work
+        ))
+    return sorted(jobs, key=lambda job: -job.remaining_work)
+
+
+def decode(jobs, workers):
+    """
+    Non-delay schedule of `jobs`, whose list order is their priority: a
+    worker that frees up starts the ready operation of the highest
+    priority job, in-progress operations keep the worker they started on.
+
+    Returns (placements, completions) with placements[job][operation] =
+    (start, end, slot) and the completion of every job, in hours from now.
+    """
+    free_slots = {team_id: list(range(count - 1, -1, -1)) for team_id, count in workers.items()}
+    extra_slots = {team_id: count for team_id, count in workers.items()}
+    queues = {team_id: [] for team_id in workers}
+    events = []
+    sequence = itertools.count()
+    placements = [[None] * len(job.operations) for job in jobs]
+    completions = [0.0] * len(jobs)
+
+    def start(now, job_index, index, slot, started=None):
+        operation = jobs[job_index].operations[index]
+        begin = now if started is None else started
+        end = max(begin + operation.duration, now)
+        placements[job_index][index] = (begin, end, slot)
+        heapq.heappush(events, (end, next(sequence), job_index, index))
+
+    def ready(now, job_index, index):
+        team_id = jobs[job_index].operations[index].team_id
+        if free_slots[team_id]:
+            start(now, job_index, index, free_slots[team_id].pop())
+        else:
+            heapq.heappush(queues[team_id], (job_index, index))
+
+    # In-progress operations first, more of them than workers get extra slots
+    for job_index, job in enumerate(jobs):
+        operation = job.operations[0] if job.operations else None
+        if operation is not None and operation.started is not None:
+            team_id = operation.team_id
+            if free_slots[team_id]:
+                slot = free_slots[team_id].pop()
+            else:
+                slot = extra_slots[team_id]
+                extra_slots[team_id] += 1
+            start(0.0, job_index, 0, slot, operation.started)
+    for job_index, job in enumerate(jobs):
+        if job.operations and job.operations[0].started is None:
+            ready(0.0, job_index, 0)
+
+    while events:
+        now, _, job_index, index = heapq.heappop(events)
+        team_id = jobs[job_index].operations[index].team_id
+        slot = placements[job_index][index][2]
+        # Extra slots of in-progress operations close when they finish
+        if slot < workers[team_id]:
+            if queues[team_id]:
+                next_job, next_index = heapq.heappop(queues[team_id])
+                start(now, next_job, next_index, slot)
+            else:
+                free_slots[team_id].append(slot)
+        if index + 1 < len(jobs[job_index].operations):
+            ready(now, job_index, index + 1)
+        else:
+            completions[job_index] = now
+    return placements, completions
+
+
+def evaluate(jobs, completions, objective):
+    """Objective value to minimise, ties broken by the other measure"""
+    makespan = max(completions, default=0.0)
+    tardiness = sum(
+        job.weight * max(0.0, completion - job.due)
+        for job, completion in zip(jobs, completions)
+        if job.due is not None
+    )
+    if objective == TARDINESS:
+        return (tardiness, makespan)
+    return (makespan, sum(completions))
+
+
+def _critical(jobs, completions, objective):
+    """Index of the job contributing most to the objective"""
+    if objective == TARDINESS:
+        return max(
+            range(len(jobs)),
+            key=lambda index: jobs[index].weight * max(0.0, completions[index] - jobs[index].due)
+            if jobs[index].due is not None else -1
+        )
+    return max(range(len(jobs)), key=completions.__getitem__)
+
+
+def optimize(jobs, workers, objective, budget=SEARCH_TIME_BUDGET, seed=0):
+    """
+    Sequence the jobs by the better of both dispatching rules, then improve the sequence by
+    local search: move the critical job (or a random one) up to
+    SEARCH_WINDOW places earlier, keep the move when the decoded schedule
+    is no worse. Returns (jobs in final order, placements, value).
+    """
+    rng = random.Random(seed)
+    deadline = time.monotonic() + budget
+    other = MAKESPAN if objective == TARDINESS else TARDINESS
+    best_order = None
+    for order in (dispatch_order(jobs, objective), dispatch_order(jobs, other)):
+        placements, completions = decode(order, workers)
+        value = evaluate(order, completions, objective)
+        if best_order is None or value < best_value:
+            best_order, best_placements, best_completions, best_value = order, placements, completions, value
+    if len(best_order) < 2:
+        return best_order, best_placements, best_value
+
+    for _ in range(MAX_SEARCH_ITERATIONS):
+        if time.monotonic() >= deadline:
+            break
+        position = _critical(best_order, best_completions, objective) if rng.random() < 0.5 else 0
+        if position == 0:
+            position = rng.randrange(1, len(best_order))
+        candidate = list(best_order)
+        candidate.insert(rng.randrange(max(position - SEARCH_WINDOW, 0), position), candidate.pop(position))
+        placements, completions = decode(candidate, workers)
+        value = evaluate(candidate, completions, objective)
+        if value <= best_value:
+            best_order, best_placements, best_completions, best_value = candidate, placements, completions, value
+    return best_order, best_placements, best_value
+
+
+def _earliest_fit(intervals, ready, duration):
+    """Earliest start from `ready` of a gap of `duration` between sorted, disjoint intervals"""
+    start = ready
+    index = max(bisect.bisect_left(intervals, (ready,)) - 1, 0)
+    for interval_start, interval_end in itertools.islice(intervals, index, None):
+        if start + duration <= interval_start:
+            break
+        start = max(start, interval_end)
+    return start
+
+
+def insert_jobs(jobs, workers, calendars, objective):
+    """
+    Place `jobs` around the fixed intervals of `calendars` ({(team, slot):
+    sorted [(start, end)]}) without moving them: in dispatching order,
+    each operation on the worker where it can start first. Returns
+    (jobs in order, placements) like optimize().
+    """
+    order = dispatch_order(jobs, objective)
+    placements = []
+    for job in order:
+        ready = 0.0
+        job_placements = []
+        for operation in job.operations:
+            team_id = operation.team_id
+            if operation.started is not None:
+                begin = operation.started
+                end = max(begin + operation.duration, 0.0)
+            else:
+                begin, end = ready, None
+            best = None
+            for slot in range(workers[team_id]):
+                intervals = calendars.setdefault((team_id, slot), [])
+                if end is None:
+                    start = _earliest_fit(intervals, begin, operation.duration)
+                elif _earliest_fit(intervals, begin, end - begin) == begin:
+                    start = begin
+                else:
+                    continue
+                if best is None or start < best[0]:
+                    best = (start, slot)
+            if best is None:
+                # An in-progress step overlapping every planned worker
+                best = (begin, workers[team_id])
+            start, slot = best
+            finish = end if end is not None else start + operation.duration
+            bisect.insort(calendars.setdefault((team_id, slot), []), (start, finish))
+            job_placements.append((start, finish, slot))
+            ready = finish
+        placements.append(job_placements)
+    return order, placements
+
+
+def _scheduled_steps(order, placements, now):
+    from .models import ScheduledStep
+
+    return [
+        ScheduledStep(
+            step_id=operation.step_id,
+            aircraft_id=job.aircraft_id,
+            team_id=operation.team_id,
+            slot=slot,
+            planned_start=now + timedelta(hours=start),
+            planned_end=now + timedelta(hours=end)
+        )
+        for job, job_placements in zip(order, placements)
+        for operation, (start, end, slot) in zip(job.operations, job_placements)
+    ]
+
+
+def _refresh_totals(schedule):
+    """Recompute the plan's step count, makespan and weighted tardiness"""
+    from django.db.models import Max
+    from .models import ScheduledStep
+
+    ends = ScheduledStep.objects.order_by().values('aircraft').annotate(
+        end=Max('planned_end')
+    ).values_list('end', 'aircraft__due_date', 'aircraft__priority')
+    schedule.planned_steps = ScheduledStep.objects.count()
+    schedule.makespan_end = None
+    schedule.weighted_tardiness_hours = 0.0
+    for end, due_date, priority in ends:
+        schedule.makespan_end = max(end, schedule.makespan_end or end)
+        if due_date and end > due_date:
+            schedule.weighted_tardiness_hours += priority * (end - due_date).total_seconds() / 3600
+    schedule.save()
+
+
+def build_schedule(objective=None, budget=SEARCH_TIME_BUDGET):
+    """
+    Re-plan every open step: dispatching rule plus local search under the
+    schedule's lock, replacing the stored plan. Covers the aircraft queued
+    for re-planning so far. Returns the ProductionSchedule.
+    """
+    from .models import PendingReplan, ProductionSchedule, ScheduledStep
+
+    with transaction.atomic():
+        schedule = ProductionSchedule.objects.select_for_update().first()
+        if schedule is None:
+            schedule = ProductionSchedule.objects.create()
+            schedule = ProductionSchedule.objects.select_for_update().get(pk=schedule.pk)
+        schedule.objective = objective or schedule.objective
+        # Changes queued before the jobs are loaded are part of this plan
+        pending_ids = list(PendingReplan.objects.values_list('id', flat=True))
+        now = timezone.now()
+        jobs = load_jobs(now)
+        workers = team_workers({operation.team_id for job in jobs for operation in job.operations})
+        order, placements, _ = optimize(jobs, workers, schedule.objective, budget)
+
+        ScheduledStep.objects.all().delete()
+        ScheduledStep.objects.bulk_create(_scheduled_steps(order, placements, now))
+        PendingReplan.objects.filter(id__in=pending_ids).delete()
+        schedule.planned_at = now
+        _refresh_totals(schedule)
+    return schedule
+
+
+def replan_aircraft(schedule, aircraft_ids):
+    """
+    Re-plan the open steps of `aircraft_ids` only, fitting them around
+    the planned steps of every other aircraft, e.g. after one of their
+    steps finished. Must run in a transaction holding the schedule's lock.
+    """
+    from .models import ScheduledStep
+
+    now = timezone.now()
+    jobs = load_jobs(now, aircraft_ids)
+
+    calendars = {}
+    fixed = ScheduledStep.objects.exclude(aircraft_id__in=aircraft_ids).filter(
+        planned_end__gt=now
+    ).values_list('team_id', 'slot', 'planned_start', 'planned_end')
+    for team_id, slot, planned_start, planned_end in fixed:
+        calendars.setdefault((team_id, slot), []).append((
+            (planned_start - now).total_seconds() / 3600,
+            (planned_end - now).total_seconds() / 3600
+        ))
+    for intervals in calendars.values():
+        intervals.sort()
+    workers = team_workers({operation.team_id for job in jobs for operation in job.operations})
+    order, placements = insert_jobs(jobs, workers, calendars, schedule.objective)
+
+    ScheduledStep.objects.filter(aircraft_id__in=aircraft_ids).delete()
+    ScheduledStep.objects.bulk_create(_scheduled_steps(order, placements, now))
+    _refresh_totals(schedule)
+
+
+def replan_pending():
+    """
+    Re-plan the aircraft queued by queue_replan. Skips the run, leaving
+    the queue as it is, while a full re-plan holds the schedule's lock or
+    before the first full plan exists. Returns the number of aircraft
+    re-planned, or None when skipped.
+    """
+    from .models import PendingReplan, ProductionSchedule
+
+    with transaction.atomic():
+        schedule = ProductionSchedule.objects.select_for_update(skip_locked=True).first()
+        if schedule is None:
+            return None
+        # Entries committed after this read wait for the next run
+        pending = list(PendingReplan.objects.values_list('id', 'aircraft_id'))
+        aircraft_ids = sorted({aircraft_id for _, aircraft_id in pending})
+        if aircraft_ids:
+            replan_aircraft(schedule, aircraft_ids)
+            PendingReplan.objects.filter(id__in=[pending_id for pending_id, _ in pending]).delete()
+    return len(aircraft_ids)
+
+
+def queue_replan(aircraft_ids):
+    """
+    Queue `aircraft_ids` for re-planning by replan_pending. The entries
+    are written in the current transaction, so they commit or roll back
+    with the change and the request never waits for the schedule's lock.
+    """
+    from .models import PendingReplan
+
+    aircraft_ids = sorted(set(aircraft_ids))
+    if aircraft_ids:
+        PendingReplan.objects.bulk_create([
+            PendingReplan(aircraft_id=aircraft_id) for aircraft_id in aircraft_ids
+        ])
@@ -1,32 +1,94 @@
+from django.db.models import F
 from rest_framework import serializers
 from apps.parts.models import Aircraft, Part
 from apps.teams.models import Team
+from apps.teams.serializers import ReferenceDataRelatedField
 from apps.accounts.models import User
-from .models import AssembledAircraft, WorkflowStep
+from .models import (
+    AssembledAircraft,
+    ProductionSchedule,
+    ScheduledStep,
+    WorkflowStep,
+    WorkflowStepNote
+)
+from .production import MAX_ORDER_QUANTITY, MAX_PRIORITY
+from .transitions import MAX_BULK_TRANSITIONS
 
-class WorkflowStepSerializer(serializers.ModelSerializer):
+class SparseFieldsMixin:
+    """
+    Model serializer mixin honouring the `fields` and `expand` entries of
+    the serializer context, parsed from ?fields= and ?expand=. Fields in
+    Meta.expandable_fields are only output when expanded, and a `fields`
+    list keeps just the named ones. Only the representation is trimmed,
+    input validation is unchanged, and nested serializers are left as is.
+    """
+
+    @classmethod
+    def default_field_names(cls):
+        expandable = getattr(cls.Meta, 'expandable_fields', ())
+        return [name for name in cls.Meta.fields if name not in expandable]
+
+    @classmethod
+    def expandable_field_names(cls):
+        return list(getattr(cls.Meta, 'expandable_fields', ()))
+
+    def _is_top_level(self):
+        root = self.root
+        return root is self or (isinstance(root, serializers.ListSerializer) and self.parent is root)
+
+    @property
+    def _readable_fields(self):
+        if self._is_top_level():
+            requested = self.context.get('fields')
+            keep = set(self.default_field_names() if requested is None else requested)
+            keep.update(self.context.get('expand') or ())
+        else:
+            keep = set(self.default_field_names())
+        for field in super()._readable_fields:
+            if field.field_name in keep:
+                yield field
+
+class WorkflowStepNoteSerializer(serializers.ModelSerializer):
+    author_name = serializers.CharField(source='author.get_full_name', read_only=True, default=None)
+
+    class Meta:
+        model = WorkflowStepNote
+        fields = ['id', 'step', 'author', 'author_name', 'body', 'created_at']
+        read_only_fields = ['step', 'author', 'created_at']
+
+class WorkflowStepSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     step_type_display = serializers.CharField(source='get_step_type_display', read_only=True)
     status_display = serializers.CharField(source='get_status_display', read_only=True)
     assigned_user_name = serializers.CharField(source='assigned_user.get_full_name', read_only=True)
     assigned_team_name = serializers.CharField(source='assigned_team.name', read_only=True)
+    can_start = serializers.BooleanField(read_only=True)
+    # Annotated by WorkflowStepQuerySet.with_note_summary()
+    note_count = serializers.IntegerField(read_only=True, default=0)
+    latest_note = serializers.CharField(read_only=True, allow_null=True, default=None)
+    latest_note_at = serializers.DateTimeField(read_only=True, allow_null=True, default=None)
+    notes = WorkflowStepNoteSerializer(source='step_notes', many=True, read_only=True)
 
     class Meta:
         model = WorkflowStep
         fields = [
             'id', 'assembled_aircraft', 'step_type', 'step_type_display',
-            'status', 'status_display', 'assigned_team', 'assigned_team_name',
-            'assigned_user', 'assigned_user_name', 'notes', 'started_at',
+            'sequence', 'can_start', 'status', 'version', 'status_display', 'assigned_team', 'assigned_team_name',
+            'assigned_user', 'assigned_user_name', 'note_count', 'latest_note',
+            'latest_note_at', 'notes', 'started_at',
             'completed_at', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['created_at', 'updated_at']
+        read_only_fields = ['sequence', 'version', 'created_at', 'updated_at']
+        expandable_fields = ['notes']
 
-class AssembledAircraftSerializer(serializers.ModelSerializer):
+class AssembledAircraftSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     workflow_steps = WorkflowStepSerializer(many=True, read_only=True)
-    aircraft_type = serializers.PrimaryKeyRelatedField(
+    aircraft_type = ReferenceDataRelatedField(
+        lookup='aircraft_type_by_id',
         queryset=Aircraft.objects.all(),
         required=True
     )
-    assembly_team = serializers.PrimaryKeyRelatedField(
+    assembly_team = ReferenceDataRelatedField(
+        lookup='team_by_id',
         queryset=Team.objects.all(),
         required=True
     )
@@ -40,6 +102,221 @@ class AssembledAircraftSerializer(serializers.ModelSerializer):
         model = AssembledAircraft
         fields = [
             'id', 'aircraft_type', 'assembly_team', 'parts',
-            'status', 'workflow_steps', 'created_at', 'updated_at'
+            'status', 'total_steps', 'completed_steps', 'failed_steps',
+            'in_progress_steps', 'current_step_type', 'workflow_steps',
+            'due_date', 'priority', 'created_at', 'updated_at'
+        ]
+        read_only_fields = [
+            'created_at', 'updated_at', 'status', 'total_steps', 'completed_steps',
+            'failed_steps', 'in_progress_steps', 'current_step_type'
         ]
-        read_only_fields = ['created_at', 'updated_at', 'status']
+        extra_kwargs = {'priority': {'min_value': 1, 'max_value': MAX_PRIORITY}}
+
+class ProjectionListSerializer(serializers.BaseSerializer):
+    """
+    Read-only serializer for list responses that works on values() rows
+    instead of model instances, so no models are built and no per-field
+    DRF machinery runs. Subclasses list the model fields and annotations
+    to select in `fields`, joined or renamed columns as expressions in
+    `expressions`, choice fields whose label is added as `<field>_display`
+    in `choice_displays`, and keys computed by a `get_<key>(row)` method
+    from other selected keys in `derived`.
+
+    The `fields` and `expand` context entries (?fields= and ?expand=)
+    limit what project() selects and what expand() loads, not just what
+    is output.
+    """
+    fields = ()
+    expressions = {}
+    choice_displays = {}
+    derived = {}
+    # Relations ?expand= loads for a whole page, with expand_<name>(rows)
+    expansions = ()
+    # Always selected, pagination cursors are built from them
+    key_fields = ('id', 'created_at')
+
+    @classmethod
+    def default_field_names(cls):
+        sources = {source for names in cls.derived.values() for source in names}
+        return [
+            name for name in (*cls.fields, *cls.expressions)
+            if name in cls.fields or name not in sources
+        ] + [f'{field}_display' for field in cls.choice_displays] + list(cls.derived)
+
+    @classmethod
+    def expandable_field_names(cls):
+        return list(cls.expansions)
+
+    @classmethod
+    def columns(cls, names, expand=()):
+        """Selected keys needed to output `names` and expand `expand`"""
+        columns = set(cls.key_fields)
+        for name in names:
+            if name in cls.derived:
+                columns.update(cls.derived[name])
+            elif name.endswith('_display') and name[:-len('_display')] in cls.choice_displays:
+                columns.add(name[:-len('_display')])
+            else:
+                columns.add(name)
+        columns.update(name for name in expand if name in cls.fields)
+        return columns
+
+    @classmethod
+    def project(cls, queryset, names=None, expand=()):
+        """Turn a queryset into the values() rows needed for `names` (all by default)"""
+        columns = cls.columns(cls.default_field_names() if names is None else names, expand)
+        return queryset.prefetch_related(None).values(
+            *(field for field in cls.fields if field in columns),
+            **{key: value for key, value in cls.expressions.items() if key in columns}
+        )
+
+    @classmethod
+    def expand(cls, rows, expand):
+        """Load the expanded relations of a page of rows, one query per relation"""
+        rows = list(rows)
+        if rows:
+            for name in expand:
+                getattr(cls, f'expand_{name}')(rows)
+        return rows
+
+    def to_representation(self, row):
+        requested = self.context.get('fields')
+        keep = set(self.default_field_names() if requested is None else requested)
+        keep.update(self.context.get('expand') or ())
+        for field, choices in self.choice_displays.items():
+            if field in row:
+                row[f'{field}_display'] = choices.get(row[field], row[field])
+        for name, sources in self.derived.items():
+            if name in keep:
+                row[name] = getattr(self, f'get_{name}')(row)
+        return {key: value for key, value in row.items() if key in keep}
+
+class WorkflowStepListSerializer(ProjectionListSerializer):
+    """
+    List representation of WorkflowStepSerializer, for querysets annotated
+    with with_previous_status() and with_note_summary()
+    """
+    fields = (
+        'id', 'assembled_aircraft', 'step_type', 'sequence', 'status', 'version',
+        'assigned_team', 'assigned_user', 'note_count', 'latest_note', 'latest_note_at',
+        'started_at', 'completed_at', 'created_at', 'updated_at'
+    )
+    expressions = {
+        'can_start': F('is_startable'),
+        'assigned_team_name': F('assigned_team__name'),
+        'assigned_user_first_name': F('assigned_user__first_name'),
+        'assigned_user_last_name': F('assigned_user__last_name'),
+    }
+    choice_displays = {
+        'step_type': dict(WorkflowStep.StepType.choices),
+        'status': dict(WorkflowStep.Status.choices),
+    }
+    derived = {
+        'assigned_user_name': ('assigned_user', 'assigned_user_first_name', 'assigned_user_last_name'),
+    }
+    expansions = ('notes',)
+
+    def get_assigned_user_name(self, row):
+        # Same as User.get_full_name()
+        if row['assigned_user'] is None:
+            return None
+        return f"{row['assigned_user_first_name']} {row['assigned_user_last_name']}".strip()
+
+    @classmethod
+    def expand_notes(cls, rows):
+        notes = {}
+        for note in WorkflowStepNote.objects.filter(
+            step__in=[row['id'] for row in rows]
+        ).select_related('author'):
+            notes.setdefault(note.step_id, []).append(note)
+        for row in rows:
+            row['notes'] = WorkflowStepNoteSerializer(notes.get(row['id'], []), many=True).data
+
+class AssembledAircraftListSerializer(ProjectionListSerializer):
+    """
+    List representation of AssembledAircraftSerializer. Steps and parts are
+    only loaded with ?expand=workflow_steps,parts, the progress counters
+    summarize them.
+    """
+    fields = (
+        'id', 'name', 'aircraft_type', 'assembly_team', 'status', 'total_steps',
+        'completed_steps', 'failed_steps', 'in_progress_steps', 'current_step_type',
+        'due_date', 'priority', 'created_at', 'updated_at'
+    )
+    expressions = {
+        'assembly_team_name': F('assembly_team__name'),
+    }
+    choice_displays = {
+        'aircraft_type': dict(AssembledAircraft._meta.get_field('aircraft_type').choices),
+        'status': dict(AssembledAircraft.Status.choices),
+    }
+    expansions = ('workflow_steps', 'parts')
+
+    @classmethod
+    def expand_workflow_steps(cls, rows):
+        steps = {}
+        queryset = WorkflowStep.objects.filter(
+            assembled_aircraft__in=[row['id'] for row in rows]
+        ).with_previous_status().with_note_summary().order_by('sequence')
+        for step in WorkflowStepListSerializer(WorkflowStepListSerializer.project(queryset), many=True).data:
+            steps.setdefault(step['assembled_aircraft'], []).append(step)
+        for row in rows:
+            row['workflow_steps'] = steps.get(row['id'], [])
+
+    @classmethod
+    def expand_parts(cls, rows):
+        parts = {}
+        links = AssembledAircraft.parts.through.objects.filter(
+            assembledaircraft__in=[row['id'] for row in rows]
+        ).order_by('id').values_list('assembledaircraft_id', 'part_id')
+        for aircraft_id, part_id in links:
+            parts.setdefault(aircraft_id, []).append(part_id)
+        for row in rows:
+            row['parts'] = parts.get(row['id'], [])
+
+class ScheduledStepListSerializer(ProjectionListSerializer):
+    """Planned steps of a team, see scheduling.py"""
+    fields = ('id', 'step', 'aircraft', 'team', 'slot', 'planned_start', 'planned_end')
+    expressions = {
+        'step_type': F('step__step_type'),
+        'step_status': F('step__status'),
+        'sequence': F('step__sequence'),
+        'aircraft_name': F('aircraft__name'),
+        'due_date': F('aircraft__due_date'),
+        'priority': F('aircraft__priority'),
+    }
+    choice_displays = {
+        'step_type': dict(WorkflowStep.StepType.choices),
+        'step_status': dict(WorkflowStep.Status.choices),
+    }
+    key_fields = ('id', 'planned_start')
+
+class ProductionScheduleSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ProductionSchedule
+        fields = [
+            'objective', 'planned_steps', 'makespan_end',
+            'weighted_tardiness_hours', 'planned_at', 'updated_at'
+        ]
+        read_only_fields = fields
+
+class ProductionOrderSerializer(serializers.Serializer):
+    aircraft_type = serializers.ChoiceField(choices=Aircraft.AIRCRAFT_TYPES)
+    name = serializers.CharField(max_length=90)
+    quantity = serializers.IntegerField(min_value=1, max_value=MAX_ORDER_QUANTITY)
+    description = serializers.CharField(required=False, allow_blank=True, default='')
+    due_date = serializers.DateTimeField(required=False, allow_null=True, default=None)
+    priority = serializers.IntegerField(min_value=1, max_value=MAX_PRIORITY, default=1)
+
+class BulkTransitionItemSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    action = serializers.ChoiceField(choices=['start', 'complete'])
+    success = serializers.BooleanField(required=False, default=True)
+    version = serializers.IntegerField(required=False)
+
+class BulkTransitionSerializer(serializers.Serializer):
+    items = BulkTransitionItemSerializer(
+        many=True,
+        allow_empty=False,
+        max_length=MAX_BULK_TRANSITIONS
+    )
@@ -0,0 +1,84 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+from apps.parts.models import Part
+from . import inventory
+from .cache import aircraft_tag, invalidate_on_commit
+from .models import AssembledAircraft, WorkflowStep, WorkflowStepNote, WorkflowTemplate, WorkflowTemplateStep
+from .workflow import workflow_plans
+
+
+@receiver(post_save, sender=WorkflowTemplate)
+@receiver(post_delete, sender=WorkflowTemplate)
+@receiver(post_save, sender=WorkflowTemplateStep)
+@receiver(post_delete, sender=WorkflowTemplateStep)
+def invalidate_workflow_plans(sender, **kwargs):
+    """Recompile workflow plans in every worker once the change is committed"""
+    transaction.on_commit(workflow_plans.invalidate)
+
+
+def _tracks_inventory(update_fields):
+    return update_fields is None or bool(set(update_fields) & set(inventory.INVENTORY_FIELDS))
+
+
+@receiver(pre_save, sender=Part)
+def remember_inventory_key(sender, instance, raw=False, update_fields=None, using=None, **kwargs):
+    """
+    Keep the stored state of a part so post_save can move it in the ledger.
+    Inside a transaction (see inventory.save_part) the stored row stays
+    locked until the ledger is updated, so a concurrent save of the part
+    waits and then moves it from the state this one committed.
+    """
+    instance._inventory_key = None
+    if raw or instance.pk is None or not _tracks_inventory(update_fields):
+        return
+    stored = Part.objects.using(using).filter(pk=instance.pk)
+    if transaction.get_connection(using).in_atomic_block:
+        stored = stored.select_for_update()
+    stored = stored.values(*inventory.INVENTORY_FIELDS).first()
+    if stored:
+        instance._inventory_key = inventory.make_key(
+            *(stored[field] for field in inventory.INVENTORY_FIELDS)
+        )
+
+
+@receiver(post_save, sender=Part)
+def update_inventory_on_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or not _tracks_inventory(update_fields):
+        return
+    key = inventory.key_for(instance)
+    previous = getattr(instance, '_inventory_key', None)
+    if created or previous is None:
+        inventory.record_changes({key: 1})
+    elif previous != key:
+        inventory.record_changes({previous: -1, key: 1})
+
+
+@receiver(post_delete, sender=Part)
+def update_inventory_on_delete(sender, instance, **kwargs):
+    inventory.record_changes({inventory.key_for(instance): -1})
+
+
+@receiver(post_save, sender=AssembledAircraft)
+@receiver(post_delete, sender=AssembledAircraft)
+def invalidate_aircraft_responses(sender, instance, **kwargs):
+    invalidate_on_commit('aircraft', aircraft_tag(instance.pk))
+
+
+@receiver(post_save, sender=WorkflowStep)
+@receiver(post_delete, sender=WorkflowStep)
+def invalidate_step_responses(sender, instance, **kwargs):
+    invalidate_on_commit('steps', aircraft_tag(instance.assembled_aircraft_id))
+
+
+@receiver(post_save, sender=WorkflowStepNote)
+@receiver(post_delete, sender=WorkflowStepNote)
+def invalidate_note_responses(sender, instance, **kwargs):
+    # Step payloads summarize their notes
+    invalidate_on_commit('steps', aircraft_tag(instance.step.assembled_aircraft_id))
+
+
+@receiver(post_save, sender=Part)
+@receiver(post_delete, sender=Part)
+def invalidate_part_responses(sender, instance, **kwargs):
+    invalidate_on_commit('parts')
@@ -0,0 +1,271 @@
+import heapq
+import itertools
+import multiprocessing
+import random
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+# Step durations sampled per step type, most recent first
+MAX_DURATION_SAMPLES = 2000
+# History used for the step durations
+DURATION_LOOKBACK_DAYS = 180
+# Duration of a step type without any history, in hours
+DEFAULT_STEP_HOURS = 8.0
+# Below this many replications the process pool costs more than it saves
+PARALLEL_MIN_REPLICATIONS = 200
+WEEK_HOURS = 7 * 24
+
+ARRIVE = 0
+FINISH = 1
+
+
+class LineModel:
+    """
+    Input of a simulation: the workflow steps as (step_type, team_type)
+    pairs, the parallel capacity (workers) of each team type and the
+    historical durations of each step type in hours. Plain data, so it
+    pickles cheaply to pool workers.
+    """
+    __slots__ = ('steps', 'capacity', 'durations', 'estimated')
+
+    def __init__(self, steps, capacity, durations, estimated=()):
+        self.steps = tuple(steps)
+        self.capacity = dict(capacity)
+        self.durations = {step_type: tuple(samples) for step_type, samples in durations.items()}
+        self.estimated = tuple(estimated)
+
+    def with_capacity(self, overrides):
+        """A copy with the capacity of some team types replaced"""
+        return LineModel(self.steps, {**self.capacity, **overrides}, self.durations, self.estimated)
+
+
+def parse_capacity(values):
+    """
+    Capacity overrides from 'team_type:workers' strings (or '='), e.g.
+    ['wing:4', 'assembly=6']. Raises ValueError on malformed values.
+    """
+    capacity = {}
+    for value in values:
+        team_type, separator, workers = value.replace('=', ':').partition(':')
+        if not separator or not workers.isdigit() or int(workers) < 1:
+            raise ValueError(f"Invalid capacity {value!r}, expected team_type:workers")
+        capacity[team_type.strip()] = int(workers)
+    return capacity
+
+
+def team_workers(team_ids):
+    """Workers of each team: its Profile members, at least one"""
+    from django.db.models import Count
+    from apps.accounts.models import Profile
+
+    members = dict(
+        Profile.objects.filter(team__in=team_ids).order_by().values('team').annotate(
+            members=Count('id')
+        ).values_list('team', 'members')
+    )
+    return {team_id: max(members.get(team_id, 0), 1) for team_id in team_ids}
+
+
+def recent_step_durations(step_types, lookback_days=DURATION_LOOKBACK_DAYS):
+    """
+    Started to completed hours of up to MAX_DURATION_SAMPLES steps of each
+    type completed in the last `lookback_days`, {step_type: [hours]}.
+    """
+    from datetime import timedelta
+    from django.db.models import DurationField, ExpressionWrapper, F, Window
+    from django.db.models.functions import RowNumber
+    from django.utils import timezone
+    from .models import WorkflowStep
+
+    recent = WorkflowStep.objects.filter(
+        status=WorkflowStep.Status.COMPLETED,
+        step_type__in=step_types,
+        started_at__isnull=False,
+        completed_at__gte=timezone.now() - timedelta(days=lookback_days)
+    ).annotate(
+        duration=ExpressionWrapper(F('completed_at') - F('started_at'), output_field=DurationField()),
+        recency=Window(RowNumber(), partition_by=[F('step_type')], order_by=F('completed_at').desc())
+    ).filter(recency__lte=MAX_DURATION_SAMPLES).values_list('step_type', 'duration')
+
+    durations = {step_type: [] for step_type in step_types}
+    for step_type, duration in recent:
+        durations[step_type].append(duration.total_seconds() / 3600)
+    return durations
+
+
+def build_line_model(aircraft_type='', lookback_days=DURATION_LOOKBACK_DAYS):
+    """
+    LineModel of the real line: the workflow plan of `aircraft_type`, one
+    worker per member of the team assigned to each team type (at least
+    one) and the durations of steps completed in the last `lookback_days`.
+    """
+    from apps.teams.registry import reference_data
+    from .workflow import workflow_plans
+
+    plan = workflow_plans.plan_for(aircraft_type)
+    teams = reference_data.teams_by_type()
+    workers = team_workers([team.id for team in teams.values()])
+    capacity = {
+        team_type: workers[teams[team_type].id] if team_type in teams else 1
+        for _, team_type in plan
+    }
+
+    durations = recent_step_durations(plan.step_types, lookback_days)
+    estimated = [step_type for step_type, samples in durations.items() if not samples]
+    for step_type in estimated:
+        durations[step_type] = [DEFAULT_STEP_HOURS]
+    return LineModel(plan.steps, capacity, durations, estimated)
+
+
+def simulate(model, backlog, release_interval=0.0, rng=random):
+    """
+    One replication of `backlog` aircraft going through the line, the
+    i-th released at i * release_interval hours.
+
+    Discrete-event simulation on a heap of (time, sequence, kind, aircraft,
+    step) events: an aircraft arriving at a step starts it if its team has
+    a free worker and queues FIFO otherwise, a finishing step hands the
+    worker to the next queued aircraft and moves its own aircraft on. Step
+    durations are drawn from the historical samples.
+    """
+    steps = model.steps
+    free = dict(model.capacity)
+    queues = {team_type: deque() for team_type in free}
+    busy = dict.fromkeys(free, 0.0)
+    waited = dict.fromkeys(free, 0.0)
+    served = dict.fromkeys(free, 0)
+    sequence = itertools.count()
+    events = [(aircraft * release_interval, next(sequence), ARRIVE, aircraft, 0) for aircraft in range(backlog)]
+    heapq.heapify(events)
+
+    wip = 0
+    wip_area = 0.0
+    lead_time = 0.0
+    last = 0.0
+
+    def start(now, queued_at, aircraft, index):
+        nonlocal wip
+        step_type, team_type = steps[index]
+        duration = rng.choice(model.durations[step_type])
+        busy[team_type] += duration
+        waited[team_type] += now - queued_at
+        served[team_type] += 1
+        if index == 0:
+            wip += 1
+        heapq.heappush(events, (now + duration, next(sequence), FINISH, aircraft, index))
+
+    def arrive(now, aircraft, index):
+        team_type = steps[index][1]
+        if free[team_type]:
+            free[team_type] -= 1
+            start(now, now, aircraft, index)
+        else:
+            queues[team_type].append((now, aircraft, index))
+
+    while events:
+        now, _, kind, aircraft, index = heapq.heappop(events)
+        wip_area += wip * (now - last)
+        last = now
+        if kind == ARRIVE:
+            arrive(now, aircraft, index)
+            continue
+
+        queue = queues[steps[index][1]]
+        if queue:
+            start(now, *queue.popleft())
+        else:
+            free[steps[index][1]] += 1
+        if index + 1 < len(steps):
+            arrive(now, aircraft, index + 1)
+        else:
+            wip -= 1
+            lead_time += now - aircraft * release_interval
+
+    makespan = last
+    utilization = {
+        team_type: busy[team_type] / (model.capacity[team_type] * makespan) if makespan else 0.0
+        for team_type in busy
+    }
+    return {
+        'makespan': makespan,
+        'throughput': backlog / makespan * WEEK_HOURS if makespan else 0.0,
+        'wip': wip_area / makespan if makespan else 0.0,
+        'lead_time': lead_time / backlog if backlog else 0.0,
+        'utilization': utilization,
+        'wait': {
+            team_type: waited[team_type] / served[team_type] if served[team_type] else 0.0
+            for team_type in waited
+        },
+        'bottleneck': max(utilization, key=utilization.get) if utilization else None,
+    }
+
+
+def _run_batch(model, backlog, release_interval, seeds):
+    return [simulate(model, backlog, release_interval, random.Random(seed)) for seed in seeds]
+
+
+def _percentiles(values, percentiles=(10, 50, 90)):
+    return {
+        f'p{percentile}': round(float(value), 2)
+        for percentile, value in zip(percentiles, np.percentile(values, percentiles))
+    }
+
+
+def summarize(model, backlog, results):
+    """Distribution of the replication results, durations in hours"""
+    makespan = np.array([result['makespan'] for result in results])
+    throughput = np.array([result['throughput'] for result in results])
+    wip = np.array([result['wip'] for result in results])
+    lead_time = np.array([result['lead_time'] for result in results])
+    bottlenecks = Counter(result['bottleneck'] for result in results)
+    teams = {}
+    for team_type, workers in model.capacity.items():
+        utilization = np.array([result['utilization'][team_type] for result in results])
+        wait = np.array([result['wait'][team_type] for result in results])
+        teams[team_type] = {
+            'workers': workers,
+            'utilization': round(float(utilization.mean()), 3),
+            'mean_wait_hours': round(float(wait.mean()), 2),
+            'bottleneck_share': round(bottlenecks[team_type] / len(results), 3),
+        }
+    return {
+        'backlog': backlog,
+        'replications': len(results),
+        'makespan_hours': {'mean': round(float(makespan.mean()), 2), **_percentiles(makespan)},
+        'throughput_per_week': {'mean': round(float(throughput.mean()), 3), **_percentiles(throughput)},
+        'mean_wip': round(float(wip.mean()), 2),
+        'mean_lead_time_hours': round(float(lead_time.mean()), 2),
+        'bottleneck': bottlenecks.most_common(1)[0][0] if bottlenecks else None,
+        'teams': teams,
+        'estimated_step_types': list(model.estimated),
+    }
+
+
+def run_monte_carlo(model, backlog, replications, release_interval=0.0, seed=None, workers=1):
+    """
+    Run `replications` independent simulations of the backlog and
+    summarize them. With several `workers` large runs are split into one
+    batch per worker of a process pool; every replication has its own seed
+    drawn from `seed`, so a seeded run gives the same result however it is
+    split.
+
+    The pool is for the simulate_line command: its workers are spawned
+    rather than forked and only live for this call. Web requests stay in
+    process, the default.
+    """
+    base = random.Random(seed)
+    seeds = [base.getrandbits(64) for _ in range(replications)]
+    if workers <= 1 or replications < PARALLEL_MIN_REPLICATIONS:
+        results = _run_batch(model, backlog, release_interval, seeds)
+    else:
+        batches = [seeds[offset::workers] for offset in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+            results = list(itertools.chain.from_iterable(pool.map(
+                _run_batch,
+                itertools.repeat(model),
+                itertools.repeat(backlog),
+                itertools.repeat(release_interval),
+                batches
+            )))
+    return summarize(model, backlog, results)
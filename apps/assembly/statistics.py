@@ -0,0 +1,84 @@
+from collections import defaultdict
+from apps.parts.models import Aircraft
+from apps.teams.registry import reference_data
+from .models import WorkflowStep
+from .rollups import part_rollup, step_rollup
+
+
+def _rate(value, total):
+    return round(value / total * 100, 1) if total > 0 else 0
+
+
+def get_team_statistics(date_from=None, date_to=None):
+    """
+    Part, workflow and aircraft-type statistics for every team.
+
+    Days before the last rollup refresh are read from the daily rollups
+    and only later rows from the part and workflow step tables, so the
+    cost depends on the number of days in the range rather than the number
+    of rows.
+    """
+    aircraft_names = dict(Aircraft.AIRCRAFT_TYPES)
+
+    # Part statistics per team and aircraft type
+    part_stats = defaultdict(lambda: defaultdict(int))
+    part_distribution = defaultdict(lambda: defaultdict(int))
+    for row in part_rollup.aggregate(
+        ['team', 'aircraft_type', 'status', 'quality_check_status'], date_from, date_to
+    ):
+        stats = part_stats[row['team']]
+        stats['total'] += row['count']
+        if row['status'] == 'completed':
+            stats['completed'] += row['count']
+        elif row['status'] == 'in_production':
+            stats['in_production'] += row['count']
+        if row['quality_check_status'] == 'passed':
+            stats['quality_passed'] += row['count']
+        if row['aircraft_type'] in aircraft_names:
+            part_distribution[row['team']][aircraft_names[row['aircraft_type']]] += row['count']
+
+    # Workflow statistics per assigned team, and the steps of each step type
+    # per aircraft type. Every aircraft has one step of each type, so the
+    # largest step type count is the number of aircraft the team worked on.
+    workflow_stats = defaultdict(lambda: defaultdict(int))
+    step_type_counts = defaultdict(lambda: defaultdict(int))
+    for row in step_rollup.aggregate(
+        ['team', 'aircraft_type', 'step_type', 'status'], date_from, date_to
+    ):
+        workflow_stats[row['team']]['total'] += row['count']
+        workflow_stats[row['team']][row['status']] += row['count']
+        step_type_counts[row['team'], row['aircraft_type']][row['step_type']] += row['count']
+
+    aircraft_distribution = defaultdict(dict)
+    for (team_id, aircraft_type), counts in step_type_counts.items():
+        name = aircraft_names.get(aircraft_type, aircraft_type)
+        aircraft_distribution[team_id][name] = max(counts.values())
+
+    team_stats = []
+    for team in reference_data.teams():
+        parts = part_stats[team.id]
+        if team.team_type == 'assembly':
+            workflows = workflow_stats[team.id]
+            distribution = aircraft_distribution[team.id]
+        else:
+            workflows = defaultdict(int)
+            distribution = dict(part_distribution[team.id])
+
+        total_workflows = workflows['total']
+        completed_workflows = workflows[WorkflowStep.Status.COMPLETED]
+        team_stats.append({
+            'team': team,
+            'total_parts': parts['total'],
+            'completed_parts': parts['completed'],
+            'in_production': parts['in_production'],
+            'quality_passed': parts['quality_passed'],
+            'completion_rate': _rate(parts['completed'], parts['total']),
+            'quality_rate': _rate(parts['quality_passed'], parts['completed']),
+            'total_workflows': total_workflows,
+            'completed_workflows': completed_workflows,
+            'in_progress': workflows[WorkflowStep.Status.IN_PROGRESS],
+            'workflow_completion_rate': _rate(completed_workflows, total_workflows),
+            'aircraft_distribution': distribution
+        })
+
+    return team_stats
@@ -0,0 +1,118 @@
+from collections import defaultdict
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import F, OuterRef, Subquery
+from django.utils import timezone
+from .events import publish_on_commit, step_transition_event
+from .models import AssembledAircraft, WorkflowEvent, WorkflowStep
+from .scheduling import queue_replan
+
+# Largest batch accepted by bulk_transition
+MAX_BULK_TRANSITIONS = 200
+
+START = 'start'
+
+
+def bulk_transition(items, user, queryset):
+    """
+    Start or complete many workflow steps in one transaction.
+
+    `items` is a list of dicts with `id`, `action` ('start' or 'complete')
+    and optionally `success` and `version`; `queryset` limits the steps the
+    user may change. All steps are locked (in id order) and validated in one query,
+    applied with one UPDATE per kind of transition, logged with one bulk
+    INSERT of WorkflowEvents and every affected aircraft has its progress
+    recomputed once. Items that fail validation
+    are reported without aborting the rest of the batch.
+
+    Returns a list of per-item results in request order, each holding the
+    new `status` on success or an `error` message.
+    """
+    results = [{'id': item['id'], 'action': item['action']} for item in items]
+
+    with transaction.atomic():
+        previous = WorkflowStep.objects.filter(
+            assembled_aircraft=OuterRef('assembled_aircraft'),
+            sequence__lt=OuterRef('sequence')
+        ).order_by('-sequence')
+        steps = {
+            step.id: step
+            for step in queryset.filter(
+                id__in={item['id'] for item in items}
+            ).order_by('id').select_for_update().annotate(
+                previous_id=Subquery(previous.values('id')[:1]),
+                previous_status=Subquery(previous.values('status')[:1])
+            )
+        }
+
+        # Validate every item against the locked rows, tracking statuses
+        # changed earlier in the batch so "complete step 1, start step 2"
+        # works in a single request.
+        batch_status = {}
+        updates = defaultdict(list)
+        transitions = defaultdict(list)
+        events = []
+        logged = []
+        now = timezone.now()
+        for item, result in zip(items, results):
+            step = steps.get(item['id'])
+            if step is None:
+                result['error'] = 'Workflow step not found'
+                continue
+            if item.get('version') is not None and item['version'] != step.version:
+                result['error'] = 'This step was changed by someone else, please reload and try again'
+                result['conflict'] = True
+                continue
+
+            step.status = batch_status.get(step.id, step.status)
+            previous_status = batch_status.get(step.previous_id, step.previous_status)
+            step.is_startable = previous_status in (None, WorkflowStep.Status.COMPLETED)
+            try:
+                if item['action'] == START:
+                    step.validate_start()
+                    new_status = WorkflowStep.Status.IN_PROGRESS
+                else:
+                    step.validate_complete()
+                    new_status = (
+                        WorkflowStep.Status.COMPLETED if item.get('success', True)
+                        else WorkflowStep.Status.FAILED
+                    )
+            except ValidationError as e:
+                result['error'] = ' '.join(e.messages)
+                continue
+
+            updates[new_status].append(step.id)
+            transitions[step.assembled_aircraft_id].append((step.status, new_status))
+            events.append(step_transition_event(step, step.status, new_status, user))
+            logged.append(WorkflowEvent.for_transition(step, step.status, new_status, user, now))
+            batch_status[step.id] = new_status
+            result['status'] = new_status
+
+        if updates[WorkflowStep.Status.IN_PROGRESS]:
+            WorkflowStep.objects.filter(id__in=updates[WorkflowStep.Status.IN_PROGRESS]).update(
+                status=WorkflowStep.Status.IN_PROGRESS,
+                assigned_user=user,
+                started_at=now,
+                updated_at=now,
+                version=F('version') + 1
+            )
+        for new_status in (WorkflowStep.Status.COMPLETED, WorkflowStep.Status.FAILED):
+            if updates[new_status]:
+                WorkflowStep.objects.filter(id__in=updates[new_status]).update(
+                    status=new_status,
+                    completed_at=now,
+                    updated_at=now,
+                    version=F('version') + 1
+                )
+
+        # Recompute each affected aircraft once, in id order to avoid deadlocks
+        for aircraft_id in sorted(transitions):
+            AssembledAircraft.record_step_transitions(aircraft_id, transitions[aircraft_id])
+        WorkflowEvent.objects.bulk_create(logged)
+        publish_on_commit(events)
+        queue_replan(
+            event['aircraft'] for event in events
+            if event['status'] != WorkflowStep.Status.IN_PROGRESS
+        )
+
+    return results
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from . import views
@@ -8,14 +9,28 @@ router = DefaultRouter()
 router.register(r'aircraft', views.AssembledAircraftViewSet, basename='assembled-aircraft')
 router.register(r'workflow', views.WorkflowStepViewSet, basename='workflow-step')
 
+
+def dashboard(sync_view, async_view):
+    """The view of a dashboard this deployment serves, see settings.ASYNC_DASHBOARDS"""
+    return async_view if settings.ASYNC_DASHBOARDS else sync_view
+
+
 urlpatterns = [
     # Frontend Views
-    path('', views.workflow_list, name='workflow_list'),
+    path('', dashboard(views.workflow_list, views.workflow_list_async), name='workflow_list'),
     path('workflow/<int:pk>/', views.workflow_detail, name='workflow_detail'),
     path('create/', views.create_aircraft, name='create_aircraft'),
-    path('quality-checks/', views.quality_checks, name='quality_checks'),
+    path('production-order/', views.production_order, name='production_order'),
+    path('quality-checks/', dashboard(views.quality_checks, views.quality_checks_async), name='quality_checks'),
     path('statistics/', views.team_statistics, name='team_statistics'),
     path('api/available-parts/', views.available_parts, name='available_parts'),
+    path('api/statistics/teams/', views.team_statistics_api, name='team_statistics_api'),
+    path('api/analytics/cycle-times/', views.cycle_time_analytics, name='cycle_time_analytics'),
+    path('api/analytics/line-simulation/', views.line_simulation, name='line_simulation'),
+    path('api/schedule/', views.production_schedule, name='production_schedule'),
+    path('api/analytics/step-times/', views.step_time_analytics, name='step_time_analytics'),
+    path('api/cache/stats/', views.response_cache_stats, name='response_cache_stats'),
+    path('api/events/', views.workflow_events, name='workflow_events'),
     
     # API endpoints
     path('api/', include(router.urls)),
@@ -1,108 +1,310 @@
-from rest_framework import viewsets, permissions, filters, status
+from rest_framework import viewsets, permissions, filters, serializers, status
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Count, Q, Sum, F, ExpressionWrapper, FloatField
+from django.db.models import Count, Q, Sum, F, ExpressionWrapper, FloatField, Prefetch, Window
+from django.db.models.functions import Coalesce, RowNumber
 from django.utils import timezone
+from django.core.cache import cache
 from django.db import transaction
 from django.core.exceptions import ValidationError
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
+from django.contrib.auth.views import redirect_to_login
 from django.contrib import messages
-from .models import AssembledAircraft, WorkflowStep
-from .serializers import AssembledAircraftSerializer, WorkflowStepSerializer
+from .models import (
+    AssembledAircraft,
+    ProductionSchedule,
+    ScheduledStep,
+    WorkflowEvent,
+    WorkflowStep,
+    WorkflowStepNote,
+    StepTransitionConflict
+)
+from .serializers import (
+    AssembledAircraftSerializer,
+    AssembledAircraftListSerializer,
+    WorkflowStepSerializer,
+    WorkflowStepListSerializer,
+    WorkflowStepNoteSerializer,
+    ProductionOrderSerializer,
+    ProductionScheduleSerializer,
+    ScheduledStepListSerializer,
+    BulkTransitionSerializer
+)
+from .forms import ProductionOrderForm
+from .analytics import get_cycle_time_analytics, get_step_time_analytics
+from .allocation import (
+    allocate_parts,
+    consume_reservations,
+    missing_part_counts,
+    unreserved_parts
+)
+from .cache import aircraft_tag, response_cache, team_scope
+from .events import DISCONNECTED_SCOPE_KEY, aircraft_channel, get_broker, team_channel
+from .async_queries import run_concurrently
+from .inventory import available_counts
+from .production import create_production_order
+from .scheduling import build_schedule, queue_replan
+from .simulation import build_line_model, parse_capacity, run_monte_carlo
+from .transitions import bulk_transition
+from .progress import (
+    get_progress,
+    get_progress_etag,
+    get_progress_version,
+    is_not_modified,
+    set_progress_headers
+)
+from .rollups import step_rollup
+from .statistics import get_team_statistics
+from .workflow import workflow_plans
 from apps.parts.models import Part, Aircraft
-from apps.teams.models import Team
+from apps.teams.registry import reference_data
 from rest_framework.permissions import IsAuthenticated
-from datetime import datetime
+from aircraft_production.pagination import HybridPagination, KeysetPaginator
+from datetime import datetime, timedelta
+from urllib.parse import urlencode
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, HttpResponseBadRequest, HttpResponseForbidden, StreamingHttpResponse
+import asyncio
+import hashlib
+import json
 
-# Frontend Views
-@login_required
-def workflow_list(request):
-    """Display list of all assembly workflows"""
+# Orderings offered by the HTML listings, each backed by an index. The
+# trailing id makes the keyset unique.
+WORKFLOW_LIST_ORDERINGS = {
+    '-created_at': ('-created_at', '-id'),
+    'created_at': ('created_at', 'id'),
+    'status': ('status', '-created_at', '-id'),
+}
+QUALITY_CHECK_ORDERINGS = {
+    '-created_at': ('-created_at', '-id'),
+    'created_at': ('created_at', 'id'),
+}
+WORKFLOW_LIST_PAGE_SIZE = 24
+QUALITY_CHECKS_PAGE_SIZE = 20
+# Listing summaries scan every matching row, so they are shared for a minute
+LISTING_STATS_TIMEOUT = 60
+# Parts listed per part type by the available_parts view
+AVAILABLE_PARTS_LIMIT = 50
+# Seconds between keep-alive comments on idle event streams
+EVENT_STREAM_HEARTBEAT = 15
+# Streams are closed after this many seconds, EventSource reconnects. A
+# backstop: streams end at the next heartbeat after their client
+# disconnects (events.watch_disconnects)
+EVENT_STREAM_MAX_AGE = 5 * 60
+# Responses served through apps.assembly.cache.response_cache
+CACHED_RESPONSES = (
+    'assembly_statistics', 'part_details',
+    'available_parts', 'aircraft_available_parts', 'step_time_analytics',
+    'cycle_time_analytics', 'line_simulation'
+)
+
+# Range of the analytics reports when no date_from is given
+STEP_TIME_DEFAULT_DAYS = 30
+CYCLE_TIME_DEFAULT_DAYS = 365
+# Completed steps only change the report slowly, entries are not invalidated
+CYCLE_TIME_CACHE_TIMEOUT = 10 * 60
+MAX_HISTOGRAM_BINS = 100
+# Keep interactive line simulations within a few seconds
+MAX_SIMULATION_BACKLOG = 1000
+MAX_SIMULATION_REPLICATIONS = 500
+# Simulations run in the request's process, backlog times replications is
+# capped to keep them around a second; larger runs go through simulate_line
+MAX_SIMULATED_AIRCRAFT = 50000
+SIMULATION_CACHE_TIMEOUT = 10 * 60
+
+def listing_stats_key(prefix, filters):
+    return f"{prefix}:{hashlib.md5(urlencode(sorted(filters.items())).encode()).hexdigest()}"
+
+def get_listing_stats(prefix, filters, compute):
+    """Summary of a filtered listing, cached per filter combination"""
+    return cache.get_or_set(listing_stats_key(prefix, filters), compute, LISTING_STATS_TIMEOUT)
+
+async def get_listing_stats_async(prefix, filters, queries, summarize, extra_queries):
+    """
+    Async get_listing_stats: on a cache miss the stats `queries` run
+    concurrently with `extra_queries` (e.g. the page itself). Returns
+    (stats, results of extra_queries).
+    """
+    key = listing_stats_key(prefix, filters)
+    stats = cache.get(key)
+    results = await run_concurrently(extra_queries if stats is not None else {**queries, **extra_queries})
+    if stats is None:
+        stats = summarize(results)
+        cache.set(key, stats, LISTING_STATS_TIMEOUT)
+    return stats, results
+
+async def get_dashboard_user(request):
+    """
+    Authenticated user of an async view with the profile team loaded, or
+    None. Session and profile lookups are sync ORM calls.
+    """
+    def load():
+        user = request.user
+        if not user.is_authenticated:
+            return None
+        user.profile.team
+        return user
+    return await sync_to_async(load)()
+
+def get_workflow_list_filters(request):
+    ordering = request.GET.get('ordering')
+    return {
+        'status': request.GET.get('status') or '',
+        'team': request.GET.get('team') or '',
+        'aircraft_type': request.GET.get('aircraft_type') or '',
+        'date_from': request.GET.get('date_from') or '',
+        'date_to': request.GET.get('date_to') or '',
+        'ordering': ordering if ordering in WORKFLOW_LIST_ORDERINGS else '-created_at',
+    }
+
+def filter_workflow_list(filters):
     aircrafts = AssembledAircraft.objects.select_related(
         'assembly_team'
-    ).prefetch_related('workflow_steps').all()
-    teams = Team.objects.all()
-    aircraft_types = Aircraft.objects.all()
-    
-    # Apply filters
-    status_filter = request.GET.get('status')
-    team_filter = request.GET.get('team')
-    aircraft_type_filter = request.GET.get('aircraft_type')
-    date_from = request.GET.get('date_from')
-    date_to = request.GET.get('date_to')
-    ordering = request.GET.get('ordering', '-created_at')
-    
-    if status_filter:
-        aircrafts = aircrafts.filter(status=status_filter)
-    if team_filter:
-        aircrafts = aircrafts.filter(assembly_team_id=team_filter)
-    if aircraft_type_filter:
-        aircrafts = aircrafts.filter(aircraft_type_id=aircraft_type_filter)
-    if date_from:
-        aircrafts = aircrafts.filter(created_at__gte=date_from)
-    if date_to:
-        aircrafts = aircrafts.filter(created_at__lte=date_to)
-    
-    # Calculate statistics
-    total_count = aircrafts.count()
-    status_stats = dict(aircrafts.values('status').annotate(count=Count('id')).values_list('status', 'count'))
-    team_stats = dict(aircrafts.values('assembly_team__name').annotate(count=Count('id')).values_list('assembly_team__name', 'count'))
-    
-    # Calculate completion rates
-    completion_stats = aircrafts.aggregate(
-        total_steps=Count('workflow_steps'),
-        completed_steps=Count('workflow_steps', filter=Q(workflow_steps__status='COMPLETED')),
-        failed_steps=Count('workflow_steps', filter=Q(workflow_steps__status='FAILED'))
+    ).prefetch_related(
+        Prefetch('workflow_steps', queryset=WorkflowStep.objects.order_by('sequence'))
     )
-    
+    if filters['status']:
+        aircrafts = aircrafts.filter(status=filters['status'])
+    if filters['team']:
+        aircrafts = aircrafts.filter(assembly_team_id=filters['team'])
+    if filters['aircraft_type']:
+        aircrafts = aircrafts.filter(aircraft_type=filters['aircraft_type'])
+    if filters['date_from']:
+        aircrafts = aircrafts.filter(created_at__gte=filters['date_from'])
+    if filters['date_to']:
+        aircrafts = aircrafts.filter(created_at__lte=filters['date_to'])
+    return aircrafts
+
+def workflow_list_stats_queries(aircrafts):
+    """The independent aggregates behind the workflow list summary"""
+    filtered = aircrafts.order_by().prefetch_related(None)
+    return {
+        'completion': lambda: filtered.aggregate(
+            total_count=Count('id'),
+            total_steps=Coalesce(Sum('total_steps'), 0),
+            completed_steps=Coalesce(Sum('completed_steps'), 0),
+            failed_steps=Coalesce(Sum('failed_steps'), 0)
+        ),
+        'status': lambda: dict(filtered.values('status').annotate(count=Count('id')).values_list('status', 'count')),
+        'team': lambda: dict(filtered.values('assembly_team__name').annotate(count=Count('id')).values_list('assembly_team__name', 'count')),
+    }
+
+def summarize_workflow_list_stats(results):
+    # Calculate completion rates from the per-aircraft progress counters
+    completion_stats = dict(results['completion'])
     if completion_stats['total_steps'] > 0:
         completion_stats['completion_rate'] = (completion_stats['completed_steps'] / completion_stats['total_steps']) * 100
     else:
         completion_stats['completion_rate'] = 0
-    
-    aircrafts = aircrafts.order_by(ordering)
-    
-    context = {
-        'aircrafts': aircrafts,
+    return {
+        'total_count': completion_stats.pop('total_count'),
+        'status_stats': results['status'],
+        'team_stats': results['team'],
+        'completion_stats': completion_stats,
+    }
+
+def load_reference_data():
+    """
+    Teams and aircraft types of the listing filters. A cold or invalidated
+    registry loads them with the sync ORM, so async views call this in an
+    executor thread.
+    """
+    return reference_data.teams(), reference_data.aircraft_types()
+
+def workflow_list_context(request, filters, page, stats, reference):
+    teams, aircraft_types = reference
+    return {
+        'aircrafts': page,
+        'next_url': page.next_url(request),
+        'previous_url': page.previous_url(request),
         'teams': teams,
         'aircraft_types': aircraft_types,
-        'total_count': total_count,
-        'status_stats': status_stats,
-        'team_stats': team_stats,
-        'completion_stats': completion_stats,
-        'selected_status': status_filter,
-        'selected_team': team_filter,
-        'selected_aircraft_type': aircraft_type_filter,
-        'selected_date_from': date_from,
-        'selected_date_to': date_to,
-        'selected_ordering': ordering
+        **stats,
+        'selected_status': filters['status'] or None,
+        'selected_team': filters['team'] or None,
+        'selected_aircraft_type': filters['aircraft_type'] or None,
+        'selected_date_from': filters['date_from'] or None,
+        'selected_date_to': filters['date_to'] or None,
+        'selected_ordering': filters['ordering'],
+        'production_order_form': ProductionOrderForm()
     }
+
+# Frontend Views
+@login_required
+def workflow_list(request):
+    """Display list of all assembly workflows"""
+    filters = get_workflow_list_filters(request)
+    aircrafts = filter_workflow_list(filters)
+    
+    # Calculate statistics
+    queries = workflow_list_stats_queries(aircrafts)
+    stats = get_listing_stats(
+        'workflow_list_stats',
+        {key: value for key, value in filters.items() if key != 'ordering'},
+        lambda: summarize_workflow_list_stats({name: query() for name, query in queries.items()})
+    )
+    
+    page = KeysetPaginator(
+        aircrafts, WORKFLOW_LIST_ORDERINGS[filters['ordering']], WORKFLOW_LIST_PAGE_SIZE
+    ).page(request.GET.get('cursor'))
+    
+    context = workflow_list_context(request, filters, page, stats, load_reference_data())
     return render(request, 'assembly/workflow_list.html', context)
 
+async def workflow_list_async(request):
+    """
+    workflow_list for ASGI: the page and, on a cache miss, the summary
+    aggregates are fetched concurrently instead of one after another
+    """
+    if await get_dashboard_user(request) is None:
+        return redirect_to_login(request.get_full_path())
+
+    filters = get_workflow_list_filters(request)
+    aircrafts = filter_workflow_list(filters)
+    paginator = KeysetPaginator(
+        aircrafts, WORKFLOW_LIST_ORDERINGS[filters['ordering']], WORKFLOW_LIST_PAGE_SIZE
+    )
+    stats, results = await get_listing_stats_async(
+        'workflow_list_stats',
+        {key: value for key, value in filters.items() if key != 'ordering'},
+        workflow_list_stats_queries(aircrafts),
+        summarize_workflow_list_stats,
+        {
+            'page': lambda: paginator.page(request.GET.get('cursor')),
+            'reference': load_reference_data,
+        }
+    )
+
+    context = workflow_list_context(request, filters, results['page'], stats, results['reference'])
+    return await sync_to_async(render)(request, 'assembly/workflow_list.html', context)
+
 @login_required
 def workflow_detail(request, pk):
     """Display details of a specific assembly workflow"""
     aircraft = get_object_or_404(AssembledAircraft, pk=pk)
-    workflow_steps = aircraft.workflow_steps.all().order_by('created_at')
+    workflow_steps = aircraft.workflow_steps.with_previous_status().prefetch_related(
+        Prefetch('step_notes', queryset=WorkflowStepNote.objects.select_related('author'))
+    ).order_by('sequence')
     
-    # Calculate completion percentage
-    total_steps = workflow_steps.count()
-    completed_steps = workflow_steps.filter(status=WorkflowStep.Status.COMPLETED).count()
-    completion_percentage = (completed_steps / total_steps * 100) if total_steps > 0 else 0
+    # Calculate completion percentage from the progress counters
+    completion_percentage = aircraft.completion_percentage
     
     # Check if all steps are completed
-    all_steps_completed = all(
-        step.status == WorkflowStep.Status.COMPLETED 
-        for step in workflow_steps
-    )
+    all_steps_completed = aircraft.completed_steps == aircraft.total_steps
     
     context = {
         'aircraft': aircraft,
         'workflow_steps': workflow_steps,
         'completion_percentage': completion_percentage,
-        'all_steps_completed': all_steps_completed
+        'all_steps_completed': all_steps_completed,
+        # Labels and badges of the step rows the live updates redraw
+        'step_statuses': {
+            value: {'label': label, 'badge': WorkflowStep.STATUS_BADGE_COLORS[value]}
+            for value, label in WorkflowStep.Status.choices
+        }
     }
     return render(request, 'assembly/workflow_detail.html', context)
 
@@ -131,77 +333,13 @@ def create_aircraft(request):
                 }
             )
             
-            with transaction.atomic():
-                # Create the assembled aircraft
-                assembled_aircraft = AssembledAircraft.objects.create(
-                    aircraft_type=aircraft_type,
-                    assembly_team=request.user.profile.team,
-                    status=AssembledAircraft.Status.PENDING
-                )
-                
-                # Create required parts for each team
-                required_parts = {
-                    'wing': [
-                        ('wing_main', 'Ana Kanat'),
-                        ('wing_aileron', 'Kanatçık'),
-                        ('wing_flap', 'Flap'),
-                        ('wing_slat', 'Slat'),
-                    ],
-                    'fuselage': [
-                        ('fuselage_main', 'Ana Gövde'),
-                        ('fuselage_nose', 'Burun Bölümü'),
-                        ('fuselage_tail', 'Kuyruk Bölümü'),
-                        ('fuselage_door', 'Kapı'),
-                    ],
-                    'tail': [
-                        ('tail_vertical', 'Dikey Stabilizatör'),
-                        ('tail_horizontal', 'Yatay Stabilizatör'),
-                        ('tail_rudder', 'Dümen'),
-                        ('tail_elevator', 'Elevator'),
-                    ],
-                    'avionics': [
-                        ('avionics_flight_control', 'Uçuş Kontrol Sistemi'),
-                        ('avionics_navigation', 'Navigasyon Sistemi'),
-                        ('avionics_communication', 'İletişim Sistemi'),
-                        ('avionics_radar', 'Radar Sistemi'),
-                    ]
-                }
-                
-                # Create parts for each team
-                for team_type, parts in required_parts.items():
-                    team = Team.objects.filter(team_type=team_type).first()
-                    if team:
-                        for part_type, part_name in parts:
-                            part = Part.objects.create(
-                                name=f"{part_name} - {aircraft_name}",
-                                part_type=part_type,
-                                description=f"{part_name} for {aircraft_name}",
-                                team=team,
-                                created_by=request.user,
-                                status='pending'
-                            )
-                            assembled_aircraft.parts.add(part)
-                
-                # Create workflow steps
-                steps = [
-                    ('WING_PRODUCTION', 'wing'),
-                    ('FUSELAGE_PRODUCTION', 'fuselage'),
-                    ('TAIL_PRODUCTION', 'tail'),
-                    ('AVIONICS_PRODUCTION', 'avionics'),
-                    ('QUALITY_CHECK', 'assembly'),
-                    ('ASSEMBLY', 'assembly'),
-                    ('TESTING', 'assembly'),
-                    ('FINAL_CHECK', 'assembly'),
-                ]
-                
-                for step_type, team_type in steps:
-                    team = Team.objects.filter(team_type=team_type).first()
-                    if team:
-                        WorkflowStep.objects.create(
-                            assembled_aircraft=assembled_aircraft,
-                            step_type=step_type,
-                            assigned_team=team
-                        )
+            assembled_aircraft = create_production_order(
+                aircraft_type=aircraft_type,
+                name=aircraft_name,
+                quantity=1,
+                assembly_team=request.user.profile.team,
+                created_by=request.user
+            )[0]
                 
             messages.success(request, "New aircraft assembly workflow created successfully")
             return redirect('assembly:workflow_detail', pk=assembled_aircraft.id)
@@ -214,157 +352,192 @@ def create_aircraft(request):
     return redirect('assembly:workflow_list')
 
 @login_required
-def quality_checks(request):
-    """Display quality checks for assembly team"""
+def production_order(request):
+    """Create a production order of several aircraft assembly workflows"""
     if not request.user.profile.team or request.user.profile.team.team_type != 'assembly':
-        messages.error(request, "Only assembly team members can access quality checks")
-        return redirect('home')
-        
+        messages.error(request, "Only assembly team members can create production orders")
+        return redirect('assembly:workflow_list')
+
+    if request.method == 'POST':
+        form = ProductionOrderForm(request.POST)
+        if not form.is_valid():
+            for errors in form.errors.values():
+                for error in errors:
+                    messages.error(request, error)
+            return redirect('assembly:workflow_list')
+
+        try:
+            aircrafts = create_production_order(
+                aircraft_type=form.cleaned_data['aircraft_type'],
+                name=form.cleaned_data['name'],
+                quantity=form.cleaned_data['quantity'],
+                assembly_team=request.user.profile.team,
+                created_by=request.user,
+                description=form.cleaned_data['description'],
+                due_date=form.cleaned_data['due_date'],
+                priority=form.cleaned_data['priority'] or 1
+            )
+            messages.success(request, f"Production order for {len(aircrafts)} aircraft created successfully")
+        except ValidationError as e:
+            messages.error(request, " ".join(e.messages))
+
+    return redirect('assembly:workflow_list')
+
+def filter_quality_checks(request):
+    """
+    Quality check steps and daily rollup filters of the quality checks
+    page, plus the date range errors to report
+    """
     # Get all workflow steps that are quality checks
     quality_steps = WorkflowStep.objects.filter(
         step_type='QUALITY_CHECK'
-    ).select_related(
+    ).with_note_summary().select_related(
         'assembled_aircraft',
         'assigned_team'
-    ).order_by('-created_at')
+    )
     
     # Apply filters
     status_filter = request.GET.get('status')
-    date_from = request.GET.get('date_from')
-    date_to = request.GET.get('date_to')
+    date_from, date_to, errors = parse_date_range(request)
     aircraft_type = request.GET.get('aircraft_type')
     
+    stats_filters = {'step_type': 'QUALITY_CHECK'}
     if status_filter:
         quality_steps = quality_steps.filter(status=status_filter)
+        stats_filters['status'] = status_filter
     if date_from:
         quality_steps = quality_steps.filter(created_at__gte=date_from)
     if date_to:
-        quality_steps = quality_steps.filter(created_at__lte=date_to)
+        quality_steps = quality_steps.filter(created_at__lt=date_to + timedelta(days=1))
     if aircraft_type:
-        quality_steps = quality_steps.filter(assembled_aircraft__aircraft_type_id=aircraft_type)
-    
-    # Calculate statistics
+        quality_steps = quality_steps.filter(assembled_aircraft__aircraft_type=aircraft_type)
+        stats_filters['aircraft_type'] = aircraft_type
+    return quality_steps, (date_from, date_to, stats_filters), errors
+
+def quality_check_stats_queries(stats_range):
+    """The independent daily rollup queries behind the quality check summary"""
+    date_from, date_to, stats_filters = stats_range
+    return step_rollup.aggregate_queries(['status'], date_from, date_to, **stats_filters)
+
+def summarize_quality_check_stats(results):
+    status_counts = {
+        row['status']: row['count']
+        for row in step_rollup.merge(['status'], results)
+    }
     stats = {
-        'total_checks': quality_steps.count(),
-        'passed_checks': quality_steps.filter(status='COMPLETED').count(),
-        'failed_checks': quality_steps.filter(status='FAILED').count(),
-        'pending_checks': quality_steps.filter(status='PENDING').count(),
-        'in_progress_checks': quality_steps.filter(status='IN_PROGRESS').count(),
+        'total_checks': sum(status_counts.values()),
+        'passed_checks': status_counts.get('COMPLETED', 0),
+        'failed_checks': status_counts.get('FAILED', 0),
+        'pending_checks': status_counts.get('PENDING', 0),
+        'in_progress_checks': status_counts.get('IN_PROGRESS', 0),
     }
     
     if stats['total_checks'] > 0:
         stats['pass_rate'] = (stats['passed_checks'] / stats['total_checks']) * 100
     else:
         stats['pass_rate'] = 0
-    
-    context = {
-        'quality_steps': quality_steps,
+    return stats
+
+def get_quality_check_ordering(request):
+    ordering = request.GET.get('ordering')
+    return ordering if ordering in QUALITY_CHECK_ORDERINGS else '-created_at'
+
+def quality_checks_context(request, page, stats, ordering, reference):
+    _, aircraft_types = reference
+    return {
+        'quality_steps': page,
+        'next_url': page.next_url(request),
+        'previous_url': page.previous_url(request),
         'status_choices': WorkflowStep.Status.choices,
-        'aircraft_types': Aircraft.objects.all(),
+        'aircraft_types': aircraft_types,
         'stats': stats,
-        'selected_status': status_filter,
-        'selected_date_from': date_from,
-        'selected_date_to': date_to,
-        'selected_aircraft_type': aircraft_type
+        'selected_status': request.GET.get('status'),
+        'selected_date_from': request.GET.get('date_from'),
+        'selected_date_to': request.GET.get('date_to'),
+        'selected_aircraft_type': request.GET.get('aircraft_type'),
+        'selected_ordering': ordering
     }
-    return render(request, 'assembly/quality_checks.html', context)
 
 @login_required
-def team_statistics(request):
-    """Display team statistics"""
-    # Date filters
-    date_from = request.GET.get('date_from')
-    date_to = request.GET.get('date_to')
-    
-    # Base queries
-    parts_query = Part.objects.all()
-    workflow_query = WorkflowStep.objects.all()
-    
-    # Apply date filters if provided
-    if date_from:
-        try:
-            date_from = datetime.strptime(date_from, '%Y-%m-%d')
-            parts_query = parts_query.filter(created_at__gte=date_from)
-            workflow_query = workflow_query.filter(created_at__gte=date_from)
-        except ValueError:
-            messages.error(request, 'Geçersiz başlangıç tarihi formatı')
-            
-    if date_to:
-        try:
-            date_to = datetime.strptime(date_to, '%Y-%m-%d')
-            parts_query = parts_query.filter(created_at__lte=date_to)
-            workflow_query = workflow_query.filter(created_at__lte=date_to)
-        except ValueError:
-            messages.error(request, 'Geçersiz bitiş tarihi formatı')
+def quality_checks(request):
+    """Display quality checks for assembly team"""
+    if not request.user.profile.team or request.user.profile.team.team_type != 'assembly':
+        messages.error(request, "Only assembly team members can access quality checks")
+        return redirect('home')
+        
+    quality_steps, stats_range, errors = filter_quality_checks(request)
+    for error in errors:
+        messages.error(request, error)
+    ordering = get_quality_check_ordering(request)
     
-    # Get all teams
-    teams = Team.objects.all()
+    # Calculate statistics from the daily rollups
+    stats = summarize_quality_check_stats([query() for query in quality_check_stats_queries(stats_range)])
     
-    # Statistics for each team
-    team_stats = []
-    for team in teams:
-        # Part statistics
-        team_parts = parts_query.filter(team=team)
-        total_parts = team_parts.count()
-        completed_parts = team_parts.filter(status='completed').count()
-        in_production = team_parts.filter(status='in_production').count()
-        quality_passed = team_parts.filter(quality_check_status='passed').count()
-        
-        # Calculate completion rate
-        completion_rate = (completed_parts / total_parts * 100) if total_parts > 0 else 0
-        
-        # Calculate quality rate
-        quality_rate = (quality_passed / completed_parts * 100) if completed_parts > 0 else 0
-        
-        # Workflow statistics (only for assembly team)
-        if team.team_type == 'assembly':
-            team_workflows = workflow_query.filter(assigned_team=team)
-            total_workflows = team_workflows.count()
-            completed_workflows = team_workflows.filter(status='completed').count()
-            in_progress = team_workflows.filter(status='in_progress').count()
-            workflow_completion_rate = (completed_workflows / total_workflows * 100) if total_workflows > 0 else 0
-            
-            # Get aircraft distribution from assembled aircraft
-            aircraft_distribution = {}
-            assembled_aircraft = AssembledAircraft.objects.filter(
-                workflow_steps__in=team_workflows
-            ).distinct()
-            
-            for aircraft in assembled_aircraft:
-                aircraft_type = aircraft.get_aircraft_type_display()
-                if aircraft_type not in aircraft_distribution:
-                    aircraft_distribution[aircraft_type] = 0
-                aircraft_distribution[aircraft_type] += 1
-        else:
-            total_workflows = 0
-            completed_workflows = 0
-            in_progress = 0
-            workflow_completion_rate = 0
-            
-            # Get aircraft distribution from parts
-            aircraft_distribution = {}
-            for aircraft_type, name in Aircraft.AIRCRAFT_TYPES:
-                count = team_parts.filter(aircraft_type=aircraft_type).count()
-                if count > 0:
-                    aircraft_distribution[name] = count
-        
-        team_stats.append({
-            'team': team,
-            'total_parts': total_parts,
-            'completed_parts': completed_parts,
-            'in_production': in_production,
-            'quality_passed': quality_passed,
-            'completion_rate': round(completion_rate, 1),
-            'quality_rate': round(quality_rate, 1),
-            'total_workflows': total_workflows,
-            'completed_workflows': completed_workflows,
-            'in_progress': in_progress,
-            'workflow_completion_rate': round(workflow_completion_rate, 1),
-            'aircraft_distribution': aircraft_distribution
-        })
+    page = KeysetPaginator(
+        quality_steps, QUALITY_CHECK_ORDERINGS[ordering], QUALITY_CHECKS_PAGE_SIZE
+    ).page(request.GET.get('cursor'))
     
+    context = quality_checks_context(request, page, stats, ordering, load_reference_data())
+    return render(request, 'assembly/quality_checks.html', context)
+
+async def quality_checks_async(request):
+    """
+    quality_checks for ASGI: the page and the rollup queries of the
+    summary are fetched concurrently instead of one after another
+    """
+    user = await get_dashboard_user(request)
+    if user is None:
+        return redirect_to_login(request.get_full_path())
+    if not user.profile.team or user.profile.team.team_type != 'assembly':
+        messages.error(request, "Only assembly team members can access quality checks")
+        return redirect('home')
+
+    quality_steps, stats_range, errors = filter_quality_checks(request)
+    for error in errors:
+        messages.error(request, error)
+    ordering = get_quality_check_ordering(request)
+    paginator = KeysetPaginator(
+        quality_steps, QUALITY_CHECK_ORDERINGS[ordering], QUALITY_CHECKS_PAGE_SIZE
+    )
+
+    # Building the rollup queries reads the refresh watermark
+    stats_queries = await sync_to_async(quality_check_stats_queries)(stats_range)
+    results = await run_concurrently({
+        'page': lambda: paginator.page(request.GET.get('cursor')),
+        'reference': load_reference_data,
+        **{index: query for index, query in enumerate(stats_queries)}
+    })
+    stats = summarize_quality_check_stats([results[index] for index in range(len(stats_queries))])
+
+    context = quality_checks_context(request, results['page'], stats, ordering, results['reference'])
+    return await sync_to_async(render)(request, 'assembly/quality_checks.html', context)
+
+def parse_date_range(request):
+    """
+    Read the date_from / date_to query parameters as datetimes. Returns
+    (date_from, date_to, errors); invalid values are dropped and reported.
+    """
+    dates = {}
+    errors = []
+    for param, label in (('date_from', 'başlangıç'), ('date_to', 'bitiş')):
+        value = request.GET.get(param)
+        dates[param] = None
+        if value:
+            try:
+                dates[param] = datetime.strptime(value, '%Y-%m-%d')
+            except ValueError:
+                errors.append(f'Geçersiz {label} tarihi formatı')
+    return dates['date_from'], dates['date_to'], errors
+
+@login_required
+def team_statistics(request):
+    """Display team statistics"""
+    date_from, date_to, errors = parse_date_range(request)
+    for error in errors:
+        messages.error(request, error)
+
     context = {
-        'team_stats': team_stats,
+        'team_stats': get_team_statistics(date_from, date_to),
         'date_from': date_from.strftime('%Y-%m-%d') if date_from else '',
         'date_to': date_to.strftime('%Y-%m-%d') if date_to else ''
     }
@@ -382,18 +555,97 @@ class AssemblyTeamRequired(permissions.BasePermission):
             request.user.profile.team.team_type == 'assembly'
         )
 
-class WorkflowStepViewSet(viewsets.ModelViewSet):
+def parse_field_list(value):
+    """Names of a comma separated query parameter, in order, without blanks"""
+    return [name.strip() for name in (value or '').split(',') if name.strip()]
+
+class ProjectionListMixin:
+    """
+    Serve GET list requests from values() rows with `list_serializer_class`
+    (a ProjectionListSerializer) while every other action keeps the model
+    serializer.
+
+    `?fields=` limits a response to the named fields and `?expand=` adds
+    relations that are left out by default. get_queryset() asks wants()
+    before joining, annotating or prefetching anything, so data nobody
+    asked for is not queried at all.
+    """
+    list_serializer_class = None
+
+    def get_response_serializer_class(self):
+        if self.action == 'list':
+            return self.list_serializer_class
+        return self.get_serializer_class()
+
+    def get_field_selection(self):
+        """(fields or None, expand) of the request, validated against the serializer"""
+        if not hasattr(self, '_field_selection'):
+            serializer_class = self.get_response_serializer_class()
+            params = self.request.query_params
+            fields = parse_field_list(params.get('fields')) if 'fields' in params else None
+            expand = parse_field_list(params.get('expand'))
+
+            expandable = serializer_class.expandable_field_names()
+            errors = {}
+            unknown = [
+                name for name in fields or ()
+                if name not in serializer_class.default_field_names() and name not in expandable
+            ]
+            if unknown:
+                errors['fields'] = f"Unknown fields: {', '.join(unknown)}"
+            unknown = [name for name in expand if name not in expandable]
+            if unknown:
+                errors['expand'] = f"Can not expand: {', '.join(unknown)}"
+            if errors:
+                raise serializers.ValidationError(errors)
+
+            # Naming an expandable field in ?fields= expands it as well
+            expand += [name for name in fields or () if name in expandable and name not in expand]
+            self._field_selection = (fields, expand)
+        return self._field_selection
+
+    def wants(self, *names):
+        """Whether the response includes any of the fields `names`"""
+        fields, expand = self.get_field_selection()
+        if fields is None:
+            fields = self.get_response_serializer_class().default_field_names()
+        return any(name in fields or name in expand for name in names)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if getattr(self, 'request', None) is not None:
+            context['fields'], context['expand'] = self.get_field_selection()
+        return context
+
+    def list(self, request, *args, **kwargs):
+        serializer_class = self.list_serializer_class
+        fields, expand = self.get_field_selection()
+        queryset = serializer_class.project(
+            self.filter_queryset(self.get_queryset()), fields, expand
+        )
+        context = self.get_serializer_context()
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            page = serializer_class.expand(page, expand)
+            return self.get_paginated_response(serializer_class(page, many=True, context=context).data)
+        rows = serializer_class.expand(queryset, expand)
+        return Response(serializer_class(rows, many=True, context=context).data)
+
+class WorkflowStepViewSet(ProjectionListMixin, viewsets.ModelViewSet):
     """
     API endpoint for managing workflow steps.
     """
     queryset = WorkflowStep.objects.all()
     serializer_class = WorkflowStepSerializer
+    list_serializer_class = WorkflowStepListSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = HybridPagination
     filterset_fields = ['status', 'step_type', 'assigned_team', 'assigned_user']
-    search_fields = ['notes']
+    search_fields = ['step_notes__body']
     ordering_fields = ['created_at', 'started_at', 'completed_at']
 
-    def get_queryset(self):
+    def get_visible_steps(self):
         """Filter steps based on user's team"""
         user = self.request.user
         if not hasattr(user, 'profile') or not user.profile.team:
@@ -406,19 +658,73 @@ class WorkflowStepViewSet(viewsets.ModelViewSet):
         # Other teams can only see their assigned steps
         return WorkflowStep.objects.filter(assigned_team=user.profile.team)
 
+    def get_queryset(self):
+        queryset = self.get_visible_steps()
+        if self.wants('can_start'):
+            queryset = queryset.with_previous_status()
+        if self.wants('note_count', 'latest_note', 'latest_note_at'):
+            queryset = queryset.with_note_summary()
+        if self.action != 'list':
+            if self.wants('assigned_team_name'):
+                queryset = queryset.select_related('assigned_team')
+            if self.wants('assigned_user_name'):
+                queryset = queryset.select_related('assigned_user')
+            if self.wants('notes'):
+                queryset = queryset.prefetch_related(
+                    Prefetch('step_notes', queryset=WorkflowStepNote.objects.select_related('author'))
+                )
+        return queryset
+
+    @action(detail=False, methods=['post'])
+    def bulk_transition(self, request):
+        """
+        Start or complete many workflow steps in one request.
+        Invalid items are reported per item and do not abort the batch.
+        """
+        serializer = BulkTransitionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        results = bulk_transition(
+            serializer.validated_data['items'],
+            request.user,
+            self.get_visible_steps()
+        )
+
+        changed_ids = {result['id'] for result in results if 'error' not in result}
+        steps = {
+            step.id: step
+            for step in self.get_queryset().filter(id__in=changed_ids).select_related(
+                'assigned_team', 'assigned_user'
+            )
+        }
+        for result in results:
+            if 'error' not in result:
+                result['step'] = self.get_serializer(steps[result['id']]).data
+
+        return Response({
+            'applied': len([result for result in results if 'error' not in result]),
+            'failed': len([result for result in results if 'error' in result]),
+            'results': results
+        })
+
     @action(detail=True, methods=['post'])
     def start(self, request, pk=None):
         """Start a workflow step"""
         step = self.get_object()
         
         try:
-            step.start(request.user)
+            step.start(request.user, expected_version=request.data.get('version'))
             return Response(self.get_serializer(step).data)
         except ValidationError as e:
             return Response(
                 {'error': str(e)},
                 status=status.HTTP_400_BAD_REQUEST
             )
+        except StepTransitionConflict as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_409_CONFLICT
+            )
 
     @action(detail=True, methods=['post'])
     def complete(self, request, pk=None):
@@ -427,13 +733,22 @@ class WorkflowStepViewSet(viewsets.ModelViewSet):
         success = request.data.get('success', True)
         
         try:
-            step.complete(success=success)
+            step.complete(
+                success=success,
+                expected_version=request.data.get('version'),
+                user=request.user
+            )
             return Response(self.get_serializer(step).data)
         except ValidationError as e:
             return Response(
                 {'error': str(e)},
                 status=status.HTTP_400_BAD_REQUEST
             )
+        except StepTransitionConflict as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_409_CONFLICT
+            )
 
     @action(detail=True, methods=['post'])
     def add_note(self, request, pk=None):
@@ -447,85 +762,142 @@ class WorkflowStepViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
             
-        step.notes = f"{step.notes}\n{timezone.now().strftime('%Y-%m-%d %H:%M:%S')}: {note}".strip()
-        step.save()
+        step.add_note(note, author=request.user)
         
-        return Response(self.get_serializer(step).data)
+        return Response(self.get_serializer(self.get_queryset().get(pk=step.pk)).data)
 
-class AssembledAircraftViewSet(viewsets.ModelViewSet):
+    @action(detail=True, methods=['get', 'post'])
+    def notes(self, request, pk=None):
+        """List the notes of a workflow step, newest first, or append one"""
+        step = self.get_object()
+
+        if request.method == 'POST':
+            serializer = WorkflowStepNoteSerializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            note = step.add_note(serializer.validated_data['body'], author=request.user)
+            return Response(WorkflowStepNoteSerializer(note).data, status=status.HTTP_201_CREATED)
+
+        notes = step.step_notes.select_related('author').order_by('-created_at', '-id')
+        page = self.paginate_queryset(notes)
+        serializer = WorkflowStepNoteSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+class AssembledAircraftViewSet(ProjectionListMixin, viewsets.ModelViewSet):
     """
     API endpoint for managing assembled aircraft.
     """
     queryset = AssembledAircraft.objects.all()
     serializer_class = AssembledAircraftSerializer
+    list_serializer_class = AssembledAircraftListSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = HybridPagination
     filterset_fields = ['status', 'assembly_team']
     search_fields = ['aircraft_type__name']
     ordering_fields = ['created_at', 'updated_at']
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            # Relations of list rows are loaded per page by the list serializer
+            return queryset
+        if self.wants('workflow_steps'):
+            queryset = queryset.prefetch_related(Prefetch(
+                'workflow_steps',
+                queryset=WorkflowStep.objects.with_previous_status().with_note_summary().select_related(
+                    'assigned_team', 'assigned_user'
+                )
+            ))
+        if self.wants('parts'):
+            queryset = queryset.prefetch_related(Prefetch('parts', queryset=Part.objects.only('id')))
+        return queryset
+
+    def perform_update(self, serializer):
+        aircraft = serializer.save()
+        if {'due_date', 'priority'} & set(serializer.validated_data):
+            queue_replan([aircraft.id])
+
     @transaction.atomic
     def perform_create(self, serializer):
         """Create assembled aircraft and initialize workflow steps"""
         aircraft = serializer.save()
         
         # Create workflow steps in sequence
-        steps = [
-            ('WING_PRODUCTION', 'wing'),
-            ('FUSELAGE_PRODUCTION', 'fuselage'),
-            ('TAIL_PRODUCTION', 'tail'),
-            ('AVIONICS_PRODUCTION', 'avionics'),
-            ('QUALITY_CHECK', 'assembly'),
-            ('ASSEMBLY', 'assembly'),
-            ('TESTING', 'assembly'),
-            ('FINAL_CHECK', 'assembly'),
-        ]
-        
-        for step_type, team_type in steps:
-            team = Team.objects.filter(team_type=team_type).first()
-            if team:
-                WorkflowStep.objects.create(
-                    assembled_aircraft=aircraft,
-                    step_type=step_type,
-                    assigned_team=team
-                )
+        teams = reference_data.teams_by_type()
+        plan = workflow_plans.plan_for(aircraft.aircraft_type)
+        steps = WorkflowStep.objects.bulk_create([
+            WorkflowStep(
+                assembled_aircraft=aircraft,
+                step_type=step_type,
+                sequence=sequence,
+                assigned_team=teams[team_type]
+            )
+            for sequence, (step_type, team_type) in enumerate(plan, start=1)
+            if team_type in teams
+        ])
+        WorkflowEvent.objects.bulk_create([
+            WorkflowEvent.for_step(step, WorkflowEvent.EventType.CREATED, self.request.user, step.created_at)
+            for step in steps
+        ])
+        aircraft.total_steps = len(steps)
+        aircraft.current_step_type = steps[0].step_type if steps else ''
+        aircraft.save(update_fields=['total_steps', 'current_step_type', 'updated_at'])
+
+        queue_replan([aircraft.id])
+
+        # Reserve whatever required parts not linked by the request are in
+        # stock, finalize_assembly allocates the rest
+        allocate_parts(aircraft, missing_part_counts(aircraft), user=self.request.user, strict=False)
+
+    @action(detail=False, methods=['post'])
+    def production_order(self, request):
+        """Create a production order of several assembled aircraft at once"""
+        if not request.user.profile.team or request.user.profile.team.team_type != 'assembly':
+            return Response(
+                {'error': 'Only assembly team can create production orders'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        serializer = ProductionOrderSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            aircrafts = create_production_order(
+                assembly_team=request.user.profile.team,
+                created_by=request.user,
+                **serializer.validated_data
+            )
+        except ValidationError as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response(
+            {
+                'count': len(aircrafts),
+                'ids': [aircraft.id for aircraft in aircrafts]
+            },
+            status=status.HTTP_201_CREATED
+        )
 
     @action(detail=True)
     def workflow_progress(self, request, pk=None):
-        """Get workflow progress for an aircraft"""
-        aircraft = self.get_object()
-        steps = aircraft.workflow_steps.all()
-        
-        total_steps = steps.count()
-        completed_steps = steps.filter(status=WorkflowStep.Status.COMPLETED).count()
-        in_progress_steps = steps.filter(status=WorkflowStep.Status.IN_PROGRESS).count()
-        failed_steps = steps.filter(status=WorkflowStep.Status.FAILED).count()
-        
-        # Get current active steps
-        active_steps = steps.filter(
-            Q(status=WorkflowStep.Status.IN_PROGRESS) |
-            Q(status=WorkflowStep.Status.PENDING)
-        ).order_by('created_at')
-        
-        # Find next available step
-        next_step = None
-        for step in active_steps:
-            if step.can_start():
-                next_step = step
-                break
-        
-        return Response({
-            'total_steps': total_steps,
-            'completed_steps': completed_steps,
-            'in_progress_steps': in_progress_steps,
-            'failed_steps': failed_steps,
-            'completion_percentage': (completed_steps / total_steps * 100) if total_steps > 0 else 0,
-            'current_steps': WorkflowStepSerializer(
-                active_steps,
-                many=True
-            ).data,
-            'next_step': WorkflowStepSerializer(next_step).data if next_step else None,
-            'status': aircraft.status
-        })
+        """
+        Get workflow progress for an aircraft.
+        Supports conditional GET, polling clients get 304 while nothing changed.
+        The version is read from the database on every request: the response
+        cache may serve a stale entry while it rebuilds, which would answer
+        304 for a changed aircraft.
+        """
+        aircraft_status, last_modified = get_progress_version(pk)
+        etag = get_progress_etag(pk, last_modified)
+        if is_not_modified(request, etag, last_modified):
+            return set_progress_headers(
+                Response(status=status.HTTP_304_NOT_MODIFIED), etag, last_modified
+            )
+
+        progress = get_progress(pk, aircraft_status, last_modified)
+        return set_progress_headers(Response(progress), etag, last_modified)
 
     @action(detail=True, methods=['post'])
     def finalize_assembly(self, request, pk=None):
@@ -549,12 +921,19 @@ class AssembledAircraftViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
             
-        # Update aircraft status
-        aircraft.status = AssembledAircraft.Status.COMPLETED
-        aircraft.save()
-        
-        # Mark all parts as used
-        aircraft.parts.all().update(is_used=True)
+        try:
+            with transaction.atomic():
+                # Link the reserved parts and mark all parts as used
+                consume_reservations(aircraft, request.user)
+                
+                # Update aircraft status
+                aircraft.status = AssembledAircraft.Status.COMPLETED
+                aircraft.save(update_fields=['status', 'updated_at'])
+        except ValidationError as e:
+            return Response(
+                {'error': ' '.join(e.messages)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
         return Response(self.get_serializer(aircraft).data)
 
@@ -568,58 +947,76 @@ class AssembledAircraftViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        parts = {}
-        for part_type in Part.PartType.values:
-            parts[part_type] = Part.objects.filter(
-                aircraft_type=aircraft_type,
-                part_type=part_type,
-                is_used=False
-            ).count()
+        def build():
+            available = available_counts(aircraft_type)
+            return {
+                part_type: available.get(part_type, 0)
+                for part_type in Part.PartType.values
+            }
 
-        return Response(parts)
+        return Response(response_cache.get_or_build(
+            'aircraft_available_parts',
+            build,
+            tags=('parts',),
+            scope=team_scope(request.user),
+            params={'aircraft_type': aircraft_type}
+        ))
 
     @action(detail=False, methods=['get'])
     def assembly_statistics(self, request):
         """Get assembly statistics"""
-        stats = {
-            'total_assembled': self.get_queryset().count(),
-            'by_status': self.get_queryset().values(
-                'status'
-            ).annotate(count=Count('id')),
-            'by_aircraft_type': self.get_queryset().values(
-                'aircraft_type__aircraft_type'
-            ).annotate(count=Count('id')),
-            'recent_assemblies': self.get_queryset().order_by(
-                '-created_at'
-            )[:5].values(
-                'id',
-                'aircraft_type__aircraft_type',
-                'status',
-                'created_at'
-            )
-        }
-        
-        return Response(stats)
+        def build():
+            aircraft = AssembledAircraft.objects.all()
+            return {
+                'total_assembled': aircraft.count(),
+                'by_status': list(aircraft.values(
+                    'status'
+                ).annotate(count=Count('id')).order_by('status')),
+                'by_aircraft_type': list(aircraft.values(
+                    'aircraft_type'
+                ).annotate(count=Count('id')).order_by('aircraft_type')),
+                'recent_assemblies': list(aircraft.order_by(
+                    '-created_at'
+                )[:5].values(
+                    'id',
+                    'aircraft_type',
+                    'status',
+                    'created_at'
+                ))
+            }
+
+        return Response(response_cache.get_or_build(
+            'assembly_statistics',
+            build,
+            tags=('aircraft',),
+            scope=team_scope(request.user)
+        ))
 
     @action(detail=True)
     def part_details(self, request, pk=None):
         """Get detailed information about parts used in an assembled aircraft"""
-        aircraft = self.get_object()
-        parts = aircraft.parts.all()
-        
-        details = {}
-        for part in parts:
-            details[part.get_part_type_display()] = {
-                'id': part.id,
-                'serial_number': part.serial_number,
-                'part_type': part.get_part_type_display(),
-                'produced_by': part.team.name,
-                'production_date': part.created_at,
-                'quality_check_passed': part.quality_check_passed,
-                'quality_notes': part.quality_notes
-            }
-        
-        return Response(details)
+        def build():
+            aircraft = self.get_object()
+            details = {}
+            for part in aircraft.parts.select_related('team'):
+                details[part.get_part_type_display()] = {
+                    'id': part.id,
+                    'serial_number': part.serial_number,
+                    'part_type': part.get_part_type_display(),
+                    'produced_by': part.team.name,
+                    'production_date': part.created_at,
+                    'quality_check_passed': part.quality_check_passed,
+                    'quality_notes': part.quality_notes
+                }
+            return details
+
+        return Response(response_cache.get_or_build(
+            'part_details',
+            build,
+            tags=(aircraft_tag(pk), 'parts'),
+            scope=team_scope(request.user),
+            params={'pk': pk}
+        ))
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -628,14 +1025,28 @@ def available_parts(request):
     aircraft_type = request.GET.get('aircraft_type')
     if not aircraft_type:
         return Response({'error': 'Aircraft type is required'}, status=400)
-        
-    # Get unused parts for the specified aircraft type
-    parts = Part.objects.filter(
-        aircraft_type=aircraft_type,
-        is_used=False,
-        status='completed',
-        quality_check_status='passed'
-    ).select_related('team')
+
+    return Response(response_cache.get_or_build(
+        'available_parts',
+        lambda: get_available_parts(aircraft_type),
+        tags=('parts',),
+        scope=team_scope(request.user),
+        params={'aircraft_type': aircraft_type}
+    ))
+
+def get_available_parts(aircraft_type):
+    """Newest unreserved parts of every part type in stock, grouped by type"""
+    # Part types with unreserved stock, from the inventory ledger
+    available = available_counts(aircraft_type)
+    if not available:
+        return {}
+    
+    # Newest unreserved parts of each available type
+    parts = unreserved_parts(aircraft_type).filter(
+        part_type__in=available
+    ).annotate(
+        position=Window(RowNumber(), partition_by=F('part_type'), order_by=F('created_at').desc())
+    ).filter(position__lte=AVAILABLE_PARTS_LIMIT).select_related('team').order_by('part_type', 'position')
     
     # Group parts by type
     parts_by_type = {}
@@ -652,4 +1063,271 @@ def available_parts(request):
             'created_at': part.created_at.strftime('%Y-%m-%d %H:%M')
         })
     
-    return Response(parts_by_type)
+    return parts_by_type
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def team_statistics_api(request):
+    """Team statistics as JSON, filtered by the same date range as the statistics page"""
+    date_from, date_to, errors = parse_date_range(request)
+    if errors:
+        return Response({'error': ' '.join(errors)}, status=400)
+
+    team_stats = get_team_statistics(date_from, date_to)
+    for stats in team_stats:
+        team = stats['team']
+        stats['team'] = {'id': team.id, 'name': team.name, 'team_type': team.team_type}
+    return Response(team_stats)
+
+def parse_analytics_window(request, default_days):
+    """
+    The date_from / date_to range of an analytics report as aware
+    datetimes, date_to exclusive: the day after the requested date_to, or
+    tomorrow. Returns (date_from, date_to, errors).
+    """
+    date_from, date_to, errors = parse_date_range(request)
+    date_to = (
+        timezone.make_aware(date_to) if date_to
+        else timezone.make_aware(datetime.combine(timezone.localdate(), datetime.min.time()))
+    ) + timedelta(days=1)
+    date_from = (
+        timezone.make_aware(date_from) if date_from
+        else date_to - timedelta(days=default_days)
+    )
+    return date_from, date_to, errors
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def cycle_time_analytics(request):
+    """
+    p50/p90/p99 lead and cycle times per step type, team and aircraft type,
+    cycle time histograms and weekly throughput of the completed steps.
+    Defaults to the last CYCLE_TIME_DEFAULT_DAYS days, date_to is inclusive.
+    """
+    date_from, date_to, errors = parse_analytics_window(request, CYCLE_TIME_DEFAULT_DAYS)
+    try:
+        bins = int(request.GET.get('bins', 20))
+        if not 1 <= bins <= MAX_HISTOGRAM_BINS:
+            raise ValueError
+    except ValueError:
+        errors.append(f'bins must be between 1 and {MAX_HISTOGRAM_BINS}')
+    if errors:
+        return Response({'error': ' '.join(errors)}, status=400)
+
+    return Response(response_cache.get_or_build(
+        'cycle_time_analytics',
+        lambda: get_cycle_time_analytics(date_from, date_to, bins),
+        params={'from': date_from, 'to': date_to, 'bins': bins},
+        timeout=CYCLE_TIME_CACHE_TIMEOUT
+    ))
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def line_simulation(request):
+    """
+    Monte Carlo forecast of throughput, WIP and the bottleneck team for a
+    backlog of `backlog` aircraft on the current roster, see
+    simulation.py. Team sizes can be tried out with
+    ?capacity=wing:4,assembly:6 before committing delivery dates.
+    """
+    errors = []
+    try:
+        backlog = int(request.GET.get('backlog', ''))
+        replications = int(request.GET.get('replications', 200))
+        release_interval = float(request.GET.get('release_interval', 0))
+        seed = int(request.GET['seed']) if request.GET.get('seed') else None
+    except ValueError:
+        return Response(
+            {'error': 'backlog, replications and seed must be integers, release_interval a number'},
+            status=400
+        )
+    if not 1 <= backlog <= MAX_SIMULATION_BACKLOG:
+        errors.append(f'backlog must be between 1 and {MAX_SIMULATION_BACKLOG}')
+    if not 1 <= replications <= MAX_SIMULATION_REPLICATIONS:
+        errors.append(f'replications must be between 1 and {MAX_SIMULATION_REPLICATIONS}')
+    if not errors and backlog * replications > MAX_SIMULATED_AIRCRAFT:
+        errors.append(
+            f'backlog times replications must not exceed {MAX_SIMULATED_AIRCRAFT}, '
+            'use the simulate_line command for larger runs'
+        )
+    if not 0 <= release_interval < float('inf'):
+        errors.append('release_interval must be a non negative number of hours')
+    try:
+        capacity = parse_capacity(
+            value for values in request.GET.getlist('capacity') for value in values.split(',') if value
+        )
+    except ValueError as e:
+        errors.append(str(e))
+        capacity = {}
+    if errors:
+        return Response({'error': ' '.join(errors)}, status=400)
+
+    aircraft_type = request.GET.get('aircraft_type', '')
+
+    def simulate():
+        model = build_line_model(aircraft_type)
+        unknown = set(capacity) - set(model.capacity)
+        if unknown:
+            raise serializers.ValidationError(
+                {'capacity': f"Team types not in the workflow: {', '.join(sorted(unknown))}"}
+            )
+        return run_monte_carlo(
+            model.with_capacity(capacity), backlog, replications,
+            release_interval=release_interval, seed=seed
+        )
+
+    return Response(response_cache.get_or_build(
+        'line_simulation',
+        simulate,
+        params={
+            'aircraft_type': aircraft_type, 'backlog': backlog, 'replications': replications,
+            'release_interval': release_interval, 'capacity': capacity, 'seed': seed,
+        },
+        timeout=SIMULATION_CACHE_TIMEOUT
+    ))
+
+@api_view(['GET', 'POST'])
+@permission_classes([IsAuthenticated])
+def production_schedule(request):
+    """
+    GET: the planned start and end of the open steps of a team (?team=,
+    the user's own by default), in planned order. Assembly team members
+    may read any team's plan, other users only their own.
+    POST (staff): re-plan every open step, optionally switching the
+    objective (MAKESPAN or TARDINESS).
+    """
+    if request.method == 'POST':
+        if not request.user.is_staff:
+            return Response({'error': 'Only staff can re-plan the schedule'}, status=403)
+        objective = request.data.get('objective')
+        if objective and objective not in ProductionSchedule.Objective.values:
+            return Response(
+                {'error': f"objective must be one of {', '.join(ProductionSchedule.Objective.values)}"},
+                status=400
+            )
+        schedule = build_schedule(objective)
+        return Response(ProductionScheduleSerializer(schedule).data)
+
+    team = request.user.profile.team if hasattr(request.user, 'profile') else None
+    try:
+        team_id = int(request.GET['team']) if request.GET.get('team') else getattr(team, 'id', None)
+    except ValueError:
+        return Response({'error': 'team must be an id'}, status=400)
+    if team_id is None:
+        return Response({'error': 'A team membership is required'}, status=403)
+    if team_id != getattr(team, 'id', None) and getattr(team, 'team_type', None) != 'assembly':
+        return Response({'error': 'Only your own team\'s schedule can be read'}, status=403)
+
+    schedule = ProductionSchedule.objects.first()
+    steps = ScheduledStepListSerializer.project(
+        ScheduledStep.objects.filter(team_id=team_id).order_by('planned_start', 'slot', 'id')
+    )
+    return Response({
+        'schedule': ProductionScheduleSerializer(schedule).data if schedule else None,
+        'team': team_id,
+        'steps': ScheduledStepListSerializer(steps, many=True).data,
+    })
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def step_time_analytics(request):
+    """
+    Queue wait versus work time per step type and team, read from the
+    workflow event log. Defaults to the last STEP_TIME_DEFAULT_DAYS days,
+    date_to is inclusive.
+    """
+    date_from, date_to, errors = parse_analytics_window(request, STEP_TIME_DEFAULT_DAYS)
+    try:
+        team_id = int(request.GET['team']) if request.GET.get('team') else None
+    except ValueError:
+        errors.append('team must be an id')
+    if errors:
+        return Response({'error': ' '.join(errors)}, status=400)
+
+    step_type = request.GET.get('step_type') or None
+    return Response(response_cache.get_or_build(
+        'step_time_analytics',
+        lambda: get_step_time_analytics(date_from, date_to, step_type, team_id),
+        tags=('steps',),
+        params={'from': date_from, 'to': date_to, 'step_type': step_type, 'team': team_id}
+    ))
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAdminUser])
+def response_cache_stats(request):
+    """Hit, miss, stale hit and rebuild counters of the cached API responses"""
+    return Response(response_cache.stats(CACHED_RESPONSES))
+
+def resolve_event_stream(request):
+    """
+    (channel, team filter) of an event stream request, or an error
+    response. Assembly team members may follow any aircraft or team, other
+    users only their own team, and only their team's steps of an aircraft.
+    """
+    user = request.user
+    team = user.profile.team if user.is_authenticated and hasattr(user, 'profile') else None
+    if team is None:
+        return None, None, HttpResponseForbidden('A team membership is required')
+    is_assembly = team.team_type == 'assembly'
+
+    try:
+        aircraft_id = int(request.GET['aircraft']) if 'aircraft' in request.GET else None
+        team_id = int(request.GET['team']) if 'team' in request.GET else None
+    except ValueError:
+        return None, None, HttpResponseBadRequest('aircraft and team must be ids')
+
+    if aircraft_id is not None:
+        return aircraft_channel(aircraft_id), None if is_assembly else team.id, None
+    team_id = team_id or team.id
+    if team_id != team.id and not is_assembly:
+        return None, None, HttpResponseForbidden('Only your own team can be followed')
+    return team_channel(team_id), None, None
+
+async def workflow_events(request):
+    """
+    Server-Sent Events stream of committed workflow step transitions for
+    one aircraft (?aircraft=<id>) or team (?team=<id>, default: your own).
+
+    The view is async: under ASGI an idle subscriber holds a queue in the
+    event loop, not a worker thread. Events carry increasing ids; after an
+    overflow a `resync` event tells the client to reload its state.
+
+    ASGI only: a WSGI server buffers the whole stream until it closes, so
+    there the view answers 503 and EventSource clients give up. Streams
+    end within a heartbeat of their client disconnecting, and after
+    EVENT_STREAM_MAX_AGE at the latest.
+    """
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse('Event streams require an ASGI server', status=503)
+
+    channel, team_filter, error = await sync_to_async(resolve_event_stream)(request)
+    if error is not None:
+        return error
+
+    # Set by the ASGI application's watch_disconnects() middleware
+    disconnected = request.scope.get(DISCONNECTED_SCOPE_KEY)
+
+    async def stream():
+        loop = asyncio.get_running_loop()
+        closes_at = loop.time() + EVENT_STREAM_MAX_AGE
+        with get_broker().subscribe([channel]) as subscription:
+            yield 'retry: 5000\n\n'
+            while loop.time() < closes_at and not (disconnected and disconnected.is_set()):
+                try:
+                    event = await subscription.get(EVENT_STREAM_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    yield ': keep-alive\n\n'
+                    continue
+                if subscription.overflowed:
+                    subscription.overflowed = False
+                    yield 'event: resync\ndata: {}\n\n'
+                if team_filter is not None and event['team'] != team_filter:
+                    continue
+                yield f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Keep proxies such as nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
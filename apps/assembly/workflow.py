@@ -0,0 +1,74 @@
+from types import MappingProxyType
+from aircraft_production.registry import VersionedRegistry
+
+# Built-in workflow used when no template exists in the database
+DEFAULT_WORKFLOW_STEPS = (
+    ('WING_PRODUCTION', 'wing'),
+    ('FUSELAGE_PRODUCTION', 'fuselage'),
+    ('TAIL_PRODUCTION', 'tail'),
+    ('AVIONICS_PRODUCTION', 'avionics'),
+    ('QUALITY_CHECK', 'assembly'),
+    ('ASSEMBLY', 'assembly'),
+    ('TESTING', 'assembly'),
+    ('FINAL_CHECK', 'assembly'),
+)
+
+
+class WorkflowPlan:
+    """
+    Immutable, precompiled step sequence of a workflow template.
+
+    `steps` holds (step_type, team_type) pairs in order. Created steps get
+    their sequence from it, predecessors are then found by sequence.
+    """
+    __slots__ = ('name', 'steps', 'step_types')
+
+    def __init__(self, name, steps):
+        steps = tuple((step_type, team_type) for step_type, team_type in steps)
+        step_types = tuple(step_type for step_type, _ in steps)
+        object.__setattr__(self, 'name', name)
+        object.__setattr__(self, 'steps', steps)
+        object.__setattr__(self, 'step_types', step_types)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("WorkflowPlan is immutable")
+
+    def __len__(self):
+        return len(self.steps)
+
+    def __iter__(self):
+        return iter(self.steps)
+
+    def __repr__(self):
+        return f"<WorkflowPlan {self.name}: {' > '.join(self.step_types)}>"
+
+
+DEFAULT_PLAN = WorkflowPlan('Default', DEFAULT_WORKFLOW_STEPS)
+
+
+class WorkflowPlanRegistry(VersionedRegistry):
+    """Compiled workflow plans keyed by aircraft type, reloaded when a template changes"""
+    generation_key = 'workflow_plans:generation'
+
+    def _load(self):
+        from .models import WorkflowTemplate
+
+        plans = {}
+        for template in WorkflowTemplate.objects.prefetch_related('steps'):
+            plans[template.aircraft_type] = WorkflowPlan(
+                template.name,
+                [(step.step_type, step.team_type) for step in template.steps.all()]
+            )
+        return MappingProxyType(plans)
+
+    def plan_for(self, aircraft_type=''):
+        """
+        Plan for the aircraft type, falling back to the default template and
+        then to the built-in workflow.
+        """
+        plans = self._get()
+        plan = plans.get(aircraft_type) if aircraft_type else None
+        return plan or plans.get('') or DEFAULT_PLAN
+
+
+workflow_plans = WorkflowPlanRegistry()
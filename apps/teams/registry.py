@@ -0,0 +1,50 @@
+from aircraft_production.registry import VersionedRegistry
+
+
+class ReferenceDataRegistry(VersionedRegistry):
+    """
+    In-process cache of rarely changing reference data: teams, the first team
+    of each team type and aircraft types.
+    """
+    generation_key = 'reference_data:generation'
+
+    def _load(self):
+        from apps.parts.models import Aircraft
+        from .models import Team
+
+        teams = tuple(Team.objects.all())
+        teams_by_type = {}
+        for team in teams:
+            teams_by_type.setdefault(team.team_type, team)
+        aircraft_types = tuple(Aircraft.objects.all())
+
+        return {
+            'teams': teams,
+            'teams_by_id': {team.id: team for team in teams},
+            'teams_by_type': teams_by_type,
+            'aircraft_types': aircraft_types,
+            'aircraft_types_by_id': {aircraft.id: aircraft for aircraft in aircraft_types},
+        }
+
+    def teams(self):
+        """All teams ordered by name"""
+        return self._get()['teams']
+
+    def team_by_id(self, team_id):
+        return self._get()['teams_by_id'].get(team_id)
+
+    def team_by_type(self, team_type):
+        """First team (by name) of the given type, like filter(team_type=...).first()"""
+        return self._get()['teams_by_type'].get(team_type)
+
+    def teams_by_type(self):
+        return self._get()['teams_by_type']
+
+    def aircraft_types(self):
+        return self._get()['aircraft_types']
+
+    def aircraft_type_by_id(self, aircraft_id):
+        return self._get()['aircraft_types_by_id'].get(aircraft_id)
+
+
+reference_data = ReferenceDataRegistry()
@@ -1,8 +1,30 @@
 from rest_framework import serializers
 from .models import Team
+from .registry import reference_data
 
 class TeamSerializer(serializers.ModelSerializer):
     class Meta:
         model = Team
         fields = ['id', 'name', 'team_type', 'description', 'created_at', 'updated_at']
         read_only_fields = ['created_at', 'updated_at']
+
+class ReferenceDataRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Primary key field resolved from the in-process reference-data registry
+    instead of running a query for every value. `lookup` names the registry
+    method used to find an instance by id, e.g. 'team_by_id'.
+    """
+    def __init__(self, lookup, **kwargs):
+        self.lookup = lookup
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            instance = getattr(reference_data, self.lookup)(int(data))
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        if instance is None:
+            self.fail('does_not_exist', pk_value=data)
+        return instance
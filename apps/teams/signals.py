@@ -0,0 +1,14 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Team
+from .registry import reference_data
+
+
+@receiver(post_save, sender=Team)
+@receiver(post_delete, sender=Team)
+@receiver(post_save, sender='parts.Aircraft')
+@receiver(post_delete, sender='parts.Aircraft')
+def invalidate_reference_data(sender, **kwargs):
+    """Reload reference data in every worker once the change is committed"""
+    transaction.on_commit(reference_data.invalidate)
@@ -0,0 +1,96 @@
+import importlib
+import logging
+import pytest
+from django.conf import settings as django_settings
+from django.core.cache import caches
+from django.urls import clear_url_caches
+from apps.accounts.models import Profile, User
+from apps.teams.models import Team
+from apps.teams.registry import reference_data
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """
+    Start every test with empty caches and reference data. The registry
+    is invalidated on commit, which never happens inside a test transaction.
+    """
+    for cache in caches.all():
+        cache.clear()
+    reference_data.invalidate()
+    yield
+    reference_data.invalidate()
+
+
+def create_teams(suffix=''):
+    """One team of every team type"""
+    teams = {
+        team_type: Team.objects.create(name=f'{label}{suffix}', team_type=team_type)
+        for team_type, label in Team.TEAM_TYPES
+    }
+    reference_data.invalidate()
+    return teams
+
+
+def create_member(team, username):
+    user = User.objects.create_user(
+        username=username, email=f'{username}@example.com', password='password'
+    )
+    Profile.objects.create(user=user, team=team)
+    return user
+
+
+@pytest.fixture
+def teams(db):
+    return create_teams()
+
+
+@pytest.fixture
+def assembly_user(teams):
+    return create_member(teams['assembly'], 'assembler')
+
+
+class QueryLog(logging.Handler):
+    """Collects the SQL django.db.backends logs, from any thread"""
+
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.queries = []
+
+    def emit(self, record):
+        if hasattr(record, 'sql'):
+            self.queries.append(record.sql)
+
+
+@pytest.fixture
+def query_log(settings):
+    """
+    SQL of every query run while the test runs, on any connection. The
+    async views run queries on pool threads, whose connections
+    CaptureQueriesContext does not see.
+    """
+    settings.DEBUG = True
+    logger = logging.getLogger('django.db.backends')
+    handler, level = QueryLog(), logger.level
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(handler)
+    yield handler.queries
+    logger.removeHandler(handler)
+    logger.setLevel(level)
+
+
+def route_dashboards(async_views):
+    """Rebuild the URLconf with the sync or async dashboard views"""
+    django_settings.ASYNC_DASHBOARDS = async_views
+    importlib.reload(importlib.import_module('apps.assembly.urls'))
+    importlib.reload(importlib.import_module(django_settings.ROOT_URLCONF))
+    clear_url_caches()
+
+
+@pytest.fixture(params=[False, True], ids=['wsgi', 'asgi'])
+def dashboard_deployment(request):
+    """Serves the dashboard URLs like a WSGI, then like an ASGI deployment"""
+    served = django_settings.ASYNC_DASHBOARDS
+    route_dashboards(request.param)
+    yield request.param
+    route_dashboards(served)
@@ -0,0 +1,147 @@
+"""
+Seeds a realistic volume of assembly data once per module, requests the
+main pages and API endpoints, EXPLAINs every query they send and fails on
+any sequential scan of a large table. PostgreSQL only.
+
+The dashboards are requested with the WSGI routing: the async views send
+the same queries, built by the same helpers, but on pool threads that
+cannot see the uncommitted seeded rows.
+"""
+import json
+import pytest
+from django.db import connection, transaction
+from django.db.models import F
+from django.db.models.functions import Mod
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from apps.assembly.models import AssembledAircraft, WorkflowStep
+from apps.assembly.production import MAX_ORDER_QUANTITY, create_production_order
+from .conftest import create_member, create_teams
+
+# Aircraft seeded, each with its parts and workflow steps
+SEEDED_AIRCRAFT = 2000
+LARGE_TABLES = (AssembledAircraft._meta.db_table, WorkflowStep._meta.db_table)
+
+# Label -> function of the seeded data returning (user, url, query parameters)
+REQUESTS = {
+    'workflow_list page': lambda seeded: (
+        seeded['assembler'], reverse('assembly:workflow_list'), {}),
+    'workflow_list by status': lambda seeded: (
+        seeded['assembler'], reverse('assembly:workflow_list'),
+        {'status': AssembledAircraft.Status.COMPLETED, 'ordering': 'status'}),
+    'workflow_list by team': lambda seeded: (
+        seeded['assembler'], reverse('assembly:workflow_list'), {'team': seeded['team'].id}),
+    'workflow_detail': lambda seeded: (
+        seeded['assembler'], reverse('assembly:workflow_detail', args=[seeded['aircraft'].pk]), {}),
+    'quality_checks page': lambda seeded: (
+        seeded['assembler'], reverse('assembly:quality_checks'), {}),
+    'quality_checks by status': lambda seeded: (
+        seeded['assembler'], reverse('assembly:quality_checks'), {'status': WorkflowStep.Status.FAILED}),
+    'workflow API cursor page': lambda seeded: (
+        seeded['assembler'], reverse('assembly:workflow-step-list'), {'cursor': ''}),
+    'active steps of a team': lambda seeded: (
+        seeded['wing_member'], reverse('assembly:workflow-step-list'),
+        {'cursor': '', 'status': WorkflowStep.Status.IN_PROGRESS}),
+    'aircraft API cursor page': lambda seeded: (
+        seeded['assembler'], reverse('assembly:assembled-aircraft-list'), {'cursor': ''}),
+    'aircraft API detail': lambda seeded: (
+        seeded['assembler'], reverse('assembly:assembled-aircraft-detail', args=[seeded['aircraft'].pk]), {}),
+    'workflow progress': lambda seeded: (
+        seeded['assembler'],
+        reverse('assembly:assembled-aircraft-workflow-progress', args=[seeded['aircraft'].pk]), {}),
+}
+
+
+def find_seq_scans(plan, tables):
+    """Relation names of the sequential scans on `tables` anywhere in a JSON plan"""
+    scans = []
+    if plan.get('Node Type') == 'Seq Scan' and plan.get('Relation Name') in tables:
+        scans.append(plan['Relation Name'])
+    for child in plan.get('Plans', []):
+        scans.extend(find_seq_scans(child, tables))
+    return scans
+
+
+def is_summary(plan):
+    """
+    Whether the plan aggregates a whole filtered set without a LIMIT, like
+    the listing summaries: reading every row is what they are for.
+    """
+    while plan['Node Type'] in ('Sort', 'Gather', 'Gather Merge'):
+        plan = plan['Plans'][0]
+    return plan['Node Type'] == 'Aggregate'
+
+
+def explain(sql):
+    """JSON plan of a captured query, its parameters are already inlined"""
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}')
+        plan = cursor.fetchone()[0]
+    plan = json.loads(plan) if isinstance(plan, str) else plan
+    return plan[0]['Plan']
+
+
+@pytest.fixture(scope='module')
+def seeded(django_db_setup, django_db_blocker):
+    """
+    An aircraft halfway through the seeded ones, the assembly team, one of
+    its members and a member of the wing team. The seeded data lives in a
+    transaction rolled back after the module.
+    """
+    with django_db_blocker.unblock():
+        if connection.vendor != 'postgresql':
+            pytest.skip('Query plans are only checked on PostgreSQL')
+        with transaction.atomic():
+            teams = create_teams()
+            user = create_member(teams['assembly'], 'planner')
+            wing_member = create_member(teams['wing'], 'wing_member')
+            aircraft = []
+            for offset in range(0, SEEDED_AIRCRAFT, MAX_ORDER_QUANTITY):
+                aircraft += create_production_order(
+                    aircraft_type='tb2',
+                    name='Plan Check',
+                    quantity=min(MAX_ORDER_QUANTITY, SEEDED_AIRCRAFT - offset),
+                    assembly_team=teams['assembly'],
+                    created_by=user
+                )
+
+            # Spread the aircraft over the workflow so only a fraction of
+            # the steps is still active, like in production
+            progress = Mod(F('assembled_aircraft_id'), 9)
+            WorkflowStep.objects.filter(sequence__lt=progress).update(status=WorkflowStep.Status.COMPLETED)
+            WorkflowStep.objects.filter(sequence=progress).update(status=WorkflowStep.Status.IN_PROGRESS)
+            with connection.cursor() as cursor:
+                for table in LARGE_TABLES:
+                    cursor.execute(f'ANALYZE {connection.ops.quote_name(table)}')
+
+            yield {
+                'aircraft': aircraft[len(aircraft) // 2],
+                'team': teams['assembly'],
+                'assembler': user,
+                'wing_member': wing_member,
+            }
+            transaction.set_rollback(True)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('label', REQUESTS)
+def test_no_sequential_scan_on_large_tables(client, seeded, label):
+    user, url, params = REQUESTS[label](seeded)
+    client.force_login(user)
+
+    with CaptureQueriesContext(connection) as context:
+        assert client.get(url, params).status_code == 200
+
+    scans = {}
+    for query in context.captured_queries:
+        sql = query['sql']
+        if not sql.lstrip().upper().startswith(('SELECT', 'WITH')):
+            continue
+        plan = explain(sql)
+        if not is_summary(plan):
+            tables = find_seq_scans(plan, LARGE_TABLES)
+            if tables:
+                scans[sql] = tables
+    assert not scans, f"{label} scans:\n" + '\n'.join(
+        f"{', '.join(sorted(set(tables)))}: {sql}" for sql, tables in scans.items()
+    )
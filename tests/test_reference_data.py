@@ -0,0 +1,49 @@
+import re
+import pytest
+from django.urls import reverse
+from apps.assembly import views
+from apps.teams.registry import reference_data
+
+REFERENCE_TABLES = ('teams_team', 'parts_aircraft')
+FULL_READ = re.compile(r'FROM "({})"'.format('|'.join(REFERENCE_TABLES)))
+
+
+def reference_data_loads(queries):
+    """
+    Unfiltered reads of a whole reference table, what a registry reload
+    does. Lookups like the session user's led teams have a WHERE clause.
+    """
+    return [sql for sql in queries if FULL_READ.search(sql) and ' WHERE ' not in sql]
+
+
+def test_warm_registry_makes_no_queries(teams, django_assert_num_queries):
+    views.load_reference_data()
+
+    with django_assert_num_queries(0):
+        views.load_reference_data()
+        reference_data.teams_by_type()
+        assert reference_data.team_by_type('assembly') == teams['assembly']
+        assert reference_data.team_by_id(teams['wing'].id) == teams['wing']
+
+
+def test_invalidation_reloads_registry(teams, django_assert_num_queries):
+    reference_data.teams()
+    teams['wing'].name = 'Renamed Wing Team'
+    teams['wing'].save()
+    reference_data.invalidate()
+
+    with django_assert_num_queries(2):
+        assert reference_data.team_by_id(teams['wing'].id).name == 'Renamed Wing Team'
+
+
+@pytest.mark.parametrize('url', ['assembly:workflow_list', 'assembly:quality_checks'])
+def test_filter_form_views_make_no_reference_data_queries(client, assembly_user, dashboard_deployment,
+                                                          query_log, url):
+    client.force_login(assembly_user)
+    assert client.get(reverse(url)).status_code == 200
+    query_log.clear()
+
+    response = client.get(reverse(url))
+
+    assert response.status_code == 200
+    assert reference_data_loads(query_log) == []
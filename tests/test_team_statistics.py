@@ -0,0 +1,68 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from apps.assembly.production import MAX_ORDER_QUANTITY, create_production_order
+from apps.assembly.rollups import ROLLUPS
+from apps.assembly.statistics import get_team_statistics
+from apps.parts.models import Aircraft
+from apps.teams.models import Team
+from apps.teams.registry import reference_data
+from .conftest import create_teams
+
+AIRCRAFT = 5
+# Per rollup: the refresh watermark, the rolled up days and the rows since
+# the last refresh
+STATISTICS_QUERIES = 6
+
+
+def seed(count, teams, user, extra_team_sets=0):
+    """`count` aircraft with their parts and steps, plus more teams of every type"""
+    for offset in range(0, count, MAX_ORDER_QUANTITY):
+        create_production_order(
+            aircraft_type='tb2',
+            name='Statistics',
+            quantity=min(MAX_ORDER_QUANTITY, count - offset),
+            assembly_team=teams['assembly'],
+            created_by=user
+        )
+    for number in range(extra_team_sets):
+        create_teams(f' {number}')
+    for rollup in ROLLUPS:
+        rollup.refresh()
+    # Team statistics list every team, from the warm registry
+    reference_data.teams()
+
+
+@pytest.mark.parametrize('aircraft, extra_team_sets', [
+    (AIRCRAFT, 0),
+    (10 * AIRCRAFT, 9),
+])
+def test_team_statistics_query_count_is_constant(teams, assembly_user, django_assert_num_queries,
+                                                 aircraft, extra_team_sets):
+    seed(aircraft, teams, assembly_user, extra_team_sets)
+
+    with django_assert_num_queries(STATISTICS_QUERIES):
+        team_stats = get_team_statistics()
+
+    assert len(team_stats) == Team.objects.count()
+    assembly_stats = next(stats for stats in team_stats if stats['team'] == teams['assembly'])
+    assert assembly_stats['aircraft_distribution'] == {dict(Aircraft.AIRCRAFT_TYPES)['tb2']: aircraft}
+
+
+def test_team_statistics_views_query_count_is_constant(client, teams, assembly_user,
+                                                       django_assert_num_queries):
+    client.force_login(assembly_user)
+    urls = (reverse('assembly:team_statistics'), reverse('assembly:team_statistics_api'))
+
+    seed(AIRCRAFT, teams, assembly_user)
+    baseline = {}
+    for url in urls:
+        with CaptureQueriesContext(connection) as context:
+            assert client.get(url).status_code == 200
+        baseline[url] = len(context.captured_queries)
+
+    seed(9 * AIRCRAFT, teams, assembly_user, extra_team_sets=9)
+    for url in urls:
+        with django_assert_num_queries(baseline[url]):
+            assert client.get(url).status_code == 200
@@ -0,0 +1,83 @@
+"""
+Starts and completes the same workflow steps from many threads at once,
+each thread on its own connection, like concurrent requests: the test
+counterpart of the stress_workflow_transitions command.
+"""
+import threading
+import pytest
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+from apps.assembly.models import AssembledAircraft, WorkflowEvent, WorkflowStep
+from apps.assembly.production import create_production_order
+from .conftest import create_member
+
+THREADS = 8
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+def race(url, user, data, count=THREADS):
+    """POST `data` to `url` from `count` threads released together, return the status codes"""
+    barrier = threading.Barrier(count, timeout=30)
+    codes = []
+    lock = threading.Lock()
+
+    def post():
+        try:
+            client = Client()
+            client.force_login(user)
+            barrier.wait()
+            response = client.post(url, data, content_type='application/json')
+            with lock:
+                codes.append(response.status_code)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=post) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sorted(codes)
+
+
+def test_concurrent_transitions_have_one_winner(teams, assembly_user):
+    if connection.vendor == 'sqlite':
+        pytest.skip('The race needs a database with row level concurrency')
+    members = {
+        team.id: create_member(team, f'{team_type}_member') for team_type, team in teams.items()
+    }
+    aircraft, = create_production_order(
+        aircraft_type='tb2',
+        name='Transition Race',
+        quantity=1,
+        assembly_team=teams['assembly'],
+        created_by=assembly_user
+    )
+    steps = list(aircraft.workflow_steps.order_by('sequence'))
+    initial_versions = {step.id: step.version for step in steps}
+
+    for step in steps:
+        user = members[step.assigned_team_id]
+        for action, data in (('start', {}), ('complete', {'success': True})):
+            version = WorkflowStep.objects.get(pk=step.pk).version
+            codes = race(
+                reverse(f'assembly:workflow-step-{action}', args=[step.pk]),
+                user,
+                {**data, 'version': version}
+            )
+            assert codes == [200] + [409] * (THREADS - 1), f"{action} {step.step_type}: {codes}"
+
+    for step in WorkflowStep.objects.filter(assembled_aircraft=aircraft):
+        assert step.status == WorkflowStep.Status.COMPLETED
+        assert step.version == initial_versions[step.id] + 2
+    events = WorkflowEvent.objects.filter(aircraft_id=aircraft.id)
+    assert events.filter(event_type=WorkflowEvent.EventType.START).count() == len(steps)
+    assert events.filter(event_type=WorkflowEvent.EventType.COMPLETE).count() == len(steps)
+
+    aircraft = AssembledAircraft.objects.get(pk=aircraft.pk)
+    counters = (aircraft.completed_steps, aircraft.in_progress_steps, aircraft.failed_steps)
+    assert counters == (len(steps), 0, 0)
+    aircraft.update_status()
+    assert (aircraft.completed_steps, aircraft.in_progress_steps, aircraft.failed_steps) == counters